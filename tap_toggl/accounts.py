@@ -0,0 +1,96 @@
+"""Extraction of several Toggl accounts in one tap process."""
+
+from __future__ import annotations
+
+import copy
+from pathlib import Path
+
+#: Property and state partition key identifying the account of a record.
+ACCOUNT_KEY = "account_id"
+
+#: Number of accounts synced at the same time by default.
+DEFAULT_MAX_CONCURRENT_ACCOUNTS = 4
+
+
+def account_path(path: str, account_id: str) -> str:
+    """Return the path of a file kept for one account, next to the configured one.
+
+    Args:
+        path: The configured file path.
+        account_id: The account identifier.
+
+    Returns:
+        The path with the account identifier inserted before the suffix.
+    """
+    configured = Path(path)
+    name = f"{configured.stem}.{account_id}{configured.suffix}"
+    return str(configured.with_name(name))
+
+
+def account_state(state: dict, account_id: str) -> dict:
+    """Return the state of one account, as a single-account sync would keep it.
+
+    In the combined state, every partition of an account has the account
+    identifier in its context, and the state of streams that are not
+    partitioned otherwise is kept in a partition of only the account.
+
+    Args:
+        state: The combined state of every account.
+        account_id: The account identifier.
+
+    Returns:
+        The account's state.
+    """
+    bookmarks: dict[str, dict] = {}
+    for stream_name, stream_state in (state.get("bookmarks") or {}).items():
+        account_stream_state: dict = {}
+        partitions = []
+        for partition in stream_state.get("partitions") or []:
+            context = dict(partition.get("context") or {})
+            if context.pop(ACCOUNT_KEY, None) != account_id:
+                continue
+            partition_state = copy.deepcopy(partition)
+            if context:
+                partition_state["context"] = context
+                partitions.append(partition_state)
+            else:
+                partition_state.pop("context")
+                account_stream_state.update(partition_state)
+        if partitions:
+            account_stream_state["partitions"] = partitions
+        if account_stream_state:
+            bookmarks[stream_name] = account_stream_state
+    return {"bookmarks": bookmarks}
+
+
+def merge_account_state(state: dict, account_id: str, new_state: dict) -> None:
+    """Replace the state of one account in the combined state.
+
+    Args:
+        state: The combined state of every account, updated in place.
+        account_id: The account identifier.
+        new_state: The account's state, as returned by :func:`account_state`.
+    """
+    bookmarks = state.setdefault("bookmarks", {})
+    for stream_name, stream_state in (new_state.get("bookmarks") or {}).items():
+        combined = bookmarks.setdefault(stream_name, {})
+        partitions = [
+            partition
+            for partition in combined.get("partitions") or []
+            if (partition.get("context") or {}).get(ACCOUNT_KEY) != account_id
+        ]
+        stream_level = {
+            key: copy.deepcopy(value)
+            for key, value in stream_state.items()
+            if key != "partitions"
+        }
+        if stream_level:
+            partitions.append({"context": {ACCOUNT_KEY: account_id}, **stream_level})
+        partitions.extend(
+            {
+                **copy.deepcopy(partition),
+                "context": {ACCOUNT_KEY: account_id, **partition["context"]},
+            }
+            for partition in stream_state.get("partitions") or []
+        )
+        combined["partitions"] = partitions
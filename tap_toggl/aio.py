@@ -0,0 +1,206 @@
+"""An asyncio engine sending every request of a tap from one event loop."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import TYPE_CHECKING, AsyncIterator, Awaitable, TypeVar
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from tap_toggl.client import DEFAULT_ASYNC_CONCURRENCY
+from tap_toggl.extras import optional_import
+from tap_toggl.handoff import ChunkAbandonedError, RecordQueue
+from tap_toggl.instrumentation import ResponseBody
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+    import httpx
+
+_T = TypeVar("_T")
+
+
+def to_requests_response(
+    response: httpx.Response,
+    request: requests.PreparedRequest,
+) -> requests.Response:
+    """Convert an httpx response to the requests response the streams parse.
+
+    Args:
+        response: The httpx response, with its body read.
+        request: The request it answers.
+
+    Returns:
+        An equivalent :class:`requests.Response`.
+    """
+    result = requests.Response()
+    result.status_code = response.status_code
+    result.reason = response.reason_phrase
+    result.headers = CaseInsensitiveDict(response.headers.items())
+    result.url = str(response.url)
+    result.encoding = response.encoding
+    result.elapsed = response.elapsed
+    result.request = request
+    result._content = response.content  # noqa: SLF001
+    result.raw = ResponseBody(response.content, response.num_bytes_downloaded)
+    return result
+
+
+class AsyncEngine:
+    """Send HTTP requests concurrently from an event loop on one thread.
+
+    Streams submit coroutines fetching whole partition chunks with
+    :meth:`submit`, and the main thread consumes their results in order, so
+    Singer messages are still written by one thread. Requests are sent with a
+    single ``httpx.AsyncClient`` and at most ``concurrency`` are in flight,
+    however many chunks are being fetched.
+    """
+
+    def __init__(self, concurrency: int = DEFAULT_ASYNC_CONCURRENCY) -> None:
+        """Initialize the engine and start its event loop.
+
+        Args:
+            concurrency: The maximum number of requests in flight.
+
+        Raises:
+            ImportError: If httpx is not installed.
+        """
+        self.httpx = optional_import("httpx")
+        if self.httpx is None:
+            msg = "The asyncio engine requires the 'async' extra (httpx)."
+            raise ImportError(msg)
+        self.concurrency = max(1, concurrency)
+        self.loop = asyncio.new_event_loop()
+        self._client: httpx.AsyncClient | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._thread = threading.Thread(
+            target=self.loop.run_forever,
+            name="tap-toggl-asyncio",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def submit(self, coroutine: Awaitable[_T]) -> Future[_T]:
+        """Schedule a coroutine on the event loop.
+
+        Args:
+            coroutine: The coroutine to run.
+
+        Returns:
+            A future for its result, which may be waited on from any thread.
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)  # type: ignore[arg-type]
+
+    def run(self, coroutine: Awaitable[_T]) -> _T:
+        """Run a coroutine on the event loop and wait for its result.
+
+        Args:
+            coroutine: The coroutine to run.
+
+        Returns:
+            The coroutine's result.
+        """
+        return self.submit(coroutine).result()
+
+    async def hand_off(
+        self,
+        pages: AsyncIterator[list[_T]],
+        queue: RecordQueue[_T],
+    ) -> None:
+        """Pass the pages of a chunk to the main thread through a bounded queue.
+
+        While the queue is full, the chunk waits on the event loop until the
+        main thread takes a page, so that other chunks go on.
+
+        Args:
+            pages: The chunk's records, one list per page.
+            queue: The queue the main thread reads the chunk from.
+        """
+        space = asyncio.Event()
+        queue.on_space = lambda: self.loop.call_soon_threadsafe(space.set)
+        try:
+            async for page in pages:
+                space.clear()
+                while not queue.offer(page):
+                    await space.wait()
+                    space.clear()
+        except ChunkAbandonedError:
+            return
+        except Exception as exc:  # noqa: BLE001
+            queue.finish(exc)
+            return
+        finally:
+            queue.on_space = None
+        queue.finish()
+
+    @staticmethod
+    async def sleep(seconds: float) -> None:
+        """Wait without blocking the other requests on the event loop.
+
+        Args:
+            seconds: The time to wait.
+        """
+        await asyncio.sleep(seconds)
+
+    async def send(
+        self,
+        request: requests.PreparedRequest,
+        timeout: float | None,
+    ) -> requests.Response:
+        """Send a prepared request and read its response.
+
+        Transport errors are raised as their ``requests`` equivalents, so that
+        streams retry them as they do in the threaded engine.
+
+        Args:
+            request: The request, prepared by a stream with its headers and auth.
+            timeout: Seconds to wait for the server.
+
+        Returns:
+            The response.
+
+        Raises:
+            requests.exceptions.ConnectTimeout: If connecting timed out.
+            requests.exceptions.ReadTimeout: If the response timed out.
+            requests.exceptions.ContentDecodingError: If decompression failed.
+            requests.exceptions.ConnectionError: For other transport errors.
+        """
+        httpx = self.httpx
+        if self._client is None:
+            limits = httpx.Limits(
+                max_connections=self.concurrency,
+                max_keepalive_connections=self.concurrency,
+            )
+            self._client = httpx.AsyncClient(limits=limits)
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        async with self._semaphore:  # type: ignore[union-attr]
+            try:
+                response = await self._client.request(
+                    request.method or "GET",
+                    request.url or "",
+                    headers=dict(request.headers),
+                    content=request.body,
+                    timeout=timeout,
+                )
+            except httpx.ConnectTimeout as exc:
+                raise requests.exceptions.ConnectTimeout(exc, request=request) from exc
+            except httpx.TimeoutException as exc:
+                raise requests.exceptions.ReadTimeout(exc, request=request) from exc
+            except httpx.DecodingError as exc:
+                raise requests.exceptions.ContentDecodingError(
+                    exc,
+                    request=request,
+                ) from exc
+            except httpx.TransportError as exc:
+                raise requests.exceptions.ConnectionError(exc, request=request) from exc
+        return to_requests_response(response, request)
+
+    def close(self) -> None:
+        """Close the HTTP client and stop the event loop."""
+        if self._client is not None:
+            self.run(self._client.aclose())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
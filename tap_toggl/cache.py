@@ -0,0 +1,113 @@
+"""On-disk cache of parent stream records, such as organizations and workspaces."""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from hashlib import sha256
+from pathlib import Path
+from typing import Any
+
+#: Version of the cache file layout. Files with another version are ignored.
+CACHE_VERSION = 1
+
+#: Seconds for which cached parent records are used without asking Toggl.
+DEFAULT_TTL_SECONDS = 3600
+
+
+def account_key(api_url: str, api_token: str) -> str:
+    """Return a key identifying an account without storing its token.
+
+    Args:
+        api_url: The root URL of the Toggl API.
+        api_token: The Toggl API token.
+
+    Returns:
+        A hex digest of the URL and token.
+    """
+    return sha256(f"{api_url}\n{api_token}".encode()).hexdigest()
+
+
+class ParentContextCache:
+    """Parent records saved between syncs, for streams synced only for children.
+
+    Entries are keyed by stream name and account, and hold the records as they
+    were post-processed, so that child contexts can be generated from them
+    without requesting the parent stream again. The file is only read and
+    written on the main thread.
+    """
+
+    def __init__(self, path: str | Path, ttl: float = DEFAULT_TTL_SECONDS) -> None:
+        """Initialize the cache.
+
+        Args:
+            path: The JSON file to keep the cache in.
+            ttl: Seconds for which entries are fresh.
+        """
+        self.path = Path(path)
+        self.ttl = ttl
+        self._entries: dict[str, dict] | None = None
+
+    @property
+    def entries(self) -> dict[str, dict]:
+        """Return the cached entries, reading the file the first time."""
+        if self._entries is None:
+            self._entries = {}
+            try:
+                data = json.loads(self.path.read_text())
+            except (OSError, ValueError):
+                data = None
+            if isinstance(data, dict) and data.get("version") == CACHE_VERSION:
+                self._entries = data.get("entries") or {}
+        return self._entries
+
+    def get(self, stream_name: str, key: str) -> dict[str, Any] | None:
+        """Return the entry of a stream, if it was saved for the same account.
+
+        Args:
+            stream_name: The parent stream name.
+            key: The account key.
+
+        Returns:
+            The entry with its ``records`` and ``fetched_at`` time, or None.
+        """
+        entry = self.entries.get(stream_name)
+        if not entry or entry.get("key") != key:
+            return None
+        return entry
+
+    def is_fresh(self, entry: dict[str, Any]) -> bool:
+        """Return whether an entry can be used without revalidating it.
+
+        Args:
+            entry: An entry returned by :meth:`get`.
+
+        Returns:
+            True if the entry is younger than the TTL.
+        """
+        return time.time() - entry["fetched_at"] < self.ttl
+
+    def put(self, stream_name: str, key: str, records: list[dict]) -> None:
+        """Save the records of a stream and write the cache file.
+
+        Args:
+            stream_name: The parent stream name.
+            key: The account key.
+            records: Every record of the stream.
+        """
+        self.entries[stream_name] = {
+            "key": key,
+            "fetched_at": time.time(),
+            "records": records,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        temp_path.write_text(
+            json.dumps(
+                {"version": CACHE_VERSION, "entries": self.entries},
+                default=str,
+            ),
+        )
+        # Replace the file at once, so an interrupted write never corrupts it.
+        temp_path.replace(self.path)
@@ -0,0 +1,23 @@
+"""Settings of the HTTP response cache, importable without the cache itself."""
+
+from __future__ import annotations
+
+from enum import Enum
+
+#: Seconds for which cached responses are used without asking Toggl.
+DEFAULT_RESPONSE_TTL_SECONDS = 3600
+
+#: Size of the cached response bodies above which the least recently used
+#: responses are evicted.
+DEFAULT_MAX_CACHE_BYTES = 256 * 1024 * 1024
+
+
+class CacheMode(str, Enum):
+    """How the response cache is used."""
+
+    #: Use fresh responses of cacheable streams, and revalidate stale ones.
+    CACHE = "cache"
+    #: Request everything from Toggl, and save every response.
+    RECORD = "record"
+    #: Answer every request from saved responses, without any network access.
+    REPLAY = "replay"
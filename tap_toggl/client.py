@@ -2,26 +2,241 @@
 
 from __future__ import annotations
 
-from base64 import b64encode
-from datetime import datetime
-from typing import Any, Callable
+import time
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import nullcontext
+from datetime import date, datetime, timedelta, timezone
+from functools import cached_property
+from http import HTTPStatus
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    Generator,
+    Iterable,
+    Iterator,
+    Mapping,
+    cast,
+)
 
+import backoff
 import requests
-from singer_sdk.pagination import BasePageNumberPaginator, BaseAPIPaginator
+from singer_sdk import metrics
+from singer_sdk import typing as th
+from singer_sdk._singerlib import RecordMessage
+from singer_sdk.exceptions import FatalAPIError, RetriableAPIError
+from singer_sdk.helpers._typing import TypeConformanceLevel
+from singer_sdk.helpers._util import utc_now
+from singer_sdk.pagination import (
+    BaseAPIPaginator,
+    BasePageNumberPaginator,
+    SinglePagePaginator,
+)
 from singer_sdk.streams import RESTStream
 
+from tap_toggl.accounts import ACCOUNT_KEY
+from tap_toggl.cache import account_key
+from tap_toggl.cache_mode import CacheMode
+from tap_toggl.dedupe import RecordIndex, content_hash
+from tap_toggl.deletes import (
+    DELETED_AT_FIELDS,
+    DELETED_AT_KEY,
+    BucketFilter,
+    DeletedRecordDetector,
+    deleted_at,
+)
+from tap_toggl.handoff import RecordQueue
+from tap_toggl.instrumentation import (
+    Stage,
+    StreamInstrumentation,
+    TogglMetric,
+    context_key,
+    response_size,
+)
+from tap_toggl.output import Conformer, compile_conformer
+from tap_toggl.paging import (
+    DEFAULT_TARGET_SECONDS,
+    MIN_PAGE_SIZE,
+    PagePosition,
+    PageSizeController,
+    PageTooLargeError,
+    aligned_page_size,
+    is_page_failure,
+)
+from tap_toggl.scheduler import (
+    DEFAULT_REQUESTS_PER_SECOND,
+    THROTTLE_STATUSES,
+    RequestScheduler,
+    is_quota_exhausted,
+)
+
+if TYPE_CHECKING:
+    from backoff.types import Details
+    from singer_sdk.helpers._batch import BatchConfig
+
+    from tap_toggl.aio import AsyncEngine
+    from tap_toggl.cache import ParentContextCache
+    from tap_toggl.http_cache import ResponseCache
+    from tap_toggl.transport import TogglTransport
+
 _Auth = Callable[[requests.PreparedRequest], requests.PreparedRequest]
 
+DEFAULT_API_URL = "https://api.track.toggl.com"
+DEFAULT_MAX_WORKERS = 4
+#: Requests in flight at once on the asyncio engine by default.
+DEFAULT_ASYNC_CONCURRENCY = 16
+DEFAULT_BATCH_STREAMS = ("time_entries",)
+
+#: Tolerance for clock differences when comparing modification times to bookmarks.
+CLOCK_SKEW = timedelta(minutes=5)
+
+
+def parse_date(value: str) -> date:
+    """Parse a configured date or date-time string into a date.
+
+    Args:
+        value: A date in the format YYYY-MM-DD, optionally followed by a time.
+
+    Returns:
+        The calendar date.
+    """
+    return date.fromisoformat(value[:10])
+
+
+def parse_datetime(value: str) -> datetime:
+    """Parse an ISO 8601 timestamp as returned by the Toggl API.
+
+    Args:
+        value: The timestamp, optionally ending in "Z" for UTC.
+
+    Returns:
+        A timezone-aware datetime.
+    """
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def date_windows(start: date, end: date, days: int) -> list[tuple[date, date]]:
+    """Split an inclusive date range into consecutive windows.
+
+    Args:
+        start: The first date of the range.
+        end: The last date of the range (inclusive).
+        days: The maximum number of days in each window.
+
+    Returns:
+        A list of inclusive (start, end) date pairs, in ascending order.
+    """
+    windows = []
+    step = timedelta(days=max(days, 1))
+    while start <= end:
+        window_end = min(start + step - timedelta(days=1), end)
+        windows.append((start, window_end))
+        start = window_end + timedelta(days=1)
+    return windows
+
 
 class TogglStream(RESTStream):
     """Toggl stream class."""
 
     records_jsonpath = "$[*]"
 
+    #: Whether response bodies are read lazily from the socket while parsing.
+    stream_response: bool = False
+
+    #: Toggl answers 429 when requests are too fast and 402 when a quota is spent.
+    extra_retry_statuses = THROTTLE_STATUSES
+
+    #: Whether the endpoint accepts a ``since`` UNIX timestamp to return only
+    #: records modified after it.
+    supports_since_filter: bool = False
+
+    #: Whether records deleted in Toggl are detected when ``deleted_ids_path``
+    #: is set, by comparing the IDs requested with those of the last sync.
+    detects_deletes: bool = False
+
+    #: Query parameter, or report payload field, setting the page size.
+    page_size_param: str | None = None
+
+    #: Page size requested when none is configured, or None for the API default.
+    default_page_size: int | None = None
+
+    #: Largest page size the endpoint returns.
+    max_page_size: int = 200
+
+    #: Whether responses are kept in the response cache, when it is configured.
+    #: Every response is kept in its record and replay modes.
+    cache_responses: bool = False
+
+    #: Properties the tap reads from records itself, such as to generate child
+    #: contexts, which are kept whatever properties are selected.
+    required_properties: tuple[str, ...] = ()
+
+    #: Whether :meth:`parse_response` already leaves out the properties that
+    #: are not in the :attr:`projection`.
+    parses_projection: bool = False
+
+    #: Whether the same records are returned for several partitions, such as
+    #: the users of several organizations, and are emitted once when
+    #: ``dedupe_organization_members`` is enabled.
+    dedupes_across_partitions: bool = False
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the stream."""
+        super().__init__(*args, **kwargs)
+        self._prefetched: dict[tuple, tuple[list, list[RecordQueue[dict]]]] = {}
+        self.instrumentation = StreamInstrumentation(self.name)
+        self._current_context: dict | None = None
+        self._unmapped_warnings: set[tuple[str, ...]] = set()
+        #: The request contexts of partitions awaiting delete detection.
+        self._requested_chunks: dict[tuple, list[dict | None]] = {}
+        #: The account records are stamped with when syncing several accounts.
+        self.account_id: str | None = getattr(self._tap, "account_id", None)
+        if self.config.get("accounts"):
+            self.schema = {
+                **self.schema,
+                "properties": {
+                    ACCOUNT_KEY: th.StringType().type_dict,
+                    **self.schema["properties"],
+                },
+            }
+            self.primary_keys = [ACCOUNT_KEY, *(self.primary_keys or [])]
+        self.delete_detector: DeletedRecordDetector | None = None
+        if self.detects_deletes and self.config.get("deleted_ids_path"):
+            self.delete_detector = DeletedRecordDetector(
+                self.name,
+                self._tap.id_file,  # type: ignore[attr-defined]
+                self.get_id_bucket,
+            )
+            self.schema = {
+                **self.schema,
+                "properties": {
+                    **self.schema["properties"],
+                    DELETED_AT_KEY: th.DateTimeType().type_dict,
+                },
+            }
+
     @property
     def url_base(self) -> str:
         """Return the API URL root, configurable via tap settings."""
-        return "https://api.track.toggl.com"
+        return self.config.get("api_url") or DEFAULT_API_URL
+
+    @property
+    def transport(self) -> TogglTransport:
+        """Return the HTTP transport shared by every stream of the tap."""
+        return self._tap.transport  # type: ignore[attr-defined]
+
+    @property
+    def requests_session(self) -> requests.Session:
+        """Return the pooled session shared by every stream of the tap."""
+        return self.transport.session
+
+    @property
+    def authenticator(self) -> _Auth:
+        """Return the API token authenticator shared by every stream of the tap."""
+        return self.transport.auth
 
     @property
     def http_headers(self) -> dict:
@@ -30,32 +245,1291 @@ class TogglStream(RESTStream):
         Returns:
             A dictionary of HTTP headers.
         """
-        auth_str = bytes(f"{self.config.get('api_token')}:api_token", "utf-8")
-        encoded_token = b64encode(auth_str).decode("ascii")
-        headers = {"content-type": "application/json"}
-        if "api_token" in self.config:
-            headers["Authorization"] = f"Basic {encoded_token}"
+        return self.transport.headers
+
+    @property
+    def response_cache(self) -> ResponseCache | None:
+        """Return the response cache, if this stream's responses are cached."""
+        cache: ResponseCache | None = getattr(self._tap, "response_cache", None)
+        if cache is not None and cache.mode is CacheMode.CACHE:
+            return cache if self.cache_responses else None
+        return cache
+
+    @property
+    def request_scheduler(self) -> RequestScheduler:
+        """Return the scheduler shared by every request made with this token."""
+        return RequestScheduler.for_token(
+            self.config.get("api_token", ""),
+            rate=float(
+                self.config.get("max_requests_per_second")
+                or DEFAULT_REQUESTS_PER_SECOND
+            ),
+        )
+
+    def backoff_wait_generator(self) -> Generator[float, Any, None]:
+        """Return the wait generator used when retrying failed requests.
+
+        Responses rejected for pacing reasons are retried without an extra delay,
+        as the request scheduler already holds the next slot back for as long as
+        Toggl asked, and so are pages retried with a smaller page size. Other
+        failures back off exponentially.
+
+        Yields:
+            The number of seconds to wait before the next attempt.
+        """
+        exception = yield  # type: ignore[misc]
+        delays = backoff.expo(factor=2)
+        next(delays)
+        while True:
+            response = getattr(exception, "response", None)
+            if (
+                isinstance(exception, RetriableAPIError)
+                and response is not None
+                and response.status_code in THROTTLE_STATUSES
+            ) or isinstance(exception, PageTooLargeError):
+                exception = yield 0
+            else:
+                exception = yield next(delays)
+
+    def backoff_jitter(self, value: float) -> float:
+        """Add jitter to a retry delay, leaving immediate retries immediate.
+
+        Args:
+            value: Base amount to wait in seconds.
+
+        Returns:
+            Time in seconds to wait until the next request.
+        """
+        return value and super().backoff_jitter(value)
+
+    def backoff_handler(self, details: Details) -> None:
+        """Log and count a request being retried.
+
+        Args:
+            details: Backoff invocation details.
+        """
+        super().backoff_handler(details)
+        args = details.get("args") or ()
+        self.instrumentation.observe_retry(args[1] if len(args) > 1 else None)
+
+    def log_pipeline_summary(self, context: dict | None = None) -> None:
+        """Log the request and record pipeline statistics as a metric.
+
+        Args:
+            context: The partition to log statistics of, or None for the stream.
+        """
+        if context is None:
+            summary = self.instrumentation.summary()
+            summary.pop("partitions")
+            tags = {metrics.Tag.STREAM: self.name}
         else:
-            self.logger.error("No API token provided")
-        return headers
+            summary = self.instrumentation.partition_summary(context)
+            tags = {metrics.Tag.STREAM: self.name, metrics.Tag.CONTEXT: context}
+        self._log_metric(
+            metrics.Point(
+                "summary",
+                metric=TogglMetric.PIPELINE_SUMMARY,  # type: ignore[arg-type]
+                value=summary,
+                tags=tags,
+            ),
+        )
 
-    def start_time_to_epoch(self, start_time: str) -> int:
-        """Convert a start time to an epoch time.
+    def log_sync_costs(self) -> None:
+        """Log a summary of sync costs, including time spent throttled."""
+        super().log_sync_costs()
+        if self.instrumentation.totals.requests or self.instrumentation.totals.records:
+            self.log_pipeline_summary()
+        throttled = self.request_scheduler.throttled_seconds.get(self.name)
+        if throttled:
+            self.logger.info(
+                "Total time throttled for stream %s: %.2f seconds",
+                self.name,
+                throttled,
+            )
+
+    def _request(
+        self,
+        prepared_request: requests.PreparedRequest,
+        context: dict | None,
+    ) -> requests.Response:
+        """Send a request and validate the response.
 
         Args:
-            start_time: The start time.
+            prepared_request: The request to send.
+            context: Stream partition or context dictionary.
 
         Returns:
-            The epoch time.
+            The validated response, or the cached one if it can be used instead.
         """
-        utc_time = datetime.strptime(start_time, "%Y-%m-%d")
-        epoch_time = (utc_time - datetime(1970, 1, 1)).total_seconds()
-        return int(epoch_time)
+        cache = self.response_cache
+        if cache is not None:
+            cached = cache.lookup(prepared_request)
+            if cached is not None:
+                return cached
+        waited = self.request_scheduler.acquire(self.name)
+        if waited:
+            self.instrumentation.add_time(context, Stage.THROTTLE, waited)
+        response = self.requests_session.send(
+            prepared_request,
+            timeout=self.timeout,
+            stream=self.stream_response,
+        )
+        response = self._handle_response(prepared_request, response, context)
+        return cache.store(prepared_request, response) if cache else response
+
+    async def _request_async(
+        self,
+        prepared_request: requests.PreparedRequest,
+        context: dict | None,
+    ) -> requests.Response:
+        """Send a request from the asyncio engine and validate the response.
+
+        Args:
+            prepared_request: The request to send.
+            context: Stream partition or context dictionary.
+
+        Returns:
+            The validated response, or the cached one if it can be used instead.
+        """
+        cache = self.response_cache
+        if cache is not None:
+            cached = cache.lookup(prepared_request)
+            if cached is not None:
+                return cached
+        engine = cast("AsyncEngine", self.async_engine)
+        waited = self.request_scheduler.reserve(self.name)
+        if waited > 0:
+            await engine.sleep(waited)
+            self.instrumentation.add_time(context, Stage.THROTTLE, waited)
+        response = await engine.send(prepared_request, timeout=self.timeout)
+        response = self._handle_response(prepared_request, response, context)
+        return cache.store(prepared_request, response) if cache else response
+
+    def _handle_response(
+        self,
+        prepared_request: requests.PreparedRequest,
+        response: requests.Response,
+        context: dict | None,
+    ) -> requests.Response:
+        """Record and validate a response.
+
+        Args:
+            prepared_request: The request that was sent.
+            response: The response received.
+            context: Stream partition or context dictionary.
+
+        Returns:
+            The validated response.
+        """
+        self.request_scheduler.observe(response)
+        self.instrumentation.observe_response(context, response)
+        self._write_request_duration_log(
+            endpoint=self.path,
+            response=response,
+            context=context,
+            extra_tags={"url": prepared_request.path_url}
+            if self._LOG_REQUEST_METRIC_URLS
+            else None,
+        )
+        self.validate_response(response)
+        return response
+
+    def validate_response(self, response: requests.Response) -> None:
+        """Validate a response, failing at once on 402s not caused by the quota.
+
+        Args:
+            response: The response received.
+
+        Raises:
+            FatalAPIError: If Toggl answered 402 for another reason than an
+                exhausted quota, such as a feature missing from the plan.
+        """
+        if response.status_code == HTTPStatus.PAYMENT_REQUIRED and not (
+            is_quota_exhausted(response)
+        ):
+            msg = self.response_error_message(response)
+            raise FatalAPIError(msg)
+        super().validate_response(response)
+
+    def get_url_params(
+        self,
+        context: dict | None,
+        next_page_token: Any | None,  # noqa: ANN401, ARG002
+    ) -> dict[str, Any]:
+        """Return a dictionary of values to be used in URL parameterization.
+
+        Args:
+            context: The stream context.
+            next_page_token: The next page index or value.
+
+        Returns:
+            A dictionary of URL query parameters.
+        """
+        params: dict = {}
+        if context and context.get("since"):
+            params["since"] = context["since"]
+        return params
+
+    @property
+    def max_workers(self) -> int:
+        """Return the maximum number of concurrent requests for this stream."""
+        return max(1, int(self.config.get("max_workers") or DEFAULT_MAX_WORKERS))
+
+    @property
+    def async_engine(self) -> AsyncEngine | None:
+        """Return the asyncio engine sending requests, if ``use_asyncio`` is set."""
+        return getattr(self._tap, "async_engine", None)
+
+    @property
+    def concurrency(self) -> int:
+        """Return the number of chunks fetched ahead of the one being synced."""
+        engine = self.async_engine
+        return engine.concurrency if engine is not None else self.max_workers
+
+    def get_modified_since(self, context: dict | None) -> datetime | None:
+        """Return the bookmark of a partition, if it was synced incrementally before.
+
+        Bookmarks are not used for parent streams with selected descendents, as
+        child streams still need a context for every parent record.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Returns:
+            The latest replication key value seen by the previous sync.
+        """
+        if not self.replication_key or self.has_selected_descendents:
+            return None
+        bookmark = self.get_context_state(context).get("replication_key_value")
+        return parse_datetime(bookmark) if bookmark else None
+
+    def get_since_timestamp(self, context: dict | None) -> int | None:
+        """Return the ``since`` filter for a partition, if the endpoint has one.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Returns:
+            The bookmark, or else the configured start date, as a UNIX timestamp.
+        """
+        if not self.supports_since_filter or not self.replication_key:
+            return None
+        if self.has_selected_descendents:
+            return None
+        since = self.get_modified_since(context)
+        if since is None and self.config.get("start_date"):
+            since = parse_datetime(self.config["start_date"])
+        return int(since.timestamp()) if since else None
+
+    def get_partition_chunks(self, context: dict | None) -> list[dict | None]:
+        """Return the request contexts that together make up a partition.
+
+        Streams that split a partition into independently fetchable pieces, such
+        as date windows, override this. Chunks are fetched concurrently and their
+        records are emitted in the order returned here.
+
+        Request parameters that depend on state are resolved here, on the main
+        thread, so that chunks can be fetched on worker threads.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Returns:
+            A list of request contexts.
+        """
+        since = self.get_since_timestamp(context)
+        if since is None:
+            return [context]
+        return [{**(context or {}), "since": since}]
+
+    def get_batch_config(self, config: Mapping) -> BatchConfig | None:
+        """Return the batch config if this stream is listed in ``batch_streams``.
+
+        Args:
+            config: Tap configuration dictionary.
+
+        Returns:
+            Batch config for this stream, or None to emit RECORD messages.
+        """
+        if self.name not in config.get("batch_streams", DEFAULT_BATCH_STREAMS):
+            return None
+        return super().get_batch_config(config)
+
+    @cached_property
+    def is_batched(self) -> bool:
+        """Return whether records are sent in BATCH files instead of messages."""
+        return self.get_batch_config(self.config) is not None
+
+    def write_checkpoint(self) -> None:
+        """Write the stream state after saving sync progress to it.
+
+        When records are batched, progress is only written out with the next BATCH
+        message, as the records it covers may not have been sent yet.
+        """
+        self._is_state_flushed = False
+        if not self.is_batched:
+            self._write_state_message()
+
+    def chunk_completed(self, context: dict | None, chunk: dict | None) -> None:
+        """Handle every record of a chunk having been emitted.
+
+        Args:
+            context: Stream partition or context dictionary.
+            chunk: The request context of the completed chunk.
+        """
+
+    def partition_completed(self, context: dict | None) -> None:
+        """Handle every record of a partition having been emitted.
+
+        Args:
+            context: Stream partition or context dictionary.
+        """
+
+    def request_pages(
+        self,
+        chunk: dict | None,
+        context: dict | None = None,
+    ) -> Iterator[dict]:
+        """Request every page of a chunk, returning response records.
+
+        When the partition ``context`` is given, the paginator position is saved
+        to the partition's state every ``checkpoint_interval_pages`` pages, and a
+        position saved for the same chunk by an interrupted sync is resumed
+        from. Only pass ``context`` where records are emitted as they are
+        yielded, so that a saved position never runs ahead of the output.
+
+        Args:
+            chunk: The request context of the chunk.
+            context: Stream partition or context dictionary to checkpoint in.
+
+        Yields:
+            An item for every record in the response.
+        """
+        paginator = self.get_new_paginator()
+        position = PagePosition(paginator, self.get_page_size())
+        if context is not None:
+            checkpoint = self.get_context_state(context).get("pagination_checkpoint")
+            if checkpoint and checkpoint.get("chunk") == chunk:
+                self.logger.info(
+                    "Resuming '%s' at page token %s with context: %s",
+                    self.name,
+                    checkpoint["next_page_token"],
+                    chunk,
+                )
+                # Paginators have no public way to start from a known position.
+                paginator._value = checkpoint["next_page_token"]  # noqa: SLF001
+                # Page tokens only point at the same records with the same size.
+                position.size = checkpoint.get("page_size", position.size)
+
+        decorated_request = self.request_decorator(self._request_page)
+        interval = int(self.config.get("checkpoint_interval_pages") or 0)
+        pages = 0
+
+        with metrics.http_request_counter(self.name, self.path) as request_counter:
+            request_counter.context = chunk
+
+            while not paginator.finished:
+                resp = decorated_request(position, chunk)
+                request_counter.increment()
+                self.update_sync_costs(resp.request, resp, chunk)
+                records = self.instrumentation.timed(
+                    self.parse_response(resp),
+                    chunk,
+                    Stage.PARSE,
+                )
+                count = 0
+                for record in records:
+                    count += 1
+                    yield record
+                if not count:
+                    self.logger.info(
+                        "Pagination stopped after %d pages because no records were "
+                        "found in the last response",
+                        pages,
+                    )
+                    break
+                self.instrumentation.observe_body(chunk, resp)
+                pages += 1
+
+                paginator.advance(resp)
+                self.observe_page(position, resp, count)
+                if (
+                    context is not None
+                    and interval
+                    and pages % interval == 0
+                    and not paginator.finished
+                ):
+                    self.get_context_state(context)["pagination_checkpoint"] = {
+                        "chunk": chunk,
+                        "next_page_token": paginator.current_value,
+                        "page_size": position.size,
+                    }
+                    self.write_checkpoint()
+
+        if context is not None:
+            self.get_context_state(context).pop("pagination_checkpoint", None)
+
+    @property
+    def page_size(self) -> int | None:
+        """Return the configured page size, or the stream's default."""
+        page_sizes = self.config.get("page_sizes") or {}
+        return page_sizes.get(self.name, self.default_page_size)
+
+    @cached_property
+    def page_size_controller(self) -> PageSizeController | None:
+        """Return the controller adapting the page size, if it is adaptive."""
+        if self.page_size_param is None or not self.config.get("adaptive_page_size"):
+            return None
+        return PageSizeController(
+            self.page_size or self.max_page_size,
+            self.max_page_size,
+            target_seconds=float(
+                self.config.get("page_target_seconds") or DEFAULT_TARGET_SECONDS
+            ),
+        )
+
+    def get_page_size(self) -> int | None:
+        """Return the page size new chunks start paginating with.
+
+        Returns:
+            A page size, or None to request the API's default.
+        """
+        if self.page_size_param is None:
+            return None
+        controller = self.page_size_controller
+        return controller.size if controller is not None else self.page_size
+
+    def _request_page(
+        self,
+        position: PagePosition,
+        chunk: dict | None,
+    ) -> requests.Response:
+        """Request the next page of a chunk, shrinking pages that fail.
+
+        Args:
+            position: The chunk's pagination, updated when the page shrinks.
+            chunk: The request context of the chunk.
+
+        Returns:
+            The validated response.
+        """
+        prepared_request = self.prepare_page_request(position, chunk)
+        try:
+            return self._request(prepared_request, chunk)
+        except (requests.exceptions.Timeout, RetriableAPIError) as exc:
+            self.shrink_failed_page(position, exc)
+            raise
+
+    async def _request_page_async(
+        self,
+        position: PagePosition,
+        chunk: dict | None,
+    ) -> requests.Response:
+        """Request the next page of a chunk on the asyncio engine.
+
+        Args:
+            position: The chunk's pagination, updated when the page shrinks.
+            chunk: The request context of the chunk.
+
+        Returns:
+            The validated response.
+        """
+        prepared_request = self.prepare_page_request(position, chunk)
+        try:
+            return await self._request_async(prepared_request, chunk)
+        except (requests.exceptions.Timeout, RetriableAPIError) as exc:
+            self.shrink_failed_page(position, exc)
+            raise
+
+    def prepare_page_request(
+        self,
+        position: PagePosition,
+        chunk: dict | None,
+    ) -> requests.PreparedRequest:
+        """Prepare the request of a chunk's next page.
+
+        Args:
+            position: The chunk's pagination.
+            chunk: The request context of the chunk.
+
+        Returns:
+            The prepared request.
+        """
+        request_context = chunk
+        if position.size is not None:
+            request_context = {**(chunk or {}), "page_size": position.size}
+        return self.prepare_request(
+            request_context,
+            next_page_token=position.paginator.current_value,
+        )
+
+    def shrink_failed_page(self, position: PagePosition, exc: Exception) -> None:
+        """Halve the page size of a chunk after its page failed, if it is adaptive.
+
+        Args:
+            position: The chunk's pagination.
+            exc: The exception the page request raised.
+
+        Raises:
+            PageTooLargeError: If the page is retried with a smaller size.
+        """
+        controller = self.page_size_controller
+        if controller is None or position.size is None or not is_page_failure(exc):
+            return
+        size = position.size
+        self.resize_page(position, controller.shrink(size))
+        if position.size == size:
+            return
+        self.logger.warning(
+            "Retrying '%s' with pages of %d instead of %d records after: %s",
+            self.name,
+            position.size,
+            size,
+            exc,
+        )
+        msg = f"Page of {size} records failed: {exc}"
+        raise PageTooLargeError(msg, getattr(exc, "response", None)) from exc
+
+    def observe_page(
+        self,
+        position: PagePosition,
+        response: requests.Response,
+        records: int,
+    ) -> None:
+        """Adapt the page size of a chunk to a page that was served.
+
+        Args:
+            position: The chunk's pagination, advanced past the page.
+            response: The page's response, with its body consumed.
+            records: The number of records parsed from the page.
+        """
+        controller = self.page_size_controller
+        if controller is None or position.size is None or position.paginator.finished:
+            return
+        page_numbers = isinstance(position.paginator, BasePageNumberPaginator)
+        proposed = controller.observe(
+            position.size,
+            records,
+            response.elapsed.total_seconds(),
+            response_size(response),
+            # Page-number endpoints only end with an empty page.
+            capped=not page_numbers and records < position.size,
+        )
+        self.resize_page(position, proposed)
+
+    def resize_page(self, position: PagePosition, size: int) -> None:
+        """Switch a chunk to another page size from its next page on.
+
+        Page-number endpoints only switch to page sizes that start a page right
+        after the records already read.
+
+        Args:
+            position: The chunk's pagination.
+            size: The page size to switch to.
+        """
+        if position.size is None or size == position.size:
+            return
+        paginator = position.paginator
+        if isinstance(paginator, BasePageNumberPaginator):
+            offset = (paginator.current_value - 1) * position.size
+            aligned = aligned_page_size(offset, size, min(size, MIN_PAGE_SIZE))
+            if aligned is None:
+                return
+            size = aligned
+            paginator._value = offset // size + 1  # noqa: SLF001
+        self.logger.debug(
+            "Changing the page size of '%s' from %d to %d",
+            self.name,
+            position.size,
+            size,
+        )
+        position.size = size
+
+    async def request_pages_async(self, chunk: dict | None) -> AsyncIterator[list]:
+        """Request every page of a chunk on the asyncio engine.
+
+        This runs on the event loop thread, so like :meth:`request_chunk` it
+        must not read or write state.
+
+        Args:
+            chunk: The request context of the chunk.
+
+        Yields:
+            The records of every page.
+        """
+        paginator = self.get_new_paginator()
+        position = PagePosition(paginator, self.get_page_size())
+        decorated_request = self.request_decorator(self._request_page_async)
+
+        with metrics.http_request_counter(self.name, self.path) as request_counter:
+            request_counter.context = chunk
+
+            while not paginator.finished:
+                resp = await decorated_request(position, chunk)
+                request_counter.increment()
+                self.update_sync_costs(resp.request, resp, chunk)
+                records = list(
+                    self.instrumentation.timed(
+                        self.parse_response(resp),
+                        chunk,
+                        Stage.PARSE,
+                    ),
+                )
+                if not records:
+                    break
+                self.instrumentation.observe_body(chunk, resp)
+                paginator.advance(resp)
+                self.observe_page(position, resp, len(records))
+                yield records
+
+    async def request_chunk_async(self, chunk: dict | None) -> list[dict]:
+        """Fetch every page of a single chunk on the asyncio engine.
+
+        Args:
+            chunk: The request context of the chunk.
+
+        Returns:
+            All records of the chunk.
+        """
+        return [
+            record
+            async for records in self.request_pages_async(chunk)
+            for record in records
+        ]
+
+    def request_chunk(self, chunk: dict | None) -> list[dict]:
+        """Fetch every page of a single chunk.
+
+        The records are all held in memory, so this is only used for chunks
+        that are needed whole, such as shard sources. Partitions are fetched
+        with :meth:`fetch_chunk` instead.
+
+        Args:
+            chunk: The request context of the chunk.
+
+        Returns:
+            All records of the chunk.
+        """
+        engine = self.async_engine
+        if engine is not None:
+            return engine.run(self.request_chunk_async(chunk))
+        return list(self.request_pages(chunk))
+
+    def fetch_chunk(
+        self,
+        chunk: dict | None,
+        executor: Executor | None,
+    ) -> RecordQueue[dict]:
+        """Start fetching a chunk on a worker, handing off its records as they come.
+
+        The worker does not read or write state. It waits while a few batches of
+        records are queued, so a chunk is never held in memory whole.
+
+        Args:
+            chunk: The request context of the chunk.
+            executor: The executor to fetch the chunk on, or None when it is
+                fetched on the asyncio engine.
+
+        Returns:
+            The queue to read the chunk's records from, in order.
+        """
+        queue: RecordQueue[dict] = RecordQueue()
+        engine = self.async_engine
+        if engine is not None:
+            engine.submit(engine.hand_off(self.request_pages_async(chunk), queue))
+        else:
+            cast("Executor", executor).submit(queue.fill, self.request_pages(chunk))
+        return queue
+
+    def fetch_chunks(self, chunks: list[dict | None]) -> Iterator[RecordQueue[dict]]:
+        """Fetch chunks concurrently, yielding their record queues in order.
+
+        At most :attr:`concurrency` chunks are fetched ahead of the one being
+        read, and chunks that are never read are cancelled.
+
+        Args:
+            chunks: The request contexts of the chunks.
+
+        Yields:
+            The queue of every chunk, to be read before the next is yielded.
+        """
+        executor = (
+            ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix=f"tap-toggl-{self.name}",
+            )
+            if self.async_engine is None
+            else nullcontext()
+        )
+        with executor as pool:
+            iterator = iter(chunks)
+            pending = deque(
+                self.fetch_chunk(chunk, pool)
+                for _, chunk in zip(range(self.concurrency), iterator)
+            )
+            try:
+                while pending:
+                    yield pending[0]
+                    pending.popleft()
+                    for chunk in iterator:
+                        pending.append(self.fetch_chunk(chunk, pool))
+                        break
+            finally:
+                for queue in pending:
+                    queue.cancel()
+
+    def prefetch(self, context: dict, executor: Executor | None) -> None:
+        """Start fetching a partition ahead of it being synced.
+
+        Only a few batches of records of every chunk are fetched ahead, see
+        :meth:`fetch_chunk`.
+
+        Args:
+            context: Stream partition or context dictionary.
+            executor: The executor to fetch the partition's chunks on, or None
+                when they are fetched on the asyncio engine.
+        """
+        self.cancel_prefetch(context)
+        chunks = self.get_partition_chunks(context)
+        self.instrumentation.register_chunks(context, chunks)
+        queues = [self.fetch_chunk(chunk, executor) for chunk in chunks]
+        self._prefetched[context_key(context)] = (chunks, queues)
+
+    def cancel_prefetch(self, context: dict) -> None:
+        """Stop fetching a partition prefetched but not synced.
+
+        Args:
+            context: Stream partition or context dictionary.
+        """
+        prefetched = self._prefetched.pop(context_key(context), None)
+        for queue in prefetched[1] if prefetched else []:
+            queue.cancel()
+
+    def cancel_prefetches(self) -> None:
+        """Stop fetching every partition prefetched but not synced."""
+        for _, queues in self._prefetched.values():
+            for queue in queues:
+                queue.cancel()
+        self._prefetched.clear()
+
+    def request_records(self, context: dict | None) -> Iterable[dict]:
+        """Request records from REST endpoint(s), returning response records.
+
+        Partitions made of several chunks are fetched concurrently, or taken from
+        an earlier :meth:`prefetch`, and emitted in chunk order. Otherwise chunks
+        are requested one page at a time with resumable pagination checkpoints.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Yields:
+            An item for every record in the response.
+        """
+        key = context_key(context)
+        prefetched = self._prefetched.pop(key, None)
+        chunks = prefetched[0] if prefetched else self.get_partition_chunks(context)
+        if self.delete_detector is not None:
+            self._requested_chunks[key] = chunks
+        queues: Iterable[RecordQueue[dict]]
+        if prefetched:
+            queues = prefetched[1]
+        else:
+            self.instrumentation.register_chunks(context, chunks)
+            if len(chunks) > 1 and (self.async_engine or self.max_workers > 1):
+                queues = self.fetch_chunks(chunks)
+            elif self.async_engine is not None:
+                queues = [self.fetch_chunk(chunk, None) for chunk in chunks]
+            else:
+                for chunk in chunks:
+                    yield from self.request_pages(chunk, context)
+                    self.chunk_completed(context, chunk)
+                self.partition_completed(context)
+                return
+
+        try:
+            for chunk, records in zip(chunks, queues):
+                yield from records
+                self.chunk_completed(context, chunk)
+        finally:
+            if isinstance(queues, Generator):
+                queues.close()
+            else:
+                for queue in queues:
+                    queue.cancel()
+        self.partition_completed(context)
+
+    def _get_processed_records(self, context: dict | None) -> Iterable[dict]:
+        """Request and post-process the records of a partition.
+
+        Records that have not changed since the partition's bookmark are dropped
+        before any further processing. The partition's time only counts the
+        requests, parsing and post-processing producing its records, not the
+        time the SDK takes to write them or to sync child streams in between.
+        """
+        instrumentation = self.instrumentation
+        count = 0
+        producer_seconds = 0.0
+        resumed = time.perf_counter()
+        paused = False
+        try:
+            for record in self._produce_records(context):
+                count += 1
+                producer_seconds += time.perf_counter() - resumed
+                paused = True
+                yield record
+                paused = False
+                resumed = time.perf_counter()
+        finally:
+            if not paused:
+                producer_seconds += time.perf_counter() - resumed
+            instrumentation.add_records(context, count, producer_seconds)
+            if context:
+                self.log_pipeline_summary(context)
+
+    def _produce_records(self, context: dict | None) -> Iterator[dict]:
+        """Request, filter and post-process the records of a partition.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Yields:
+            The partition's stamped records, then its delete markers.
+        """
+        modified_since = self.get_modified_since(context)
+        threshold = modified_since - CLOCK_SKEW if modified_since else None
+        detector = self.delete_detector
+        post_process_seconds = 0.0
+        try:
+            records = self.request_records(context)
+            projection = None if self.parses_projection else self.projection
+            if projection is not None:
+                records = (
+                    {k: v for k, v in record.items() if k in projection}
+                    for record in records
+                )
+            for record in records:
+                if detector is not None:
+                    detector.observe(context, record)
+                if threshold:
+                    value = record.get(self.replication_key)
+                    if value and parse_datetime(value) < threshold:
+                        continue
+                post_process_started = time.perf_counter()
+                transformed_record = self.post_process(record, context)
+                post_process_seconds += time.perf_counter() - post_process_started
+                if transformed_record is None or self.is_duplicate(
+                    transformed_record,
+                    context,
+                ):
+                    continue
+                self._current_context = context
+                yield self.stamp_record(transformed_record)
+
+            if detector is not None:
+                for marker in self.get_delete_markers(context):
+                    yield self.stamp_record(marker)
+        finally:
+            self.instrumentation.add_time(
+                context,
+                Stage.POST_PROCESS,
+                post_process_seconds,
+            )
+
+    @cached_property
+    def record_index(self) -> RecordIndex | None:
+        """Return the index of emitted records, if they are de-duplicated."""
+        if not self.dedupes_across_partitions:
+            return None
+        if not self.config.get("dedupe_organization_members"):
+            return None
+        return RecordIndex()
+
+    def is_duplicate(self, record: dict, context: dict | None) -> bool:
+        """Return whether an identical record was emitted for another partition.
+
+        Records are identified by their primary key, and compared by their
+        replication key value or else a hash of their content, leaving out the
+        properties of the partition context.
+
+        Args:
+            record: A post-processed record.
+            context: Stream partition or context dictionary.
+
+        Returns:
+            True if the record is a duplicate to drop.
+        """
+        index = self.record_index
+        if index is None:
+            return False
+        key = tuple(record.get(name) for name in self.primary_keys or [])
+        fingerprint = (
+            record.get(self.replication_key) if self.replication_key else None
+        ) or content_hash(record, exclude=context or {})
+        return index.is_duplicate(key, fingerprint)
+
+    def stamp_record(self, record: dict) -> dict:
+        """Add the properties the tap sets on every record, where they apply.
+
+        Args:
+            record: A post-processed record or delete marker.
+
+        Returns:
+            The record, with its account and deletion time set.
+        """
+        if self.delete_detector is not None and DELETED_AT_KEY not in record:
+            value = deleted_at(record)
+            if value:
+                record[DELETED_AT_KEY] = value
+        if self.account_id is not None:
+            record[ACCOUNT_KEY] = self.account_id
+        return record
+
+    def get_id_bucket(self, record: dict) -> str:  # noqa: ARG002
+        """Return the bucket a record's ID is kept in for deleted record detection.
+
+        Args:
+            record: A record as returned by Toggl.
+
+        Returns:
+            The bucket name. Streams always requested in full use one bucket.
+        """
+        return ""
+
+    def get_covered_buckets(self, chunks: list[dict | None]) -> BucketFilter | None:
+        """Return which ID buckets were requested in full for a partition.
+
+        Args:
+            chunks: The request contexts the partition was requested with.
+
+        Returns:
+            A filter of the buckets whose IDs can be compared with the last
+            sync, or None if only records changed since a bookmark were
+            requested.
+        """
+        if any(chunk and chunk.get("since") for chunk in chunks):
+            return None
+        return lambda bucket: True  # noqa: ARG005
+
+    def get_delete_markers(self, context: dict | None) -> Iterator[dict]:
+        """Return records marking the IDs of a partition deleted since last sync.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Yields:
+            A record with the partition context, the ID and ``_sdc_deleted_at``
+            for every record that is no longer returned by Toggl.
+        """
+        detector = cast("DeletedRecordDetector", self.delete_detector)
+        chunks = self._requested_chunks.pop(context_key(context), [context])
+        deleted_ids = detector.finish(context, self.get_covered_buckets(chunks))
+        if deleted_ids:
+            self.logger.info(
+                "Found %d deleted '%s' records with context: %s",
+                len(deleted_ids),
+                self.name,
+                context,
+            )
+        now = utc_now().isoformat()
+        for record_id in deleted_ids:
+            yield {**(context or {}), "id": record_id, DELETED_AT_KEY: now}
+
+    def _increment_stream_state(
+        self,
+        latest_record: dict[str, Any],
+        *,
+        context: dict | None = None,
+    ) -> None:
+        """Update the bookmark from a record, unless it only marks a deletion.
+
+        Args:
+            latest_record: The record just synced.
+            context: Stream partition or context dictionary.
+        """
+        if self.replication_key and latest_record.get(self.replication_key) is None:
+            return
+        super()._increment_stream_state(latest_record, context=context)
+
+    @cached_property
+    def projection(self) -> frozenset[str] | None:
+        """Return the properties records are reduced to, if not all are selected.
+
+        Unselected properties are dropped as soon as records are parsed, rather
+        than being post-processed and conformed only to be dropped on output.
+        Key properties and the :attr:`required_properties` are always kept.
+        """
+        if not self.selected:
+            return None
+        properties = self.schema["properties"]
+        selected = {name for name in properties if self.mask[("properties", name)]}
+        if len(selected) == len(properties):
+            return None
+        selected.update(self.primary_keys or [])
+        selected.update(self.required_properties)
+        if self.replication_key:
+            selected.add(self.replication_key)
+        if self.delete_detector is not None:
+            selected.update(DELETED_AT_FIELDS)
+        return frozenset(selected)
+
+    @cached_property
+    def record_conformer(self) -> Conformer | None:
+        """Return the compiled record conformer, if fast output is enabled."""
+        if not self.config.get("fast_output"):
+            return None
+        if self.TYPE_CONFORMANCE_LEVEL != TypeConformanceLevel.RECURSIVE:
+            return None
+        deselected = {
+            breadcrumb for breadcrumb, selected in self.mask.items() if not selected
+        }
+        if any(len(breadcrumb) > 2 for breadcrumb in deselected):  # noqa: PLR2004
+            # Nested properties are deselected, let the SDK handle selection.
+            return None
+        return compile_conformer(
+            self.schema,
+            frozenset(breadcrumb[-1] for breadcrumb in deselected if breadcrumb),
+        )
+
+    def _generate_record_messages(self, record: dict) -> Iterator[RecordMessage]:
+        """Conform a record and return its messages, one per stream map.
+
+        With fast output enabled, records are conformed with a conformer compiled
+        once for the stream's schema and selection. Otherwise the SDK's generic
+        conformance is used.
+
+        Args:
+            record: A single stream record.
+
+        Yields:
+            Record message objects.
+        """
+        conformer = self.record_conformer
+        if conformer is None:
+            yield from super()._generate_record_messages(record)
+            return
+
+        record, unmapped = conformer(record)
+        if unmapped:
+            self._warn_unmapped_properties(tuple(unmapped))
+        for stream_map in self.stream_maps:
+            mapped_record = stream_map.transform(record)
+            if mapped_record is not None:
+                yield RecordMessage(
+                    stream=stream_map.stream_alias,
+                    record=mapped_record,
+                    version=None,
+                    time_extracted=utc_now(),
+                )
+
+    def _warn_unmapped_properties(self, paths: tuple[str, ...]) -> None:
+        """Log properties missing from the schema, once per set of properties."""
+        if paths not in self._unmapped_warnings:
+            self._unmapped_warnings.add(paths)
+            self.logger.warning(
+                "Properties %s were present in the '%s' stream but "
+                "not found in catalog schema. Ignoring.",
+                paths,
+                self.name,
+            )
+
+    def _write_record_message(self, record: dict) -> None:
+        """Write out a RECORD message, timing conformance and serialization.
+
+        Args:
+            record: A single stream record.
+        """
+        started = time.perf_counter()
+        super()._write_record_message(record)
+        self.instrumentation.add_time(
+            self._current_context,
+            Stage.WRITE,
+            time.perf_counter() - started,
+        )
+
+    @property
+    def parent_cache(self) -> ParentContextCache | None:
+        """Return the cache of parent records, if ``parent_cache_path`` is set."""
+        return self._tap.parent_cache  # type: ignore[attr-defined]
+
+    def uses_parent_cache(self, context: dict | None) -> bool:
+        """Return whether records of a partition are read from the parent cache.
+
+        Only top-level streams that are synced solely for their selected child
+        streams are cached, as their records are not emitted and every one of
+        them is needed to generate child contexts.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Returns:
+            True if the parent cache is enabled and applies to the partition.
+        """
+        return (
+            self.parent_cache is not None
+            and context is None
+            and not self.selected
+            and self.has_selected_descendents
+        )
+
+    def _get_cached_parent_records(self) -> Iterable[dict]:
+        """Return the records of a parent stream, from the cache when possible.
+
+        A fresh cache entry is used without any request, so that child streams
+        start right away. A stale entry of a stream with a ``since`` filter is
+        revalidated by requesting only the records modified after the latest
+        cached ``at`` value. Otherwise every record is requested again. The
+        cache is updated once all records have been read.
+        """
+        cache = self.parent_cache
+        assert cache is not None  # noqa: S101
+        key = account_key(self.url_base, self.config["api_token"])
+        entry = cache.get(self.name, key)
+        if entry is not None and cache.is_fresh(entry):
+            self.logger.info(
+                "Using %d cached '%s' records.",
+                len(entry["records"]),
+                self.name,
+            )
+            yield from entry["records"]
+            return
+
+        since = self._get_cache_since(entry)
+        if since is None:
+            records = list(self._get_processed_records(None))
+        else:
+            self.logger.info(
+                "Revalidating cached '%s' records modified since %s.",
+                self.name,
+                since.isoformat(),
+            )
+            changed = [
+                record
+                for record in map(
+                    self.post_process,
+                    self.request_chunk({"since": int(since.timestamp())}),
+                )
+                if record is not None
+            ]
+            records = self._merge_cached_records(entry["records"], changed)
+        cache.put(self.name, key, records)
+        yield from records
+
+    def _get_cache_since(self, entry: dict | None) -> datetime | None:
+        """Return the time to revalidate a stale cache entry from, if possible."""
+        if entry is None or not self.supports_since_filter or not self.replication_key:
+            return None
+        values = [
+            parse_datetime(record[self.replication_key])
+            for record in entry["records"]
+            if record.get(self.replication_key)
+        ]
+        return max(values) - CLOCK_SKEW if values else None
+
+    def _merge_cached_records(
+        self,
+        cached: list[dict],
+        changed: list[dict],
+    ) -> list[dict]:
+        """Apply changed records to cached ones, dropping deleted records."""
+
+        def record_key(record: dict) -> tuple:
+            return tuple(record.get(key) for key in self.primary_keys or ())
+
+        merged = {record_key(record): record for record in cached}
+        for record in changed:
+            merged[record_key(record)] = record
+        return [
+            record for record in merged.values() if not record.get("server_deleted_at")
+        ]
+
+    def get_records(self, context: dict | None) -> Iterable[dict[str, Any]]:
+        """Return a generator of record-type dictionary objects.
+
+        When ``concurrent_child_streams`` is enabled, the partitions of selected
+        child streams are fetched on a bounded worker pool a few parent records
+        ahead of the one being synced. Child records are still emitted one
+        partition at a time, in parent record order.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Yields:
+            One item per (possibly processed) record in the API.
+        """
+        if self.uses_parent_cache(context):
+            records = self._get_cached_parent_records()
+        else:
+            records = self._get_processed_records(context)
+        children = [
+            child
+            for child in self.child_streams
+            if child.selected or child.has_selected_descendents
+        ]
+        prefetches = self.config.get("concurrent_child_streams") or self.async_engine
+        if not prefetches or not children:
+            yield from records
+            return
+
+        executor = (
+            ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix=f"tap-toggl-{self.name}",
+            )
+            if self.async_engine is None
+            else nullcontext()
+        )
+        with executor:
+            lookahead: deque[tuple[dict, list[tuple[TogglStream, dict]]]] = deque()
+            try:
+                for record in records:
+                    prefetched = []
+                    for child_context in self.generate_child_contexts(
+                        record,
+                        context,
+                    ):
+                        if child_context is None:
+                            continue
+                        for child in children:
+                            child.prefetch(child_context, executor)
+                            prefetched.append((child, child_context))
+                    lookahead.append((record, prefetched))
+                    if len(lookahead) > self.concurrency:
+                        yield from self._emit_prefetched(*lookahead.popleft())
+                while lookahead:
+                    yield from self._emit_prefetched(*lookahead.popleft())
+            finally:
+                for child in children:
+                    child.cancel_prefetches()
+
+    @staticmethod
+    def _emit_prefetched(
+        record: dict,
+        prefetched: list[tuple[TogglStream, dict]],
+    ) -> Iterator[dict]:
+        """Yield a parent record, then cancel child partitions not synced for it.
+
+        Once the record is processed, its child partitions have been synced, so
+        any left were skipped, for instance by a stream map filtering the record
+        out. Cancelling them frees the workers blocked on their queues.
+
+        Args:
+            record: The parent record.
+            prefetched: Every child stream and context prefetched for it.
+
+        Yields:
+            The record.
+        """
+        yield record
+        for child, child_context in prefetched:
+            child.cancel_prefetch(child_context)
 
 
 class TogglPaginationStream(TogglStream):
     """Toggl stream class with pagination variation."""
 
+    page_size_param = "per_page"
+    supports_since_filter = True
+
     def get_new_paginator(self) -> BaseAPIPaginator:
         """Get a fresh paginator for this API endpoint.
 
@@ -66,7 +1540,7 @@ class TogglPaginationStream(TogglStream):
 
     def get_url_params(
         self,
-        context: dict | None,  # noqa: ARG002
+        context: dict | None,
         next_page_token: Any | None,  # noqa: ANN401
     ) -> dict[str, Any]:
         """Return a dictionary of values to be used in URL parameterization.
@@ -78,12 +1552,43 @@ class TogglPaginationStream(TogglStream):
         Returns:
             A dictionary of URL query parameters.
         """
-        params: dict = {}
-        if self.config.get("start_date") and self.name != "projects":
-            params["since"] = self.start_time_to_epoch(self.config.get("start_date"))
+        params: dict = super().get_url_params(context, next_page_token)
         if next_page_token:
             params["page"] = next_page_token
+        if context and context.get("page_size"):
+            params[self.page_size_param] = context["page_size"]
         if self.replication_key:
             params["sort_order"] = "asc"
             params["sort_field"] = self.replication_key
         return params
+
+
+class TogglAccountStream(TogglStream):
+    """Toggl stream reading one account-wide collection instead of one per workspace.
+
+    Combine with a per-workspace stream class to reuse its name and schema, e.g.
+    ``class AccountTagsStream(TogglAccountStream, TagsStream)``.
+    """
+
+    parent_stream_type = None
+    page_size_param = None
+    required_properties = ("wid",)
+
+    def get_new_paginator(self) -> BaseAPIPaginator:
+        """Get a fresh paginator for this API endpoint.
+
+        Returns:
+            A paginator instance.
+        """
+        return SinglePagePaginator()
+
+    def post_process(
+        self,
+        row: dict,
+        context: dict | None = None,
+    ) -> dict | None:
+        """Stamp the workspace of each record, as the request context has none."""
+        row = super().post_process(row, context)
+        if row is not None and row.get("workspace_id") is None:
+            row["workspace_id"] = row.get("wid")
+        return row
@@ -0,0 +1,53 @@
+"""De-duplication of records repeated in several partitions of a stream."""
+
+from __future__ import annotations
+
+import json
+from hashlib import blake2b
+from typing import Hashable, Iterable
+
+
+def content_hash(record: dict, exclude: Iterable[str] = ()) -> int:
+    """Return a compact hash of a record's content.
+
+    Args:
+        record: The record.
+        exclude: Properties to leave out, such as those of the partition.
+
+    Returns:
+        A 64-bit hash of the remaining properties and values.
+    """
+    excluded = set(exclude)
+    content = {k: v for k, v in record.items() if k not in excluded}
+    encoded = json.dumps(content, sort_keys=True, default=str).encode()
+    return int.from_bytes(blake2b(encoded, digest_size=8).digest(), "big")
+
+
+class RecordIndex:
+    """The records already emitted by a stream, as key and fingerprint pairs.
+
+    Only one fingerprint is kept per key, the modification time or a 64-bit
+    content hash, so the index stays small for streams of many records. It is
+    only used on the main thread.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._fingerprints: dict[Hashable, Hashable] = {}
+        self.duplicates = 0
+
+    def is_duplicate(self, key: Hashable, fingerprint: Hashable) -> bool:
+        """Return whether an identical record was seen, and remember this one.
+
+        Args:
+            key: The record's identity, such as its primary key values.
+            fingerprint: The record's modification time or content hash.
+
+        Returns:
+            True if a record with the same key and fingerprint was seen before.
+        """
+        if self._fingerprints.get(key) == fingerprint:
+            self.duplicates += 1
+            return True
+        self._fingerprints[key] = fingerprint
+        return False
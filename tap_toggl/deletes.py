@@ -0,0 +1,239 @@
+"""Deleted record detection by comparing the IDs of consecutive syncs."""
+
+from __future__ import annotations
+
+import base64
+import json
+import os
+import zlib
+from array import array
+from pathlib import Path
+from typing import Callable, Iterable
+
+#: Version of the ID file layout. Files with another version are ignored.
+ID_FILE_VERSION = 1
+
+#: Property marking records that were deleted in Toggl.
+DELETED_AT_KEY = "_sdc_deleted_at"
+
+#: Record properties Toggl sets on deleted records it still returns.
+DELETED_AT_FIELDS = ("server_deleted_at", "deleted_at")
+
+#: Decides whether the IDs of a bucket were all requested in this sync.
+BucketFilter = Callable[[str], bool]
+
+
+def encode_ids(ids: Iterable[int]) -> str:
+    """Encode a set of IDs compactly, as compressed deltas of the sorted IDs.
+
+    Args:
+        ids: Integer record IDs.
+
+    Returns:
+        An ASCII string.
+    """
+    previous = 0
+    deltas = array("q")
+    for record_id in sorted(ids):
+        deltas.append(record_id - previous)
+        previous = record_id
+    return base64.b64encode(zlib.compress(deltas.tobytes())).decode("ascii")
+
+
+def decode_ids(encoded: str) -> set[int]:
+    """Decode IDs encoded with :func:`encode_ids`.
+
+    Args:
+        encoded: The encoded IDs.
+
+    Returns:
+        The set of IDs.
+    """
+    deltas = array("q")
+    deltas.frombytes(zlib.decompress(base64.b64decode(encoded)))
+    ids = set()
+    previous = 0
+    for delta in deltas:
+        previous += delta
+        ids.add(previous)
+    return ids
+
+
+def deleted_at(record: dict) -> str | None:
+    """Return when Toggl deleted a record it still returns, if it did.
+
+    Args:
+        record: A record as returned by Toggl.
+
+    Returns:
+        The deletion time, or None.
+    """
+    for field in DELETED_AT_FIELDS:
+        if record.get(field):
+            return record[field]
+    return None
+
+
+class IdFile:
+    """The IDs of every reconciled stream partition, kept between syncs.
+
+    IDs are grouped into buckets per partition, such as the start date of time
+    entries, so that a sync covering part of a partition's records is compared
+    only with the buckets it requested. The file is only read and written on
+    the main thread.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        """Initialize the ID file.
+
+        Args:
+            path: The JSON file to keep IDs in.
+        """
+        self.path = Path(path)
+        self._streams: dict[str, dict[str, dict[str, str]]] | None = None
+
+    @property
+    def streams(self) -> dict[str, dict[str, dict[str, str]]]:
+        """Return the encoded IDs by stream, partition and bucket."""
+        if self._streams is None:
+            self._streams = {}
+            try:
+                data = json.loads(self.path.read_text())
+            except (OSError, ValueError):
+                data = None
+            if isinstance(data, dict) and data.get("version") == ID_FILE_VERSION:
+                self._streams = data.get("streams") or {}
+        return self._streams
+
+    def get(self, stream_name: str, partition: str) -> dict[str, set[int]]:
+        """Return the IDs of a partition by bucket.
+
+        Args:
+            stream_name: The stream name.
+            partition: The partition key.
+
+        Returns:
+            A dictionary of ID sets.
+        """
+        buckets = self.streams.get(stream_name, {}).get(partition, {})
+        return {bucket: decode_ids(ids) for bucket, ids in buckets.items()}
+
+    def put(
+        self,
+        stream_name: str,
+        partition: str,
+        buckets: dict[str, set[int]],
+    ) -> None:
+        """Replace the IDs of a partition.
+
+        Args:
+            stream_name: The stream name.
+            partition: The partition key.
+            buckets: ID sets by bucket. Empty buckets are dropped.
+        """
+        self.streams.setdefault(stream_name, {})[partition] = {
+            bucket: encode_ids(ids) for bucket, ids in sorted(buckets.items()) if ids
+        }
+
+    def save(self) -> None:
+        """Write the file, if it was read."""
+        if self._streams is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        temp_path.write_text(
+            json.dumps({"version": ID_FILE_VERSION, "streams": self._streams}),
+        )
+        temp_path.replace(self.path)
+
+
+class DeletedRecordDetector:
+    """Track the IDs of one stream's partitions and find those that are gone."""
+
+    def __init__(
+        self,
+        stream_name: str,
+        id_file: IdFile,
+        bucket_of: Callable[[dict], str],
+    ) -> None:
+        """Initialize the detector.
+
+        Args:
+            stream_name: The stream name.
+            id_file: The file IDs are kept in between syncs.
+            bucket_of: Returns the bucket of a record.
+        """
+        self.stream_name = stream_name
+        self.id_file = id_file
+        self.bucket_of = bucket_of
+        self._seen: dict[str, dict[str, set[int]]] = {}
+        self._deleted: dict[str, set[int]] = {}
+
+    @staticmethod
+    def partition_key(context: dict | None) -> str:
+        """Return the key of a partition in the ID file.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Returns:
+            The partition context as sorted JSON.
+        """
+        return json.dumps(context or {}, sort_keys=True, default=str)
+
+    def observe(self, context: dict | None, record: dict) -> None:
+        """Record the ID of a record requested from Toggl.
+
+        Args:
+            context: Stream partition or context dictionary.
+            record: The record, before it is filtered or transformed.
+        """
+        key = self.partition_key(context)
+        record_id = record.get("id")
+        if record_id is None:
+            return
+        if deleted_at(record):
+            self._deleted.setdefault(key, set()).add(record_id)
+            return
+        buckets = self._seen.setdefault(key, {})
+        buckets.setdefault(self.bucket_of(record), set()).add(record_id)
+
+    def finish(
+        self,
+        context: dict | None,
+        covered: BucketFilter | None,
+    ) -> list[int]:
+        """Compare the IDs of a completed partition with those of the last sync.
+
+        Args:
+            context: Stream partition or context dictionary.
+            covered: Returns whether every record of a bucket was requested, or
+                None if only changed records were requested.
+
+        Returns:
+            The sorted IDs that are no longer returned by Toggl, excluding those
+            returned with a deletion time.
+        """
+        key = self.partition_key(context)
+        seen = self._seen.pop(key, {})
+        marked = self._deleted.pop(key, set())
+        previous = self.id_file.get(self.stream_name, key)
+
+        missing: set[int] = set()
+        buckets = dict(previous)
+        for bucket, ids in previous.items():
+            if covered is not None and covered(bucket):
+                missing |= ids - seen.get(bucket, set())
+                buckets[bucket] = set()
+        for bucket, ids in seen.items():
+            buckets[bucket] = buckets.get(bucket, set()) | ids
+        # Records returned as deleted, or found in another bucket, stay known
+        # only where they were last seen.
+        every_seen = set().union(*seen.values()) if seen else set()
+        for bucket in buckets:
+            buckets[bucket] -= marked
+            if bucket not in seen:
+                buckets[bucket] -= every_seen
+
+        self.id_file.put(self.stream_name, key, buckets)
+        return sorted(missing - every_seen - marked)
@@ -0,0 +1,29 @@
+"""Optional dependencies, imported only once a setting needs them."""
+
+from __future__ import annotations
+
+import importlib
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from types import ModuleType
+
+
+@lru_cache(maxsize=None)
+def optional_import(name: str) -> ModuleType | None:
+    """Import an optional dependency the first time it is used.
+
+    Importing extras such as ijson and orjson when the tap starts would slow
+    down every invocation, including those that never use them.
+
+    Args:
+        name: The module name.
+
+    Returns:
+        The module, or None if it is not installed.
+    """
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
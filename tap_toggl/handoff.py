@@ -0,0 +1,160 @@
+"""Bounded hand-off of chunk records from the workers fetching them."""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from typing import Callable, Generic, Iterable, Iterator, TypeVar
+
+_T = TypeVar("_T")
+
+#: Records handed to the main thread at once.
+BATCH_SIZE = 100
+
+#: Batches of a chunk held ahead of the main thread before its worker waits.
+MAX_BATCHES = 8
+
+
+class ChunkAbandonedError(Exception):
+    """The records of a chunk are no longer wanted, so fetching it stops."""
+
+
+class RecordQueue(Generic[_T]):
+    """The records of one chunk, passed from its worker to the main thread.
+
+    The worker fetching the chunk adds batches of records as pages are parsed,
+    and waits while ``max_batches`` are already waiting. The main thread reads
+    them in order, so that only a few batches of every chunk being fetched are
+    held in memory, however large the chunk. Once cancelled, the waiting
+    batches are dropped and the worker's next batch stops it.
+    """
+
+    def __init__(self, max_batches: int | None = None) -> None:
+        """Initialize an empty queue.
+
+        Args:
+            max_batches: The number of batches held before the worker waits,
+                :data:`MAX_BATCHES` by default.
+        """
+        self.max_batches = max(1, max_batches or MAX_BATCHES)
+        self._batches: deque[list[_T]] = deque()
+        self._changed = threading.Condition()
+        self._done = False
+        self._error: Exception | None = None
+        self._cancelled = False
+        #: Called when a batch is taken or the queue is cancelled, for workers
+        #: that wait for room without blocking their thread.
+        self.on_space: Callable[[], None] | None = None
+
+    def offer(self, batch: list[_T]) -> bool:
+        """Add a batch of records if there is room, without waiting.
+
+        Args:
+            batch: The records.
+
+        Returns:
+            True if the batch was added, False if the queue is full.
+
+        Raises:
+            ChunkAbandonedError: If the queue was cancelled.
+        """
+        with self._changed:
+            if self._cancelled:
+                raise ChunkAbandonedError
+            if len(self._batches) >= self.max_batches:
+                return False
+            self._batches.append(batch)
+            self._changed.notify_all()
+            return True
+
+    def put(self, batch: list[_T]) -> None:
+        """Add a batch of records, waiting until there is room.
+
+        Args:
+            batch: The records.
+
+        Raises:
+            ChunkAbandonedError: If the queue was cancelled.
+        """
+        with self._changed:
+            self._changed.wait_for(
+                lambda: self._cancelled or len(self._batches) < self.max_batches,
+            )
+            if self._cancelled:
+                raise ChunkAbandonedError
+            self._batches.append(batch)
+            self._changed.notify_all()
+
+    def fill(self, records: Iterable[_T], batch_size: int | None = None) -> None:
+        """Add every record in batches, then mark the chunk as complete.
+
+        This is run on the worker fetching the chunk. An error fetching it is
+        raised to the main thread once it reaches the error.
+
+        Args:
+            records: The chunk's records, fetched as they are iterated.
+            batch_size: The number of records per batch, :data:`BATCH_SIZE` by
+                default.
+        """
+        batch_size = batch_size or BATCH_SIZE
+        batch: list[_T] = []
+        try:
+            for record in records:
+                batch.append(record)
+                if len(batch) >= batch_size:
+                    self.put(batch)
+                    batch = []
+            if batch:
+                self.put(batch)
+        except ChunkAbandonedError:
+            return
+        except Exception as exc:  # noqa: BLE001
+            self.finish(exc)
+            return
+        self.finish()
+
+    def finish(self, error: Exception | None = None) -> None:
+        """Mark the chunk as complete, or as failed with an error.
+
+        Args:
+            error: The error fetching the chunk, if it failed.
+        """
+        with self._changed:
+            self._done = True
+            self._error = error
+            self._changed.notify_all()
+
+    def cancel(self) -> None:
+        """Drop the waiting batches and stop the worker at its next batch."""
+        with self._changed:
+            self._cancelled = True
+            self._batches.clear()
+            self._changed.notify_all()
+        if self.on_space is not None:
+            self.on_space()
+
+    def __iter__(self) -> Iterator[_T]:
+        """Yield the chunk's records in order, waiting for the worker.
+
+        Yields:
+            Every record of the chunk.
+
+        Raises:
+            Exception: The error fetching the chunk, after the records before it.
+        """
+        while True:
+            with self._changed:
+                self._changed.wait_for(
+                    lambda: self._batches or self._done or self._cancelled,
+                )
+                if self._cancelled:
+                    return
+                if not self._batches:
+                    if self._error is not None:
+                        raise self._error
+                    return
+                batch = self._batches.popleft()
+                self._changed.notify_all()
+            if self.on_space is not None:
+                self.on_space()
+            yield from batch
@@ -0,0 +1,258 @@
+"""On-disk cache of HTTP responses, with conditional requests and replay."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from datetime import timedelta
+from hashlib import sha256
+from http import HTTPStatus
+from pathlib import Path
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from singer_sdk.exceptions import FatalAPIError
+
+from tap_toggl.cache_mode import (
+    DEFAULT_MAX_CACHE_BYTES,
+    DEFAULT_RESPONSE_TTL_SECONDS,
+    CacheMode,
+)
+from tap_toggl.instrumentation import ResponseBody, response_size
+
+#: Headers describing the body as transferred, which no longer apply once it
+#: has been decoded and cached.
+TRANSFER_HEADERS = ("Content-Encoding", "Content-Length", "Transfer-Encoding")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    stored_at REAL NOT NULL,
+    used_at REAL NOT NULL
+)
+"""
+
+
+class ResponseNotRecordedError(FatalAPIError):
+    """A request was made in replay mode that was not recorded."""
+
+
+def request_key(request: requests.PreparedRequest) -> str:
+    """Return the key of a request's response in the cache.
+
+    Args:
+        request: The request, with its URL, query parameters and payload.
+
+    Returns:
+        A hex digest of the method, URL, payload and credentials, so that the
+        responses of different accounts are never mixed up.
+    """
+    body = request.body or b""
+    if isinstance(body, str):
+        body = body.encode()
+    digest = sha256()
+    for part in (
+        (request.method or "GET").encode(),
+        (request.url or "").encode(),
+        body,
+        request.headers.get("Authorization", "").encode(),
+    ):
+        digest.update(part)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class ResponseCache:
+    """Response bodies kept in a SQLite file between syncs.
+
+    Responses are keyed by request, and are used without a request while they
+    are younger than ``ttl``. Stale responses are revalidated with their ETag
+    or Last-Modified header when Toggl sent one, so unchanged bodies are not
+    transferred again. When the bodies grow larger than ``max_bytes``, the
+    least recently used are evicted. Methods may be called from worker threads
+    and the asyncio engine.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        mode: CacheMode = CacheMode.CACHE,
+        ttl: float = DEFAULT_RESPONSE_TTL_SECONDS,
+        max_bytes: int = DEFAULT_MAX_CACHE_BYTES,
+    ) -> None:
+        """Initialize the cache, creating its file if needed.
+
+        Args:
+            path: The SQLite file to keep responses in.
+            mode: How the cache is used.
+            ttl: Seconds for which responses are fresh.
+            max_bytes: The size of the bodies above which responses are evicted.
+        """
+        self.path = Path(path)
+        self.mode = CacheMode(mode)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.revalidated = 0
+        self.stored = 0
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(
+            self.path,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(SCHEMA)
+        self._size = self._db.execute(
+            "SELECT COALESCE(SUM(LENGTH(body)), 0) FROM responses",
+        ).fetchone()[0]
+
+    def lookup(self, request: requests.PreparedRequest) -> requests.Response | None:
+        """Return the cached response to use instead of sending a request.
+
+        In cache mode, when the cached response is stale, the request is given
+        the headers to revalidate it with instead.
+
+        Args:
+            request: The request about to be sent.
+
+        Returns:
+            The cached response, or None if the request must be sent.
+
+        Raises:
+            ResponseNotRecordedError: In replay mode, if no response was saved.
+        """
+        if self.mode is CacheMode.RECORD:
+            return None
+        key = request_key(request)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT status, headers, body, stored_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                if self.mode is CacheMode.REPLAY:
+                    msg = f"No response recorded for {request.method} {request.url}"
+                    raise ResponseNotRecordedError(msg)
+                return None
+            status, headers, body, stored_at = row
+            if self.mode is CacheMode.CACHE and time.time() - stored_at >= self.ttl:
+                validators = CaseInsensitiveDict(json.loads(headers))
+                if "ETag" in validators:
+                    request.headers["If-None-Match"] = validators["ETag"]
+                if "Last-Modified" in validators:
+                    request.headers["If-Modified-Since"] = validators["Last-Modified"]
+                return None
+            self._db.execute(
+                "UPDATE responses SET used_at = ? WHERE key = ?",
+                (time.time(), key),
+            )
+            self.hits += 1
+        return self._to_response(request, status, headers, body)
+
+    def store(
+        self,
+        request: requests.PreparedRequest,
+        response: requests.Response,
+    ) -> requests.Response:
+        """Save a successful response, or resolve a revalidated one.
+
+        Args:
+            request: The request that was sent.
+            response: Its validated response.
+
+        Returns:
+            The response to parse, which is the cached one if Toggl answered
+            that it has not been modified.
+        """
+        key = request_key(request)
+        now = time.time()
+        if response.status_code == HTTPStatus.NOT_MODIFIED:
+            with self._lock:
+                row = self._db.execute(
+                    "SELECT status, headers, body FROM responses WHERE key = ?",
+                    (key,),
+                ).fetchone()
+                if row is None:
+                    return response
+                self._db.execute(
+                    "UPDATE responses SET stored_at = ?, used_at = ? WHERE key = ?",
+                    (now, now, key),
+                )
+                self.revalidated += 1
+            return self._to_response(request, *row)
+        if response.status_code != HTTPStatus.OK:
+            return response
+
+        body = response.content
+        # Streamed responses are parsed from ``raw``, which has been consumed.
+        response.raw = ResponseBody(body, response_size(response))
+        headers = {
+            name: value
+            for name, value in response.headers.items()
+            if name not in TRANSFER_HEADERS
+        }
+        with self._lock:
+            old = self._db.execute(
+                "SELECT LENGTH(body) FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    response.url,
+                    response.status_code,
+                    json.dumps(headers),
+                    body,
+                    now,
+                    now,
+                ),
+            )
+            self._size += len(body) - (old[0] if old else 0)
+            self.stored += 1
+            self._evict()
+        return response
+
+    def _evict(self) -> None:
+        """Delete the least recently used responses until the cache fits."""
+        while self._size > self.max_bytes:
+            row = self._db.execute(
+                "SELECT key, LENGTH(body) FROM responses ORDER BY used_at LIMIT 1",
+            ).fetchone()
+            if row is None:
+                break
+            self._db.execute("DELETE FROM responses WHERE key = ?", (row[0],))
+            self._size -= row[1]
+
+    @staticmethod
+    def _to_response(
+        request: requests.PreparedRequest,
+        status: int,
+        headers: str,
+        body: bytes,
+    ) -> requests.Response:
+        """Rebuild a response from its cached columns."""
+        response = requests.Response()
+        response.status_code = status
+        response.reason = HTTPStatus(status).phrase
+        response.headers = CaseInsensitiveDict(json.loads(headers))
+        response.url = request.url or ""
+        response.elapsed = timedelta(0)
+        response.request = request
+        response._content = body  # noqa: SLF001
+        # Nothing was transferred for a cached body.
+        response.raw = ResponseBody(body, 0)
+        return response
+
+    def close(self) -> None:
+        """Close the cache file."""
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,281 @@
+"""Instrumentation of Toggl requests and the record pipeline."""
+
+from __future__ import annotations
+
+import enum
+import io
+import threading
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, TypeVar
+
+if TYPE_CHECKING:
+    import requests
+
+_T = TypeVar("_T")
+_DONE = object()
+
+#: Upper bounds, in seconds, of the request latency histogram buckets.
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Stage(str, enum.Enum):
+    """Stages of the record pipeline that time is accounted to."""
+
+    #: Waiting for Toggl to start responding.
+    REQUEST = "request"
+    #: Holding requests back to stay within Toggl's rate limits.
+    THROTTLE = "throttle"
+    #: Reading and decoding response bodies.
+    PARSE = "parse"
+    #: Filtering and transforming records.
+    POST_PROCESS = "post_process"
+    #: Conforming records and serializing Singer messages.
+    WRITE = "write"
+
+
+class TogglMetric(str, enum.Enum):
+    """Metrics logged in addition to the SDK's own."""
+
+    PIPELINE_SUMMARY = "pipeline_summary"
+
+
+@dataclass
+class PipelineStats:
+    """Counters for the requests and records of a stream or partition."""
+
+    requests: int = 0
+    retries: int = 0
+    response_bytes: int = 0
+    records: int = 0
+    seconds: float = 0.0
+    latency_histogram: list[int] = field(
+        default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1),
+    )
+    stage_seconds: dict[Stage, float] = field(
+        default_factory=lambda: dict.fromkeys(Stage, 0.0),
+    )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the counters as a JSON-serializable dictionary.
+
+        The latency histogram holds the number of requests per bucket, keyed by
+        the bucket's upper bound in seconds.
+        """
+        bounds = [str(bound) for bound in LATENCY_BUCKETS] + ["+Inf"]
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "response_bytes": self.response_bytes,
+            "records": self.records,
+            "seconds": round(self.seconds, 6),
+            "records_per_second": round(self.records / self.seconds, 3)
+            if self.seconds
+            else None,
+            "latency_histogram": dict(zip(bounds, self.latency_histogram)),
+            "stage_seconds": {
+                stage.value: round(seconds, 6)
+                for stage, seconds in self.stage_seconds.items()
+            },
+        }
+
+
+def context_key(context: dict | None) -> tuple:
+    """Return a hashable key for a stream context."""
+    return tuple(sorted((context or {}).items()))
+
+
+class ResponseBody(io.BytesIO):
+    """A decoded response body, reporting the bytes transferred for it."""
+
+    def __init__(self, content: bytes, transferred: int) -> None:
+        """Initialize the body.
+
+        Args:
+            content: The decoded body.
+            transferred: The number of bytes received, before decompression.
+        """
+        super().__init__(content)
+        self.transferred = transferred
+
+    def tell(self) -> int:
+        """Return the bytes transferred, as urllib3 does for a consumed body."""
+        return self.transferred
+
+
+def response_size(response: requests.Response) -> int:
+    """Return the number of body bytes read for a response, as transferred.
+
+    Args:
+        response: A response whose body has been consumed.
+
+    Returns:
+        The number of bytes, before decompression where the transport allows it.
+    """
+    try:
+        return int(response.raw.tell())
+    except (AttributeError, TypeError, ValueError):
+        return int(response.headers.get("Content-Length") or 0)
+
+
+class StreamInstrumentation:
+    """Collect request and record pipeline statistics for a stream.
+
+    Statistics are kept for the whole stream and for each partition. Requests
+    are made with the context of a partition chunk, which is mapped back to its
+    partition with :meth:`register_chunks`. Methods may be called from worker
+    threads.
+    """
+
+    def __init__(self, stream_name: str) -> None:
+        """Initialize the instrumentation.
+
+        Args:
+            stream_name: The name of the instrumented stream.
+        """
+        self.stream_name = stream_name
+        self.totals = PipelineStats()
+        self.partitions: dict[tuple, tuple[dict | None, PipelineStats]] = {}
+        self._chunk_partitions: dict[tuple, tuple] = {}
+        self._lock = threading.Lock()
+
+    def _stats(self, context: dict | None) -> PipelineStats:
+        """Return the statistics of a partition, looking up chunk contexts."""
+        key = context_key(context)
+        key = self._chunk_partitions.get(key, key)
+        if key not in self.partitions:
+            self.partitions[key] = (context, PipelineStats())
+        return self.partitions[key][1]
+
+    def register_chunks(self, context: dict | None, chunks: list[dict | None]) -> None:
+        """Account the requests of partition chunks to the partition.
+
+        Args:
+            context: Stream partition or context dictionary.
+            chunks: The request contexts of the partition's chunks.
+        """
+        partition = context_key(context)
+        with self._lock:
+            self._stats(context)
+            for chunk in chunks:
+                self._chunk_partitions[context_key(chunk)] = partition
+
+    def observe_response(
+        self,
+        context: dict | None,
+        response: requests.Response,
+    ) -> None:
+        """Record a response received from Toggl.
+
+        Args:
+            context: The request context.
+            response: The response, whose body may not have been read yet.
+        """
+        latency = response.elapsed.total_seconds()
+        bucket = bisect_left(LATENCY_BUCKETS, latency)
+        with self._lock:
+            for stats in (self.totals, self._stats(context)):
+                stats.requests += 1
+                stats.latency_histogram[bucket] += 1
+                stats.stage_seconds[Stage.REQUEST] += latency
+
+    def observe_body(self, context: dict | None, response: requests.Response) -> None:
+        """Record the size of a response body that has been read.
+
+        Args:
+            context: The request context.
+            response: The response, with its body consumed.
+        """
+        size = response_size(response)
+        with self._lock:
+            for stats in (self.totals, self._stats(context)):
+                stats.response_bytes += size
+
+    def observe_retry(self, context: dict | None) -> None:
+        """Record a request being retried.
+
+        Args:
+            context: The request context.
+        """
+        with self._lock:
+            for stats in (self.totals, self._stats(context)):
+                stats.retries += 1
+
+    def add_time(self, context: dict | None, stage: Stage, seconds: float) -> None:
+        """Account time to a pipeline stage.
+
+        Args:
+            context: The request context, or partition context.
+            stage: The pipeline stage.
+            seconds: The time spent.
+        """
+        with self._lock:
+            for stats in (self.totals, self._stats(context)):
+                stats.stage_seconds[stage] += seconds
+
+    def add_records(self, context: dict | None, records: int, seconds: float) -> None:
+        """Record a partition, or part of one, having been synced.
+
+        Args:
+            context: Stream partition or context dictionary.
+            records: The number of records emitted.
+            seconds: The time taken to emit them.
+        """
+        with self._lock:
+            for stats in (self.totals, self._stats(context)):
+                stats.records += records
+                stats.seconds += seconds
+
+    def timed(
+        self,
+        items: Iterable[_T],
+        context: dict | None,
+        stage: Stage,
+    ) -> Iterator[_T]:
+        """Account the time taken to produce each item to a pipeline stage.
+
+        Only the time spent producing items is counted, not the time the
+        consumer takes between them.
+
+        Args:
+            items: The items, produced lazily.
+            context: The request context.
+            stage: The pipeline stage producing the items.
+
+        Yields:
+            The items.
+        """
+        iterator = iter(items)
+        elapsed = 0.0
+        try:
+            while True:
+                started = time.perf_counter()
+                item = next(iterator, _DONE)
+                elapsed += time.perf_counter() - started
+                if item is _DONE:
+                    return
+                yield item
+        finally:
+            self.add_time(context, stage, elapsed)
+
+    def partition_summary(self, context: dict | None) -> dict[str, Any]:
+        """Return the statistics of a partition.
+
+        Args:
+            context: Stream partition or context dictionary.
+        """
+        with self._lock:
+            return self._stats(context).to_dict()
+
+    def summary(self) -> dict[str, Any]:
+        """Return the statistics of the stream and each of its partitions."""
+        with self._lock:
+            return {
+                **self.totals.to_dict(),
+                "partitions": [
+                    {"context": context, **stats.to_dict()}
+                    for context, stats in self.partitions.values()
+                    if context
+                ],
+            }
@@ -0,0 +1,213 @@
+"""Fast output mode: compiled record conformers and buffered message writes."""
+
+from __future__ import annotations
+
+import sys
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Callable
+
+from singer_sdk._singerlib.messages import format_message as singer_format_message
+from singer_sdk.helpers._typing import (
+    _conform_primitive_property,
+    is_boolean_type,
+    is_object_type,
+    is_uniform_list,
+)
+
+from tap_toggl.extras import optional_import
+
+if TYPE_CHECKING:
+    from singer_sdk._singerlib import Message
+
+#: Conforms a value, appending the paths of properties missing from the schema.
+_Converter = Callable[[Any, list], Any]
+
+#: Record conformer returning the conformed record and unmapped property paths.
+Conformer = Callable[[dict], "tuple[dict, list[str]]"]
+
+#: Types JSON-decoded values have, which need no conversion besides booleans.
+_JSON_SCALARS = frozenset({str, int, float, bool, type(None)})
+
+#: Bytes of messages held in memory before they are written to stdout.
+DEFAULT_BUFFER_SIZE = 64 * 1024
+
+
+def _compile_primitive(schema: dict) -> _Converter:
+    """Compile the conversion of a value that is not a nested object or array."""
+    if is_boolean_type(schema):
+
+        def conform_boolean(elem: Any, unmapped: list) -> Any:  # noqa: ARG001, ANN401
+            if type(elem) in _JSON_SCALARS:
+                return None if elem is None else elem != 0
+            return _conform_primitive_property(elem, schema)
+
+        return conform_boolean
+
+    def conform(elem: Any, unmapped: list) -> Any:  # noqa: ARG001, ANN401
+        if type(elem) in _JSON_SCALARS:
+            return elem
+        return _conform_primitive_property(elem, schema)
+
+    return conform
+
+
+def _compile_object(
+    schema: dict,
+    path: str | None,
+    deselected: frozenset[str] = frozenset(),
+) -> Callable[[dict, list], dict]:
+    """Compile the conversion of an object with known properties."""
+    converters = {
+        name: _compile_property(
+            property_schema,
+            name if path is None else f"{path}.{name}",
+        )
+        for name, property_schema in schema["properties"].items()
+        if name not in deselected
+    }
+
+    def conform(obj: dict, unmapped: list) -> dict:
+        output = {}
+        for name, elem in obj.items():
+            converter = converters.get(name)
+            if converter is not None:
+                output[name] = converter(elem, unmapped)
+            elif name not in deselected:
+                unmapped.append(name if path is None else f"{path}.{name}")
+        return output
+
+    return conform
+
+
+def _compile_property(schema: dict, path: str) -> _Converter:
+    """Compile the conversion of a property value, nested or not."""
+    primitive = _compile_primitive(schema)
+    is_list = is_uniform_list(schema)
+    is_object = bool(is_object_type(schema)) and "properties" in schema
+    if not is_list and not is_object:
+        return primitive
+
+    if is_list:
+        item_schema = schema["items"]
+        item_primitive = _compile_primitive(item_schema)
+        item_object = (
+            _compile_object(item_schema, path) if is_object_type(item_schema) else None
+        )
+    if is_object:
+        nested = _compile_object(schema, path)
+
+    def conform(elem: Any, unmapped: list) -> Any:  # noqa: ANN401
+        if is_list and isinstance(elem, list):
+            return [
+                item_object(item, unmapped)
+                if item_object is not None and isinstance(item, dict)
+                else item_primitive(item, unmapped)
+                for item in elem
+            ]
+        if is_object and isinstance(elem, dict):
+            return nested(elem, unmapped)
+        return primitive(elem, unmapped)
+
+    return conform
+
+
+def compile_conformer(
+    schema: dict,
+    deselected: frozenset[str] = frozenset(),
+) -> Conformer:
+    """Compile a record conformer for a stream schema.
+
+    The conformer gives the same result as the SDK's recursive type conformance,
+    but inspects the schema once instead of for every property of every record.
+
+    Args:
+        schema: The stream's JSON schema.
+        deselected: Top-level properties to drop, as they are not selected.
+
+    Returns:
+        A function returning a conformed copy of a record and the paths of any
+        properties that are not in the schema.
+    """
+    conform_object = _compile_object(schema, None, deselected)
+
+    def conform(record: dict) -> tuple[dict, list[str]]:
+        unmapped: list[str] = []
+        return conform_object(record, unmapped), unmapped
+
+    return conform
+
+
+def _encode_datetime(obj: Any) -> str:  # noqa: ANN401
+    """Encode datetime subclasses, such as pendulum's, which orjson rejects."""
+    if isinstance(obj, datetime):
+        return obj.isoformat(sep="T")
+    raise TypeError
+
+
+def format_message(message: Message) -> bytes:
+    """Serialize a Singer message as a line of JSON.
+
+    orjson is used when installed. Messages it cannot encode, for example with
+    Decimal values, are serialized with the SDK's encoder instead.
+
+    Args:
+        message: The message to serialize.
+
+    Returns:
+        The message followed by a newline, UTF-8 encoded.
+    """
+    orjson = optional_import("orjson")
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                message.to_dict(),
+                default=_encode_datetime,
+                option=orjson.OPT_APPEND_NEWLINE,
+            )
+        except TypeError:
+            pass
+    return (singer_format_message(message) + "\n").encode()
+
+
+class MessageBuffer:
+    """Collect serialized messages and write them to stdout in large chunks."""
+
+    def __init__(self, size: int = DEFAULT_BUFFER_SIZE) -> None:
+        """Initialize the buffer.
+
+        Args:
+            size: The number of bytes to collect before writing them out.
+        """
+        self.size = size
+        self._lines: list[bytes] = []
+        self._buffered = 0
+
+    def write(self, line: bytes) -> None:
+        """Add a serialized message, writing out the buffer once it is full.
+
+        Args:
+            line: The message, including its newline.
+        """
+        self._lines.append(line)
+        self._buffered += len(line)
+        if self._buffered >= self.size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write out every buffered message."""
+        if not self._lines:
+            return
+        data = b"".join(self._lines)
+        self._lines.clear()
+        self._buffered = 0
+
+        # Look stdout up on every flush, it may have been redirected.
+        stdout = sys.stdout
+        binary = getattr(stdout, "buffer", None)
+        stdout.flush()
+        if binary is not None:
+            binary.write(data)
+            binary.flush()
+        else:
+            stdout.write(data.decode())
+            stdout.flush()
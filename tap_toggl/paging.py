@@ -0,0 +1,186 @@
+"""Adaptive page sizes for paginated Toggl endpoints."""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any
+
+import requests
+from singer_sdk.exceptions import RetriableAPIError
+
+if TYPE_CHECKING:
+    from singer_sdk.pagination import BaseAPIPaginator
+
+#: Response time above which pages are made smaller.
+DEFAULT_TARGET_SECONDS = 5.0
+
+#: Response size above which pages are made smaller, whatever their latency.
+DEFAULT_TARGET_BYTES = 16 * 1024 * 1024
+
+#: Smallest page size the controller shrinks to.
+MIN_PAGE_SIZE = 10
+
+#: Status codes of server-side failures that a smaller page may avoid.
+PAGE_FAILURE_STATUSES = (
+    HTTPStatus.INTERNAL_SERVER_ERROR,
+    HTTPStatus.BAD_GATEWAY,
+    HTTPStatus.SERVICE_UNAVAILABLE,
+    HTTPStatus.GATEWAY_TIMEOUT,
+)
+
+
+class PageTooLargeError(RetriableAPIError):
+    """A page request timed out or failed, and is retried with a smaller page."""
+
+
+@dataclass
+class PagePosition:
+    """The next page of a chunk being paginated, and the size to request."""
+
+    paginator: BaseAPIPaginator[Any]
+    size: int | None
+
+
+def is_page_failure(exception: Exception) -> bool:
+    """Return whether a failed request might succeed with a smaller page.
+
+    Args:
+        exception: The exception the request raised.
+
+    Returns:
+        True for read timeouts and server errors.
+    """
+    if isinstance(exception, requests.exceptions.ConnectTimeout):
+        return False
+    if isinstance(exception, requests.exceptions.Timeout):
+        return True
+    response = getattr(exception, "response", None)
+    return (
+        isinstance(exception, RetriableAPIError)
+        and response is not None
+        and response.status_code in PAGE_FAILURE_STATUSES
+    )
+
+
+def aligned_page_size(offset: int, proposed: int, minimum: int) -> int | None:
+    """Return the largest page size that starts a page at a record offset.
+
+    Page-number endpoints can only switch to a page size dividing the number
+    of records already read, as page numbers count pages of the new size.
+
+    Args:
+        offset: The number of records before the next page.
+        proposed: The page size to switch to.
+        minimum: The smallest acceptable page size.
+
+    Returns:
+        The page size, or None if no size from ``minimum`` up divides the offset.
+    """
+    for size in range(proposed, minimum - 1, -1):
+        if offset % size == 0:
+            return size
+    return None
+
+
+class PageSizeController:
+    """Adjust the page size of one stream to how its responses are served.
+
+    Larger pages need fewer requests of the rate-limited quota, so pages grow
+    while full pages come back fast, until they take ``target_seconds`` or
+    ``target_bytes``. Slow or large pages shrink proportionally, and a page
+    that times out or fails on the server is halved, and later growth bisects
+    between the page sizes known to work and to fail. One controller is shared
+    by every worker thread of a stream.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        maximum: int,
+        minimum: int = MIN_PAGE_SIZE,
+        target_seconds: float = DEFAULT_TARGET_SECONDS,
+        target_bytes: int = DEFAULT_TARGET_BYTES,
+    ) -> None:
+        """Initialize the controller.
+
+        Args:
+            size: The initial page size.
+            maximum: The largest page size the API accepts.
+            minimum: The smallest page size to shrink to.
+            target_seconds: The response time pages grow up to.
+            target_bytes: The response size pages grow up to.
+        """
+        self.minimum = min(minimum, size)
+        self.maximum = max(maximum, size)
+        self.target_seconds = target_seconds
+        self.target_bytes = target_bytes
+        self._size = size
+        #: The largest size worth asking for, lowered when the API caps pages.
+        self._limit = self.maximum
+        #: The smallest size that failed, if any did.
+        self._failed: int | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        """Return the page size to request next."""
+        return self._size
+
+    def observe(
+        self,
+        size: int,
+        records: int,
+        seconds: float,
+        response_bytes: int,
+        *,
+        capped: bool = False,
+    ) -> int:
+        """Adjust the page size to a page that was served.
+
+        Args:
+            size: The page size that was requested.
+            records: The number of records in the page.
+            seconds: The time until the response arrived.
+            response_bytes: The size of the response body.
+            capped: Whether more pages follow although the page was not full,
+                because the API returns fewer records than were asked for.
+
+        Returns:
+            The page size to request next.
+        """
+        with self._lock:
+            if capped:
+                # Asking for more than the API returns would only hide that
+                # the page is full.
+                self._limit = max(self.minimum, min(self._limit, records))
+                self._size = min(self._size, self._limit)
+            load = max(
+                seconds / self.target_seconds,
+                response_bytes / self.target_bytes,
+            )
+            if load > 1:
+                self._size = max(self.minimum, min(self._size, int(size / load)))
+            elif load < 0.5 and records >= size >= self._size:  # noqa: PLR2004
+                grown = min(size * 2, self._limit)
+                if self._failed is not None:
+                    grown = min(grown, (size + self._failed) // 2)
+                self._size = max(self._size, grown)
+            return self._size
+
+    def shrink(self, size: int) -> int:
+        """Halve the page size after a page failed.
+
+        Args:
+            size: The page size of the failed request.
+
+        Returns:
+            The page size to request next, which is ``size`` if it cannot shrink.
+        """
+        with self._lock:
+            if size <= self.minimum:
+                return size
+            self._failed = min(self._failed or size, size)
+            self._size = min(self._size, max(self.minimum, size // 2))
+            return self._size
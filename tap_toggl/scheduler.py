@@ -0,0 +1,188 @@
+"""Process-wide request pacing for the Toggl API."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import defaultdict
+from http import HTTPStatus
+from typing import TYPE_CHECKING, ClassVar, Mapping
+
+if TYPE_CHECKING:
+    import requests
+
+DEFAULT_REQUESTS_PER_SECOND = 1.0
+DEFAULT_RETRY_AFTER = 1.0
+DEFAULT_QUOTA_RESET = 60.0
+
+#: Status codes Toggl uses when a request was rejected for pacing reasons.
+THROTTLE_STATUSES = (HTTPStatus.TOO_MANY_REQUESTS, HTTPStatus.PAYMENT_REQUIRED)
+
+
+class RequestScheduler:
+    """Pace requests for one API token using a token bucket.
+
+    Slots are handed out with the generic cell rate algorithm: requests may burst
+    up to ``burst`` at once and are then spaced ``1 / rate`` seconds apart. The
+    spacing is widened when Toggl reports that the remaining hourly quota would
+    otherwise run out before it resets, and every slot is held back while Toggl
+    has asked us to stop with ``Retry-After`` or a quota-exhausted response.
+
+    One scheduler is shared per token by every stream and worker thread in the
+    process, see :meth:`for_token`.
+    """
+
+    _registry: ClassVar[dict[tuple[str, float, int], RequestScheduler]] = {}
+    _registry_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_REQUESTS_PER_SECOND,
+        burst: int = 1,
+    ) -> None:
+        """Initialize the scheduler.
+
+        Args:
+            rate: The sustained number of requests per second.
+            burst: The number of requests that may be sent back to back.
+        """
+        self.interval = 1 / rate
+        self.tolerance = (max(burst, 1) - 1) * self.interval
+        self.throttled_seconds: dict[str, float] = defaultdict(float)
+        self.throttle_responses = 0
+        self._lock = threading.Lock()
+        self._theoretical_arrival = 0.0
+        self._blocked_until = 0.0
+        self._quota_interval = 0.0
+        self._quota_resets_at = 0.0
+
+    @classmethod
+    def for_token(
+        cls,
+        token: str,
+        rate: float = DEFAULT_REQUESTS_PER_SECOND,
+        burst: int | None = None,
+    ) -> RequestScheduler:
+        """Return the process-wide scheduler for an API token and pacing.
+
+        Streams configured with another rate or burst for the same token get a
+        scheduler of their own, rather than silently sharing the first one.
+
+        Args:
+            token: The API token requests are made with.
+            rate: The sustained number of requests per second.
+            burst: The number of requests that may be sent back to back, the
+                rate rounded down by default.
+
+        Returns:
+            The shared scheduler instance.
+        """
+        if burst is None:
+            burst = max(int(rate), 1)
+        key = (token, rate, burst)
+        with cls._registry_lock:
+            if key not in cls._registry:
+                cls._registry[key] = cls(rate=rate, burst=burst)
+            return cls._registry[key]
+
+    @property
+    def total_throttled_seconds(self) -> float:
+        """Return the total time requests have been held back."""
+        return sum(self.throttled_seconds.values())
+
+    def reserve(self, key: str = "") -> float:
+        """Reserve the next request slot.
+
+        Args:
+            key: A label, such as the stream name, to account waiting time to.
+
+        Returns:
+            The number of seconds to wait before sending the request.
+        """
+        with self._lock:
+            now = time.monotonic()
+            interval = self.interval
+            if now < self._quota_resets_at:
+                interval = max(interval, self._quota_interval)
+
+            slot = max(self._theoretical_arrival, now, self._blocked_until)
+            send_at = max(now, self._blocked_until, slot - self.tolerance)
+            self._theoretical_arrival = slot + interval
+
+            wait = send_at - now
+            if wait > 0:
+                self.throttled_seconds[key] += wait
+            return wait
+
+    def acquire(self, key: str = "") -> float:
+        """Block until the next request slot is available.
+
+        Args:
+            key: A label, such as the stream name, to account waiting time to.
+
+        Returns:
+            The number of seconds waited.
+        """
+        wait = self.reserve(key)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def observe(self, response: requests.Response) -> None:
+        """Update pacing from the rate limit and quota headers of a response.
+
+        Args:
+            response: A response received from the Toggl API.
+        """
+        headers = response.headers
+        remaining = _float_header(headers, "X-Toggl-Quota-Remaining")
+        resets_in = _float_header(headers, "X-Toggl-Quota-Resets-In")
+
+        with self._lock:
+            now = time.monotonic()
+            if remaining is not None and resets_in is not None:
+                self._quota_resets_at = now + resets_in
+                self._quota_interval = resets_in / max(remaining, 1)
+
+            if response.status_code == HTTPStatus.TOO_MANY_REQUESTS:
+                self.throttle_responses += 1
+                retry_after = _float_header(headers, "Retry-After")
+                if retry_after is None:
+                    retry_after = DEFAULT_RETRY_AFTER
+                self._block(now + retry_after)
+            elif is_quota_exhausted(response):
+                self.throttle_responses += 1
+                self._block(now + (resets_in or DEFAULT_QUOTA_RESET))
+
+    def _block(self, until: float) -> None:
+        self._blocked_until = max(self._blocked_until, until)
+
+
+def is_quota_exhausted(response: requests.Response) -> bool:
+    """Return whether a response was rejected because the hourly quota ran out.
+
+    Toggl also answers 402 when a plan does not include a feature, which no
+    amount of waiting fixes.
+
+    Args:
+        response: A response received from the Toggl API.
+
+    Returns:
+        True for a 402 response with no quota left or a quota reset time.
+    """
+    if response.status_code != HTTPStatus.PAYMENT_REQUIRED:
+        return False
+    headers = response.headers
+    return (
+        _float_header(headers, "X-Toggl-Quota-Remaining") == 0
+        or _float_header(headers, "X-Toggl-Quota-Resets-In") is not None
+    )
+
+
+def _float_header(headers: Mapping[str, str], name: str) -> float | None:
+    """Return a numeric header value, or None if it is missing or malformed."""
+    value = headers.get(name)
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
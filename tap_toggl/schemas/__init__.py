@@ -1 +1,23 @@
 """JSON schema files for the REST API."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+SCHEMAS_DIR = Path(__file__).parent
+
+
+def load_schema(stream_name: str) -> dict:
+    """Return the JSON schema of a stream, read from its schema file.
+
+    Schemas are kept as static JSON rather than built with the SDK's typing
+    helpers, which would be repeated on every tap invocation.
+
+    Args:
+        stream_name: The stream name, which is also the schema file name.
+
+    Returns:
+        The schema dictionary.
+    """
+    return json.loads((SCHEMAS_DIR / f"{stream_name}.json").read_text())
@@ -2,34 +2,50 @@
 
 from __future__ import annotations
 
+import json
 import sys
 import typing as t
+from datetime import date, timedelta
+from functools import cached_property
 
 import requests
-from singer_sdk import typing as th
 from singer_sdk.helpers.jsonpath import extract_jsonpath
-from singer_sdk.pagination import BaseAPIPaginator, SimpleHeaderPaginator
-
-from tap_toggl.client import TogglStream, TogglPaginationStream
+from singer_sdk.pagination import (
+    BaseAPIPaginator,
+    SimpleHeaderPaginator,
+    SinglePagePaginator,
+)
+
+from tap_toggl.client import (
+    TogglAccountStream,
+    TogglPaginationStream,
+    TogglStream,
+    date_windows,
+    parse_date,
+)
+from tap_toggl.extras import optional_import
+from tap_toggl.schemas import load_schema
 
 _TToken = t.TypeVar("_TToken")
 
+#: Time entry properties the Reports API leaves out when asked to hide amounts.
+AMOUNT_PROPERTIES = ("billable_amount_in_cents", "hourly_rate_in_cents", "currency")
+
+#: The project ID of report rows for time tracked without a project, which
+#: stands in for null as it is part of their primary key.
+NO_PROJECT_ID = 0
+
 
 class ClientsStream(TogglStream):
     """Define custom stream."""
 
     name = "clients"
     path = "/api/v9/me/clients"
+    cache_responses = True
+    supports_since_filter = True
     primary_keys: t.ClassVar[list[str]] = ["id"]
     replication_key = "at"
-    schema = th.PropertiesList(
-        th.Property("archived", th.BooleanType),
-        th.Property("at", th.DateTimeType),
-        th.Property("id", th.IntegerType),
-        th.Property("name", th.StringType),
-        th.Property("server_deleted_at", th.DateTimeType),
-        th.Property("wid", th.IntegerType),
-    ).to_dict()
+    schema = load_schema("clients")
 
 
 class OrganizationsStream(TogglStream):
@@ -37,36 +53,10 @@ class OrganizationsStream(TogglStream):
 
     name = "organizations"
     path = "/api/v9/me/organizations"
+    cache_responses = True
     primary_keys: t.ClassVar[list[str]] = ["id"]
     replication_key = "at"
-    schema = th.PropertiesList(
-        th.Property("admin", th.BooleanType),
-        th.Property("at", th.DateTimeType),
-        th.Property("created_at", th.DateTimeType),
-        th.Property("id", th.IntegerType),
-        th.Property("is_multi_workspace_enabled", th.BooleanType),
-        th.Property("is_unified", th.BooleanType),
-        th.Property("max_data_retention_days", th.IntegerType),
-        th.Property("max_workspaces", th.IntegerType),
-        th.Property("name", th.StringType),
-        th.Property("owner", th.BooleanType),
-        # th.Property("payment_methods", th.ArrayType(th.ObjectType())),
-        th.Property("permissions", th.StringType),
-        th.Property("pricing_plan_id", th.IntegerType),
-        th.Property("server_deleted_at", th.DateTimeType),
-        th.Property("suspended_at", th.DateTimeType),
-        th.Property(
-            "trial_info",
-            th.ObjectType(
-                th.Property("last_pricing_plan_id", th.IntegerType),
-                th.Property("next_payment_date", th.DateTimeType),
-                th.Property("trial", th.BooleanType),
-                th.Property("trial_available", th.BooleanType),
-                th.Property("trial_end_date", th.DateTimeType),
-            ),
-        ),
-        th.Property("user_count", th.IntegerType),
-    ).to_dict()
+    schema = load_schema("organizations")
 
     def get_child_context(self, record: dict, context: t.Optional[dict]) -> dict:
         """Return a context dictionary for child streams."""
@@ -75,82 +65,42 @@ class OrganizationsStream(TogglStream):
         }
 
 
-class GroupsStream(TogglStream):
-    """Define custom stream."""
+class OrganizationMembersStream(TogglStream):
+    """Base class for the users and groups of every organization.
+
+    Users belonging to several organizations are returned for each of them,
+    as one membership record per organization. With
+    ``dedupe_organization_members`` enabled, records repeated with the same
+    primary key are emitted once unless they changed. Every organization is
+    still requested, as the v9 API has no filter for membership changes.
+    """
 
     parent_stream_type = OrganizationsStream
+    dedupes_across_partitions = True
+
+
+class GroupsStream(OrganizationMembersStream):
+    """Define custom stream."""
+
     name = "groups"
     path = "/api/v9/organizations/{organization_id}/groups"
     primary_keys: t.ClassVar[list[str]] = ["group_id"]
     replication_key = "at"
-    schema = th.PropertiesList(
-        th.Property("at", th.DateTimeType),
-        th.Property("group_id", th.IntegerType),
-        th.Property("name", th.StringType),
-        th.Property("permissions", th.StringType),
-        th.Property("organization_id", th.IntegerType),
-        th.Property(
-            "users",
-            th.ArrayType(
-                th.ObjectType(
-                    th.Property("avatar_url", th.StringType),
-                    th.Property("joined", th.BooleanType),
-                    th.Property("name", th.StringType),
-                    th.Property("user_id", th.IntegerType),
-                )
-            ),
-        ),
-        th.Property("workspaces", th.ArrayType(th.IntegerType)),
-    ).to_dict()
+    schema = load_schema("groups")
 
 
-class UsersStream(TogglPaginationStream):
+class UsersStream(OrganizationMembersStream, TogglPaginationStream):
     """Define custom stream."""
 
-    parent_stream_type = OrganizationsStream
     name = "users"
     path = "/api/v9/organizations/{organization_id}/users"
     primary_keys: t.ClassVar[list[str]] = ["id"]
     replication_key = None
-    schema = th.PropertiesList(
-        th.Property("admin", th.BooleanType),
-        th.Property("avatar_url", th.StringType),
-        th.Property("can_edit_email", th.BooleanType),
-        th.Property("email", th.StringType),
-        th.Property(
-            "groups",
-            th.ArrayType(
-                th.ObjectType(
-                    th.Property("group_id", th.IntegerType),
-                    th.Property("name", th.StringType),
-                )
-            ),
-        ),
-        th.Property("id", th.IntegerType),
-        th.Property("inactive", th.BooleanType),
-        th.Property("invitation_code", th.StringType),
-        th.Property("joined", th.BooleanType),
-        th.Property("name", th.StringType),
-        th.Property("owner", th.BooleanType),
-        th.Property("organization_id", th.IntegerType),
-        th.Property("user_id", th.IntegerType),
-        th.Property(
-            "workspaces",
-            th.ArrayType(
-                th.ObjectType(
-                    th.Property("admin", th.BooleanType),
-                    th.Property("inactive", th.BooleanType),
-                    th.Property("name", th.StringType),
-                    th.Property("role", th.StringType),
-                    th.Property("workspace_id", th.IntegerType),
-                )
-            ),
-        ),
-    ).to_dict()
+    schema = load_schema("users")
 
     def get_url_params(
         self,
-        context: dict | None,  # noqa: ARG002
+        context: dict | None,
         next_page_token: t.Any | None,  # noqa: ANN401
     ) -> dict[str, t.Any]:
         """Return a dictionary of values to be used in URL parameterization.
@@ -166,6 +116,8 @@ class UsersStream(TogglPaginationStream):
         if next_page_token:
             params["page"] = next_page_token
             params["sort_dir"] = "asc"
+        if context and context.get("page_size"):
+            params[self.page_size_param] = context["page_size"]
         return params
 
 
@@ -175,55 +127,23 @@ class WorkspacesStream(TogglStream):
     # parent_stream_type = OrganizationsStream
     name = "workspaces"
     path = "/api/v9/me/workspaces"
+    cache_responses = True
+    supports_since_filter = True
+    required_properties = ("organization_id",)
     primary_keys: t.ClassVar[list[str]] = ["id"]
     replication_key = "at"
-    schema = th.PropertiesList(
-        th.Property("admin", th.BooleanType),
-        th.Property("at", th.DateTimeType),
-        th.Property("business_ws", th.BooleanType),
-        th.Property("csv_upload", th.ArrayType(th.ObjectType())),
-        th.Property("default_currency", th.StringType),
-        th.Property("default_hourly_rate", th.NumberType),
-        th.Property("hide_start_end_times", th.BooleanType),
-        th.Property("ical_enabled", th.BooleanType),
-        th.Property("ical_url", th.StringType),
-        th.Property("id", th.IntegerType),
-        th.Property("last_modified", th.DateTimeType),
-        th.Property("logo_url", th.StringType),
-        th.Property("max_data_retention_days", th.IntegerType),
-        th.Property("name", th.StringType),
-        th.Property("only_admins_may_create_projects", th.BooleanType),
-        th.Property("only_admins_may_create_tags", th.BooleanType),
-        th.Property("only_admins_see_billable_rates", th.BooleanType),
-        th.Property("only_admins_see_team_dashboard", th.BooleanType),
-        th.Property("organization_id", th.IntegerType),
-        th.Property("permissions", th.StringType),
-        th.Property("premium", th.BooleanType),
-        th.Property("profile", th.IntegerType),
-        th.Property("projects_billable_by_default", th.BooleanType),
-        th.Property("projects_private_by_default", th.BooleanType),
-        th.Property("rate_last_updated", th.DateTimeType),
-        th.Property("reports_collapse", th.BooleanType),
-        th.Property("role", th.StringType),
-        th.Property("rounding", th.IntegerType),
-        th.Property("rounding_minutes", th.IntegerType),
-        th.Property("server_deleted_at", th.DateTimeType),
-        th.Property("suspended_at", th.DateTimeType),
-        th.Property(
-            "te_constraints",
-            th.ObjectType(
-                th.Property("description_present", th.BooleanType),
-                th.Property("project_present", th.BooleanType),
-                th.Property("tag_present", th.BooleanType),
-                th.Property("task_present", th.BooleanType),
-                th.Property("time_entry_constraints_enabled", th.BooleanType),
-            ),
-        ),
-        th.Property("working_hours_in_minutes", th.IntegerType),
-    ).to_dict()
+    schema = load_schema("workspaces")
+
+    def __init__(self, *args: t.Any, **kwargs: t.Any) -> None:
+        """Initialize the stream."""
+        super().__init__(*args, **kwargs)
+        #: The organization of every workspace synced so far, by workspace ID.
+        self.organization_ids: dict[int, int] = {}
 
     def get_child_context(self, record: dict, context: t.Optional[dict]) -> dict:
         """Return a context dictionary for child streams."""
+        if record.get("organization_id"):
+            self.organization_ids[record["id"]] = record["organization_id"]
         return {
             "workspace_id": record["id"],
         }
@@ -235,60 +155,13 @@ class ProjectsStream(TogglPaginationStream):
     parent_stream_type = WorkspacesStream
     name = "projects"
     path = "/api/v9/workspaces/{workspace_id}/projects"
+    cache_responses = True
+    detects_deletes = True
+    supports_since_filter = False
     rest_method = "GET"
     primary_keys: t.ClassVar[list[str]] = ["id"]
     replication_key = "at"
-    schema = th.PropertiesList(
-        th.Property("active", th.BooleanType),
-        th.Property("actual_hours", th.IntegerType),
-        th.Property("actual_seconds", th.IntegerType),
-        th.Property("at", th.DateTimeType),
-        th.Property("auto_estimates", th.BooleanType),
-        th.Property("billable", th.BooleanType),
-        th.Property("cid", th.IntegerType),
-        th.Property("client_id", th.IntegerType),
-        th.Property("color", th.StringType),
-        th.Property("created_at", th.DateTimeType),
-        th.Property("currency", th.StringType),
-        th.Property(
-            "current_period",
-            th.ObjectType(
-                th.Property("end_date", th.DateTimeType),
-                th.Property("start_date", th.DateTimeType),
-            ),
-        ),
-        th.Property("end_date", th.DateTimeType),
-        th.Property("estimated_hours", th.IntegerType),
-        th.Property("estimated_seconds", th.IntegerType),
-        th.Property("fixed_fee", th.NumberType),
-        th.Property("id", th.IntegerType),
-        th.Property("is_private", th.BooleanType),
-        th.Property("name", th.StringType),
-        th.Property("permissions", th.StringType),
-        th.Property("rate", th.NumberType),
-        th.Property("rate_last_updated", th.DateTimeType),
-        th.Property("recurring", th.BooleanType),
-        th.Property(
-            "recurring_parameters",
-            th.ArrayType(
-                th.ObjectType(
-                    th.Property("custom_period", th.IntegerType),
-                    th.Property("estimated_seconds", th.IntegerType),
-                    th.Property("parameter_end_date", th.DateTimeType),
-                    th.Property("parameter_start_date", th.DateTimeType),
-                    th.Property("period", th.StringType),
-                    th.Property("project_start_date", th.DateTimeType),
-                )
-            ),
-        ),
-        th.Property("server_deleted_at", th.DateTimeType),
-        th.Property("start_date", th.DateTimeType),
-        th.Property("status", th.StringType),
-        th.Property("template", th.BooleanType),
-        th.Property("template_id", th.IntegerType),
-        th.Property("wid", th.IntegerType),
-        th.Property("workspace_id", th.IntegerType),
-    ).to_dict()
+    schema = load_schema("projects")
 
 
 class TasksStream(TogglPaginationStream):
@@ -297,22 +170,11 @@ class TasksStream(TogglPaginationStream):
     parent_stream_type = WorkspacesStream
     name = "tasks"
     path = "/api/v9/workspaces/{workspace_id}/tasks"
+    detects_deletes = True
     primary_keys: t.ClassVar[list[str]] = ["id"]
     replication_key = "at"
     records_jsonpath = "$.data[*]"
-    schema = th.PropertiesList(
-        th.Property("active", th.BooleanType),
-        th.Property("at", th.DateTimeType),
-        th.Property("estimated_seconds", th.IntegerType),
-        th.Property("id", th.IntegerType),
-        th.Property("name", th.StringType),
-        th.Property("project_id", th.IntegerType),
-        th.Property("recurring", th.BooleanType),
-        th.Property("server_deleted_at", th.DateTimeType),
-        th.Property("tracked_seconds", th.IntegerType),
-        th.Property("user_id", th.IntegerType),
-        th.Property("workspace_id", th.IntegerType),
-    ).to_dict()
+    schema = load_schema("tasks")
 
 
 class TagsStream(TogglStream):
@@ -321,46 +183,214 @@ class TagsStream(TogglStream):
     parent_stream_type = WorkspacesStream
     name = "tags"
     path = "/api/v9/workspaces/{workspace_id}/tags"
+    cache_responses = True
+    detects_deletes = True
     primary_keys: t.ClassVar[list[str]] = ["id"]
     replication_key = "at"
-    schema = th.PropertiesList(
-        th.Property("active", th.BooleanType),
-        th.Property("at", th.DateTimeType),
-        th.Property("deleted_at", th.DateTimeType),
-        th.Property("id", th.IntegerType),
-        th.Property("name", th.StringType),
-        th.Property("workspace_id", th.IntegerType),
-    ).to_dict()
+    schema = load_schema("tags")
 
 
-class TimeEntriesStream(TogglStream):
-    """Define custom stream."""
+class AccountProjectsStream(TogglAccountStream, ProjectsStream):
+    """Projects of every workspace, fetched with one account-wide request."""
+
+    path = "/api/v9/me/projects"
+
+
+class AccountTasksStream(TogglAccountStream, TasksStream):
+    """Tasks of every workspace, fetched with one account-wide request."""
+
+    path = "/api/v9/me/tasks"
+    records_jsonpath = "$[*]"
+
+
+class AccountTagsStream(TogglAccountStream, TagsStream):
+    """Tags of every workspace, fetched with one account-wide request."""
+
+    path = "/api/v9/me/tags"
+    supports_since_filter = True
+
+
+class TogglReportStream(TogglStream):
+    """Base class for the Reports API streams of a workspace.
+
+    The configured date range is requested in windows of
+    ``time_entries_window_days``, and the last completed window is kept in the
+    workspace's state so that an interrupted sync resumes from the next one.
+    """
 
     parent_stream_type = WorkspacesStream
+    rest_method = "POST"
+
+    #: The longest date range the endpoint accepts in one request.
+    max_window_days: int | None = None
+
+    #: Whether the date range of every request is made explicit, also without
+    #: windows, as records are stamped with the dates they cover.
+    explicit_windows = False
+
+    def get_new_paginator(self) -> BaseAPIPaginator:
+        """Get a fresh paginator for this API endpoint.
+
+        Returns:
+            A paginator instance.
+        """
+        return SinglePagePaginator()
+
+    @property
+    def window_days(self) -> int | None:
+        """Return the number of days per window, if the range is split up."""
+        days = self.config.get("time_entries_window_days")
+        if self.max_window_days:
+            return min(days or self.max_window_days, self.max_window_days)
+        return days
+
+    def prepare_request_payload(
+        self,
+        context: dict | None,
+        next_page_token: _TToken | None,  # noqa: ARG002
+    ) -> dict:
+        """Prepare the data payload for the REST API request.
+
+        Args:
+            context: Stream partition or context dictionary.
+            next_page_token: Token, page number or any request argument to request the
+                next page of data.
+
+        Returns:
+            The report filters of the request's date window.
+        """
+        context = context or {}
+        return {
+            "start_date": context.get("window_start", self.config.get("start_date")),
+            "end_date": context.get("window_end", self.config.get("end_date")),
+        }
+
+    def get_date_range(self, context: dict | None = None) -> tuple[date, date]:
+        """Return the inclusive date range to sync.
+
+        For incremental syncs the range starts ``time_entries_lookback_days``
+        before the workspace bookmark, as the Reports API can only filter time
+        entries by their start date and not by when they were modified.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Returns:
+            The configured start date and end date, defaulting to today.
+        """
+        start = parse_date(self.config["start_date"])
+        end_date = self.config.get("end_date")
+        end = parse_date(end_date) if end_date else date.today()
+
+        modified_since = self.get_modified_since(context)
+        if modified_since:
+            lookback = timedelta(days=self.config.get("time_entries_lookback_days", 7))
+            start = max(start, (modified_since - lookback).date())
+        return start, end
+
+    def get_date_windows(self, context: dict | None) -> list[tuple[date, date]]:
+        """Return the date windows still to be synced for a workspace.
+
+        Windows already completed by an interrupted run over the same date range
+        are skipped.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Returns:
+            A list of inclusive (start, end) date pairs.
+        """
+        start, end = self.get_date_range(context)
+        windows = date_windows(start, end, t.cast("int", self.window_days))
+
+        progress = self.get_context_state(context).get("window_progress")
+        if progress and progress.get("range") == [start.isoformat(), end.isoformat()]:
+            completed_through = date.fromisoformat(progress["completed_through"])
+            windows = [w for w in windows if w[0] > completed_through]
+            self.logger.info(
+                "Resuming '%s' after window ending %s with context: %s",
+                self.name,
+                completed_through,
+                context,
+            )
+        return windows
+
+    def get_partition_chunks(self, context: dict | None) -> list[dict | None]:
+        """Return one request context per date window.
+
+        Without a window size the whole date range is a single window, which is
+        only made explicit for incremental syncs, as their range depends on the
+        workspace bookmark, and for streams with ``explicit_windows``.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Returns:
+            A list of request contexts.
+        """
+        if self.window_days:
+            windows = self.get_date_windows(context)
+        elif self.replication_key or self.explicit_windows:
+            windows = [self.get_date_range(context)]
+        else:
+            return [context]
+
+        return [
+            {
+                **(context or {}),
+                "window_start": start.isoformat(),
+                "window_end": end.isoformat(),
+            }
+            for start, end in windows
+        ]
+
+    def chunk_completed(self, context: dict | None, chunk: dict | None) -> None:
+        """Record the last completed window so a restarted sync can resume.
+
+        Args:
+            context: Stream partition or context dictionary.
+            chunk: The request context of the completed window.
+        """
+        if not self.window_days or not chunk:
+            return
+        self.get_context_state(context)["window_progress"] = {
+            "range": [d.isoformat() for d in self.get_date_range(context)],
+            "completed_through": chunk["window_end"],
+        }
+        self.write_checkpoint()
+
+    def partition_completed(self, context: dict | None) -> None:
+        """Clear window progress once every window of a workspace is synced.
+
+        Args:
+            context: Stream partition or context dictionary.
+        """
+        self.get_context_state(context).pop("window_progress", None)
+
+    def post_process(
+        self,
+        row: dict,
+        context: dict | None = None,
+    ) -> dict | None:
+        """Stamp the workspace of each record."""
+        row["workspace_id"] = context["workspace_id"]
+        return row
+
+
+class TimeEntriesStream(TogglReportStream):
+    """Define custom stream."""
+
     name = "time_entries"
     path = "/reports/api/v3/workspace/{workspace_id}/search/time_entries"
-    rest_method = "POST"
+    detects_deletes = True
     primary_keys: t.ClassVar[list[str]] = ["id"]
     replication_key = None
-    schema = th.PropertiesList(
-        th.Property("billable", th.BooleanType),
-        th.Property("billable_amount_in_cents", th.IntegerType),
-        th.Property("currency", th.StringType),
-        th.Property("description", th.StringType),
-        th.Property("hourly_rate_in_cents", th.IntegerType),
-        th.Property("project_id", th.IntegerType),
-        th.Property("row_number", th.IntegerType),
-        th.Property("tag_ids", th.ArrayType(th.IntegerType)),
-        th.Property("task_id", th.IntegerType),
-        th.Property("at", th.DateTimeType),
-        th.Property("id", th.IntegerType),
-        th.Property("seconds", th.IntegerType),
-        th.Property("start", th.DateTimeType),
-        th.Property("stop", th.DateTimeType),
-        th.Property("user_id", th.IntegerType),
-        th.Property("username", th.StringType),
-        th.Property("workspace_id", th.IntegerType),
-    ).to_dict()
+    schema = load_schema("time_entries")
+    page_size_param = "page_size"
+    default_page_size = 10000
+    max_page_size = 10000
+    required_properties = ("start",)
+    parses_projection = True
 
     def prepare_request_payload(
         self,
@@ -374,15 +404,19 @@ class TimeEntriesStream(TogglStream):
             next_page_token: Token, page number or any request argument to request the
                 next page of data.
         """
-        payload = {
-            "start_date": self.config.get("start_date"),
-            "end_date": self.config.get("end_date"),
-            "page_size": 10000,
-        }
+        payload = super().prepare_request_payload(context, next_page_token)
+        context = context or {}
+        payload["page_size"] = context.get("page_size", self.default_page_size)
+        if context.get("shard_field"):
+            payload[context["shard_field"]] = [context["shard_id"]]
 
         if next_page_token:
             payload["first_row_number"] = int(next_page_token)
 
+        projection = self.projection
+        if projection is not None and projection.isdisjoint(AMOUNT_PROPERTIES):
+            payload["hide_amounts"] = True
+
         return payload
 
     def get_new_paginator(self) -> BaseAPIPaginator:
@@ -393,28 +427,355 @@ class TimeEntriesStream(TogglStream):
         """
         return SimpleHeaderPaginator("X-Next-Row-Number")
 
+    def __init__(self, *args: t.Any, **kwargs: t.Any) -> None:
+        """Initialize the stream, replicating incrementally if configured."""
+        super().__init__(*args, **kwargs)
+        if self.config.get("time_entries_incremental"):
+            self.replication_key = "at"
+        self._shard_sources: dict[tuple, list[dict]] = {}
+
+    def get_partition_chunks(self, context: dict | None) -> list[dict | None]:
+        """Return one request context per date window and shard.
+
+        Windows are further split into the shards returned by
+        :meth:`get_shards`.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Returns:
+            A list of request contexts.
+        """
+        chunks = super().get_partition_chunks(context)
+        shards = self.get_shards(context)
+        if not shards:
+            return chunks
+        return [
+            {
+                **(chunk or {}),
+                "shard_field": field,
+                "shard_id": shard_id,
+                "last_shard": index == len(shards) - 1,
+            }
+            for chunk in chunks
+            for index, (field, shard_id) in enumerate(shards)
+        ]
+
+    def get_id_bucket(self, record: dict) -> str:
+        """Return the start date of a time entry, as its ID bucket.
+
+        Args:
+            record: A record as returned by Toggl.
+
+        Returns:
+            The date the time entry starts on.
+        """
+        return (record.get("start") or "")[:10]
+
+    def get_covered_buckets(
+        self,
+        chunks: list[dict | None],
+    ) -> t.Callable[[str], bool] | None:
+        """Return the start dates whose time entries were all requested.
+
+        Args:
+            chunks: The request contexts the partition was requested with.
+
+        Returns:
+            A filter of the dates within the requested windows, or None if the
+            requested date range is left to Toggl's default or was sharded.
+        """
+        windows = []
+        for chunk in chunks:
+            # Shards only cover the users or projects currently listed, so the
+            # entries of others would look deleted.
+            if chunk and chunk.get("shard_field"):
+                return None
+            if chunk and chunk.get("window_start"):
+                windows.append((chunk["window_start"], chunk["window_end"]))
+            elif self.config.get("end_date"):
+                windows.append(
+                    (self.config["start_date"][:10], self.config["end_date"][:10]),
+                )
+            else:
+                return None
+        return lambda bucket: any(start <= bucket <= end for start, end in windows)
+
+    def get_shards(self, context: dict | None) -> list[tuple[str, int | None]]:
+        """Return the report filters a workspace's time entries are split by.
+
+        With ``time_entries_shard_by`` set to ``user`` or ``project``, every date
+        window is requested once per user or project of the workspace, so that
+        the shards of a large workspace are paged through concurrently. Project
+        shards include one for time entries without a project.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Returns:
+            A list of (report filter, ID) pairs, or an empty list to not shard.
+        """
+        shard_by = self.config.get("time_entries_shard_by")
+        if not shard_by or not context:
+            return []
+
+        workspace_id = context["workspace_id"]
+        if shard_by == "user":
+            field, ids = "user_ids", self.get_user_ids(workspace_id)
+        elif shard_by == "project":
+            field, ids = "project_ids", [*self.get_project_ids(workspace_id), None]
+        else:
+            msg = f"Unknown time_entries_shard_by value: {shard_by!r}"
+            raise ValueError(msg)
+
+        if not ids:
+            self.logger.warning(
+                "No %s found to shard '%s' by, requesting workspace %s at once.",
+                field,
+                self.name,
+                workspace_id,
+            )
+            return []
+        return [(field, shard_id) for shard_id in ids]
+
+    def get_user_ids(self, workspace_id: int) -> list[int]:
+        """Return the users of a workspace, requested from the users stream.
+
+        Args:
+            workspace_id: The workspace ID.
+
+        Returns:
+            A list of user IDs.
+        """
+        workspaces = t.cast("WorkspacesStream", self._tap.streams["workspaces"])
+        organization_id = workspaces.organization_ids.get(workspace_id)
+        if organization_id is None:
+            return []
+        users = self._get_shard_source("users", {"organization_id": organization_id})
+        return [
+            user.get("user_id") or user["id"]
+            for user in users
+            if not user.get("workspaces")
+            or any(w.get("workspace_id") == workspace_id for w in user["workspaces"])
+        ]
+
+    def get_project_ids(self, workspace_id: int) -> list[int]:
+        """Return the projects of a workspace, requested from the projects stream.
+
+        Args:
+            workspace_id: The workspace ID.
+
+        Returns:
+            A list of project IDs.
+        """
+        projects = self._get_shard_source("projects", {"workspace_id": workspace_id})
+        return [
+            project["id"]
+            for project in projects
+            if project.get("workspace_id", project.get("wid")) == workspace_id
+        ]
+
+    def _get_shard_source(self, stream_name: str, chunk: dict) -> list[dict]:
+        """Request the records of another stream's chunk, once per sync."""
+        key = (stream_name, *chunk.values())
+        if key not in self._shard_sources:
+            stream = t.cast("TogglStream", self._tap.streams[stream_name])
+            self._shard_sources[key] = stream.request_chunk(chunk)
+        return self._shard_sources[key]
+
+    def request_records(self, context: dict | None) -> t.Iterable[dict]:
+        """Request the time entries of a workspace, dropping duplicate shards.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Yields:
+            Every time entry of the workspace once.
+        """
+        records = super().request_records(context)
+        if not self.config.get("time_entries_shard_by"):
+            yield from records
+            return
+
+        seen: set[int] = set()
+        for record in records:
+            if record["id"] in seen:
+                continue
+            seen.add(record["id"])
+            yield record
+
+    def chunk_completed(self, context: dict | None, chunk: dict | None) -> None:
+        """Record the last completed window once every one of its shards is.
+
+        Args:
+            context: Stream partition or context dictionary.
+            chunk: The request context of the completed shard.
+        """
+        if chunk and not chunk.get("last_shard", True):
+            return
+        super().chunk_completed(context, chunk)
+
+    @cached_property
+    def stream_response(self) -> bool:
+        """Return whether report pages are parsed incrementally from the socket."""
+        if not self.config.get("stream_report_parsing"):
+            return False
+        if optional_import("ijson") is None:
+            self.logger.warning(
+                "'stream_report_parsing' requires the 'streaming' extra (ijson). "
+                "Falling back to parsing whole report pages."
+            )
+            return False
+        return True
+
     def parse_response(self, response: requests.Response) -> t.Iterable[dict]:
         """Parse the response and return an iterator of result records.
 
+        Each report row groups one or more time entries under shared fields such
+        as the user and project. Every time entry is flattened into its own record
+        that references, rather than copies, the values of its group.
+
+        When ``stream_report_parsing`` is enabled, groups are decoded one at a
+        time from the response stream so memory use does not grow with the page
+        size. When not every property is selected, only the properties of the
+        :attr:`projection` are copied into records.
+
         Args:
             response: A raw :class:`requests.Response`
 
         Yields:
-            One item for every item found in the response.
+            One item for every time entry found in the response.
         """
-        data = response.json()
-        records = extract_jsonpath(self.records_jsonpath, input=data)
-        for record in records:
-            for time_entry in record.get('time_entries', []):
-                del record["time_entries"]
-                record = {**record, **time_entry}
-                yield record
+        if self.stream_response:
+            response.raw.decode_content = True
+            ijson = optional_import("ijson")
+            groups = ijson.items(response.raw, "item", use_float=True)
+        else:
+            groups = extract_jsonpath(self.records_jsonpath, input=response.json())
+
+        projection = self.projection
+        for group in groups:
+            time_entries = group.pop("time_entries", None) or []
+            if projection is None:
+                for time_entry in time_entries:
+                    yield {**group, **time_entry}
+                continue
+            shared = {k: v for k, v in group.items() if k in projection}
+            for time_entry in time_entries:
+                yield {
+                    **shared,
+                    **{k: v for k, v in time_entry.items() if k in projection},
+                }
+
+
+class SummaryReportStream(TogglReportStream):
+    """Tracked time per project and user over each date window."""
+
+    name = "summary_report"
+    path = "/reports/api/v3/workspace/{workspace_id}/summary/time_entries"
+    primary_keys: t.ClassVar[list[str]] = [
+        "workspace_id",
+        "start_date",
+        "end_date",
+        "project_id",
+        "user_id",
+    ]
+    replication_key = None
+    explicit_windows = True
+    schema = load_schema("summary_report")
 
-    def post_process(
+    def prepare_request_payload(
         self,
-        row: dict,
-        context: dict | None = None,  # noqa: ARG002
-    ) -> dict | None:
-        """Append or transform raw data to match expected structure."""
-        row["workspace_id"] = context["workspace_id"]
-        return row
+        context: dict | None,
+        next_page_token: _TToken | None,
+    ) -> dict:
+        """Prepare the data payload for the REST API request.
+
+        Args:
+            context: Stream partition or context dictionary.
+            next_page_token: Token, page number or any request argument to request the
+                next page of data.
+
+        Returns:
+            The report filters, grouped by project and then user.
+        """
+        return {
+            **super().prepare_request_payload(context, next_page_token),
+            "grouping": "projects",
+            "sub_grouping": "users",
+            "include_time_entry_ids": False,
+        }
+
+    def parse_response(self, response: requests.Response) -> t.Iterable[dict]:
+        """Parse the response and return an iterator of result records.
+
+        Every user of every project group becomes a record, stamped with the
+        date window of the request.
+
+        Args:
+            response: A raw :class:`requests.Response`
+
+        Yields:
+            One item for every project and user with tracked time.
+        """
+        window = json.loads(response.request.body)
+        for group in response.json().get("groups") or []:
+            for sub_group in group.get("sub_groups") or []:
+                yield {
+                    "start_date": window["start_date"],
+                    "end_date": window["end_date"],
+                    "project_id": group.get("id") or NO_PROJECT_ID,
+                    "user_id": sub_group.get("id"),
+                    "seconds": sub_group.get("seconds"),
+                    "rates": sub_group.get("rates"),
+                }
+
+
+class WeeklyReportStream(TogglReportStream):
+    """Tracked time per day, project and user."""
+
+    name = "weekly_report"
+    path = "/reports/api/v3/workspace/{workspace_id}/weekly/time_entries"
+    primary_keys: t.ClassVar[list[str]] = [
+        "workspace_id",
+        "date",
+        "project_id",
+        "user_id",
+    ]
+    replication_key = None
+    explicit_windows = True
+    max_window_days = 7
+    schema = load_schema("weekly_report")
+
+    def parse_response(self, response: requests.Response) -> t.Iterable[dict]:
+        """Parse the response and return an iterator of result records.
+
+        Each report row holds the seconds of one project and user for every day
+        of the week, which are split into one record per day with tracked time.
+
+        Args:
+            response: A raw :class:`requests.Response`
+
+        Yields:
+            One item for every day, project and user with tracked time.
+        """
+        window = json.loads(response.request.body)
+        start = date.fromisoformat(window["start_date"])
+        end = date.fromisoformat(window["end_date"])
+        for row in response.json() or []:
+            amounts = row.get("billable_amounts_in_cents") or []
+            for offset, seconds in enumerate(row.get("seconds") or []):
+                day = start + timedelta(days=offset)
+                if not seconds or day > end:
+                    continue
+                yield {
+                    "date": day.isoformat(),
+                    "project_id": row.get("project_id") or NO_PROJECT_ID,
+                    "user_id": row.get("user_id"),
+                    "seconds": seconds,
+                    "billable_amount_in_cents": (
+                        amounts[offset] if offset < len(amounts) else None
+                    ),
+                    "hourly_rate_in_cents": row.get("hourly_rate_in_cents"),
+                    "currency": row.get("currency"),
+                }
@@ -2,12 +2,41 @@
 
 from __future__ import annotations
 
+import json
+import threading
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import cached_property
+from pathlib import Path
 
 from singer_sdk import Tap
 from singer_sdk import typing as th
+from singer_sdk._singerlib import Catalog, Message, SchemaMessage, StateMessage
 
-from tap_toggl import streams
+from tap_toggl import output, streams
+from tap_toggl.accounts import (
+    DEFAULT_MAX_CONCURRENT_ACCOUNTS,
+    account_path,
+    account_state,
+    merge_account_state,
+)
+from tap_toggl.cache import DEFAULT_TTL_SECONDS, ParentContextCache
+from tap_toggl.cache_mode import (
+    DEFAULT_MAX_CACHE_BYTES,
+    DEFAULT_RESPONSE_TTL_SECONDS,
+    CacheMode,
+)
+from tap_toggl.client import DEFAULT_ASYNC_CONCURRENCY, DEFAULT_MAX_WORKERS
+from tap_toggl.deletes import IdFile
+from tap_toggl.extras import optional_import
+from tap_toggl.output import MessageBuffer
+from tap_toggl.paging import DEFAULT_TARGET_SECONDS
+from tap_toggl.transport import TogglTransport
+
+if t.TYPE_CHECKING:
+    from tap_toggl.aio import AsyncEngine
+    from tap_toggl.http_cache import ResponseCache
 
 
 class TapToggl(Tap):
@@ -19,9 +48,45 @@ class TapToggl(Tap):
         th.Property(
             "api_token",
             th.StringType,
-            required=True,
+            required=False,
             secret=True,
-            description="The token to authenticate against the Toggl API",
+            description="The token to authenticate against the Toggl API. "
+                        "Required unless accounts is set.",
+        ),
+        th.Property(
+            "accounts",
+            th.ArrayType(
+                th.ObjectType(
+                    th.Property("account_id", th.StringType, required=True),
+                    th.Property(
+                        "api_token",
+                        th.StringType,
+                        required=True,
+                        secret=True,
+                    ),
+                ),
+            ),
+            required=False,
+            description="Extract several Toggl accounts in one process instead "
+                        "of the api_token account. Every record is stamped with "
+                        "the account_id of its account, which is also part of "
+                        "every primary key and state partition.",
+        ),
+        th.Property(
+            "max_concurrent_accounts",
+            th.IntegerType,
+            required=False,
+            default=DEFAULT_MAX_CONCURRENT_ACCOUNTS,
+            description="The maximum number of accounts synced at the same time. "
+                        "Each account has its own request rate budget and "
+                        "max_workers threads.",
+        ),
+        th.Property(
+            "api_url",
+            th.StringType,
+            required=False,
+            default="https://api.track.toggl.com",
+            description="The root URL of the Toggl API.",
         ),
         th.Property(
             "detailed_report_trailing_days",
@@ -46,7 +111,284 @@ class TapToggl(Tap):
                         "If not provided the Toggl API will default to 7 days "
                         "from the start date.",
         ),
+        th.Property(
+            "time_entries_window_days",
+            th.IntegerType,
+            required=False,
+            description="Split the date range of the time entries and report "
+                        "streams into windows of this many days. Windows are "
+                        "fetched concurrently and the last completed window is "
+                        "kept in state so an interrupted sync resumes from the "
+                        "next one. If not provided the whole range is requested "
+                        "at once. The weekly report is requested at most one week "
+                        "at a time.",
+        ),
+        th.Property(
+            "time_entries_incremental",
+            th.BooleanType,
+            required=False,
+            default=False,
+            description="Replicate time entries incrementally, keeping a bookmark "
+                        "of the latest modification time ('at') per workspace. "
+                        "Later syncs only request entries started within "
+                        "time_entries_lookback_days of the bookmark and only emit "
+                        "entries modified since it.",
+        ),
+        th.Property(
+            "time_entries_lookback_days",
+            th.IntegerType,
+            required=False,
+            default=7,
+            description="For incremental time entry syncs, how many days before "
+                        "the bookmark to start requesting entries, so that recent "
+                        "edits of older entries are picked up. Edits of entries "
+                        "that started before this window are missed until a full "
+                        "sync.",
+        ),
+        th.Property(
+            "time_entries_shard_by",
+            th.StringType,
+            required=False,
+            allowed_values=["user", "project"],
+            description="Split every time entries window into one report query "
+                        "per user or per project of the workspace, fetched "
+                        "concurrently on max_workers threads. Users and projects "
+                        "are requested from the users and projects endpoints; "
+                        "time entries of users or projects they no longer list "
+                        "are not synced. Deleted time entries are not "
+                        "detected in sharded windows, as such entries would "
+                        "look deleted. If not provided each window is "
+                        "requested at once.",
+        ),
+        th.Property(
+            "stream_report_parsing",
+            th.BooleanType,
+            required=False,
+            default=False,
+            description="Parse time entry report pages incrementally while they "
+                        "download, keeping memory flat for large pages. Requires "
+                        "the 'streaming' extra.",
+        ),
+        th.Property(
+            "use_account_endpoints",
+            th.BooleanType,
+            required=False,
+            default=False,
+            description="Fetch projects, tasks and tags for all workspaces at once "
+                        "from the account-wide /me endpoints instead of once per "
+                        "workspace. These endpoints only return what the token's "
+                        "user has access to.",
+        ),
+        th.Property(
+            "checkpoint_interval_pages",
+            th.IntegerType,
+            required=False,
+            default=5,
+            description="Save the pagination position of the partition being "
+                        "synced to state every this many pages, so an interrupted "
+                        "sync resumes from the last saved page. Set to 0 to "
+                        "disable.",
+        ),
+        th.Property(
+            "page_sizes",
+            th.ObjectType(additional_properties=th.IntegerType),
+            required=False,
+            description="The page size to request per stream name, such as "
+                        "projects, tasks, users and time_entries. Other paginated "
+                        "streams use the API's default page size, except "
+                        "time_entries which requests 10000 rows.",
+        ),
+        th.Property(
+            "adaptive_page_size",
+            th.BooleanType,
+            required=False,
+            default=False,
+            description="Adjust the page size of paginated streams while syncing, "
+                        "starting from page_sizes or the largest page size. Pages "
+                        "grow while full pages are fast, shrink when they take "
+                        "longer than page_target_seconds or are very large, and "
+                        "are halved and retried after timeouts and server errors.",
+        ),
+        th.Property(
+            "page_target_seconds",
+            th.NumberType,
+            required=False,
+            default=DEFAULT_TARGET_SECONDS,
+            description="With adaptive_page_size, the response time up to which "
+                        "pages grow.",
+        ),
+        th.Property(
+            "max_requests_per_second",
+            th.NumberType,
+            required=False,
+            default=1,
+            description="The sustained request rate shared by all streams. Requests "
+                        "are further slowed down to stay within the hourly quota "
+                        "reported by Toggl.",
+        ),
+        th.Property(
+            "max_workers",
+            th.IntegerType,
+            required=False,
+            default=4,
+            description="The maximum number of partitions fetched concurrently.",
+        ),
+        th.Property(
+            "concurrent_child_streams",
+            th.BooleanType,
+            required=False,
+            default=False,
+            description="Fetch the partitions of child streams, such as the "
+                        "projects and time entries of each workspace, on a pool of "
+                        "max_workers threads ahead of them being synced. Records "
+                        "are still emitted one partition at a time, in order, and "
+                        "only a few pages of each partition are held ahead.",
+        ),
+        th.Property(
+            "use_asyncio",
+            th.BooleanType,
+            required=False,
+            default=False,
+            description="Send every request from one asyncio event loop instead of "
+                        "worker threads, prefetching child stream partitions as "
+                        "concurrent_child_streams does. Requires the 'async' extra "
+                        "(httpx).",
+        ),
+        th.Property(
+            "async_concurrency",
+            th.IntegerType,
+            required=False,
+            default=DEFAULT_ASYNC_CONCURRENCY,
+            description="The maximum number of requests in flight when use_asyncio "
+                        "is enabled.",
+        ),
+        th.Property(
+            "fast_output",
+            th.BooleanType,
+            required=False,
+            default=False,
+            description="Conform records with converters compiled once per stream "
+                        "schema, serialize messages with orjson and write them to "
+                        "stdout in large chunks. orjson requires the 'fast' extra.",
+        ),
+        th.Property(
+            "batch_streams",
+            th.ArrayType(th.StringType),
+            required=False,
+            default=["time_entries"],
+            description="The streams to send as BATCH messages of record files "
+                        "when batch_config is set, such as time_entries, users "
+                        "and projects. Other streams send RECORD messages.",
+        ),
+        th.Property(
+            "metrics_summary_path",
+            th.StringType,
+            required=False,
+            description="Write request and record pipeline statistics for every "
+                        "stream and partition to this JSON file at the end of the "
+                        "sync.",
+        ),
+        th.Property(
+            "parent_cache_path",
+            th.StringType,
+            required=False,
+            description="Keep the organizations and workspaces in this JSON file "
+                        "between syncs. When they are only synced for their child "
+                        "streams, cached records are used to start the child "
+                        "streams without requesting them again.",
+        ),
+        th.Property(
+            "parent_cache_ttl_seconds",
+            th.IntegerType,
+            required=False,
+            default=3600,
+            description="The age after which cached parent records are "
+                        "revalidated with Toggl, using the 'since' filter where the "
+                        "endpoint supports it.",
+        ),
+        th.Property(
+            "deleted_ids_path",
+            th.StringType,
+            required=False,
+            description="Detect time entries, projects, tasks and tags deleted "
+                        "in Toggl by keeping their IDs in this file between "
+                        "syncs. IDs no longer returned for a fully requested "
+                        "range are sent as records with only the ID and "
+                        "'_sdc_deleted_at' set.",
+        ),
+        th.Property(
+            "response_cache_path",
+            th.StringType,
+            required=False,
+            description="Keep the responses of slow-changing endpoints, such as "
+                        "organizations, workspaces, clients, projects and tags, "
+                        "in this SQLite file between syncs.",
+        ),
+        th.Property(
+            "response_cache_mode",
+            th.StringType,
+            required=False,
+            default=CacheMode.CACHE.value,
+            allowed_values=[mode.value for mode in CacheMode],
+            description="'cache' uses cached responses while they are fresh and "
+                        "revalidates stale ones with their ETag or Last-Modified "
+                        "header. 'record' requests and saves the responses of "
+                        "every stream, and 'replay' answers every request from "
+                        "saved responses, without network access.",
+        ),
+        th.Property(
+            "response_cache_ttl_seconds",
+            th.NumberType,
+            required=False,
+            default=DEFAULT_RESPONSE_TTL_SECONDS,
+            description="The age after which cached responses are revalidated "
+                        "with Toggl.",
+        ),
+        th.Property(
+            "response_cache_max_bytes",
+            th.IntegerType,
+            required=False,
+            default=DEFAULT_MAX_CACHE_BYTES,
+            description="The size of the cached response bodies above which the "
+                        "least recently used responses are evicted.",
+        ),
+        th.Property(
+            "dedupe_organization_members",
+            th.BooleanType,
+            required=False,
+            default=False,
+            description="Emit users and groups returned for several organizations "
+                        "once, unless they changed. Records are matched by their "
+                        "primary key, so a user's membership in every "
+                        "organization is kept.",
+        ),
     ).to_dict()
+    config_jsonschema["anyOf"] = [  # noqa: RUF012
+        {"required": ["api_token"]},
+        {"required": ["accounts"]},
+    ]
+
+    def __init__(
+        self,
+        *args: t.Any,
+        account_id: str | None = None,
+        parent: TapToggl | None = None,
+        **kwargs: t.Any,
+    ) -> None:
+        """Initialize the tap.
+
+        Args:
+            *args: Positional arguments for the Tap initializer.
+            account_id: The account synced by this tap, when it is one of the
+                accounts of a multi-account ``parent`` tap.
+            parent: The tap writing the messages of this account's tap.
+            **kwargs: Keyword arguments for the Tap initializer.
+        """
+        self.account_id = account_id
+        self.parent = parent
+        self._account_lock = threading.Lock()
+        self._written_schemas: set[str] = set()
+        super().__init__(*args, **kwargs)
 
     def discover_streams(self) -> list[streams.TogglStream]:
         """Return a list of discovered streams.
@@ -54,18 +396,285 @@ class TapToggl(Tap):
         Returns:
             A list of discovered streams.
         """
+        if self.config.get("use_account_endpoints"):
+            projects, tasks, tags = (
+                streams.AccountProjectsStream,
+                streams.AccountTasksStream,
+                streams.AccountTagsStream,
+            )
+        else:
+            projects, tasks, tags = (
+                streams.ProjectsStream,
+                streams.TasksStream,
+                streams.TagsStream,
+            )
+
         return [
             streams.ClientsStream(self),
             streams.GroupsStream(self),
             streams.OrganizationsStream(self),
-            streams.ProjectsStream(self),
-            streams.TasksStream(self),
-            streams.TagsStream(self),
+            projects(self),
+            tasks(self),
+            tags(self),
             streams.TimeEntriesStream(self),
+            streams.SummaryReportStream(self),
+            streams.WeeklyReportStream(self),
             streams.UsersStream(self),
             streams.WorkspacesStream(self),
         ]
 
+    @cached_property
+    def _singer_catalog(self) -> Catalog:
+        """Return the catalog of discovered streams, generated once per tap.
+
+        The SDK generates it again for the working catalog, ``catalog_dict`` and
+        the discovery output, which are all needed in a single ``--discover``.
+        """
+        return super()._singer_catalog
+
+    @cached_property
+    def transport(self) -> TogglTransport:
+        """Return the HTTP transport shared by every stream."""
+        return TogglTransport(
+            self.config["api_token"],
+            pool_size=int(self.config.get("max_workers") or DEFAULT_MAX_WORKERS),
+        )
+
+    @cached_property
+    def async_engine(self) -> AsyncEngine | None:
+        """Return the asyncio engine sending requests, if ``use_asyncio`` is set.
+
+        The taps of several accounts share the engine of their parent tap. The
+        engine is only imported here, so that asyncio is not loaded by syncs
+        that do not use it.
+        """
+        if self.parent is not None:
+            return self.parent.async_engine
+        if not self.config.get("use_asyncio"):
+            return None
+        if optional_import("httpx") is None:
+            self.logger.warning(
+                "'use_asyncio' requires the 'async' extra (httpx). Falling back to "
+                "worker threads."
+            )
+            return None
+        from tap_toggl.aio import AsyncEngine  # noqa: PLC0415
+
+        return AsyncEngine(
+            int(self.config.get("async_concurrency") or DEFAULT_ASYNC_CONCURRENCY),
+        )
+
+    @cached_property
+    def parent_cache(self) -> ParentContextCache | None:
+        """Return the cache of parent records, if ``parent_cache_path`` is set."""
+        path = self.config.get("parent_cache_path")
+        if not path:
+            return None
+        return ParentContextCache(
+            path,
+            ttl=self.config.get("parent_cache_ttl_seconds", DEFAULT_TTL_SECONDS),
+        )
+
+    @cached_property
+    def response_cache(self) -> ResponseCache | None:
+        """Return the cache of HTTP responses, if ``response_cache_path`` is set.
+
+        The cache is only imported here, so that sqlite3 is not loaded by syncs
+        that do not use it.
+        """
+        path = self.config.get("response_cache_path")
+        if not path:
+            return None
+        from tap_toggl.http_cache import ResponseCache  # noqa: PLC0415
+
+        return ResponseCache(
+            path,
+            mode=self.config.get("response_cache_mode", CacheMode.CACHE),
+            ttl=self.config.get(
+                "response_cache_ttl_seconds",
+                DEFAULT_RESPONSE_TTL_SECONDS,
+            ),
+            max_bytes=self.config.get(
+                "response_cache_max_bytes",
+                DEFAULT_MAX_CACHE_BYTES,
+            ),
+        )
+
+    @cached_property
+    def id_file(self) -> IdFile | None:
+        """Return the file deleted record detection keeps IDs in, if set."""
+        path = self.config.get("deleted_ids_path")
+        return IdFile(path) if path else None
+
+    @cached_property
+    def message_buffer(self) -> MessageBuffer | None:
+        """Return the stdout buffer used in fast output mode."""
+        if not self.config.get("fast_output") or self.parent is not None:
+            return None
+        if optional_import("orjson") is None:
+            self.logger.warning(
+                "'fast_output' serializes messages with orjson, which requires the "
+                "'fast' extra. Falling back to the standard JSON encoder."
+            )
+        return MessageBuffer()
+
+    def write_message(self, message: Message) -> None:
+        """Write a message to stdout, buffered in fast output mode.
+
+        Buffered messages are written out at least with every state message, so
+        that a target never sees a state before the records it covers.
+
+        Args:
+            message: The message to write.
+        """
+        if self.parent is not None:
+            self.parent.write_account_message(t.cast("str", self.account_id), message)
+            return
+        buffer = self.message_buffer
+        if buffer is None:
+            super().write_message(message)
+            return
+        buffer.write(output.format_message(message))
+        if isinstance(message, StateMessage):
+            buffer.flush()
+
+    def write_account_message(self, account_id: str, message: Message) -> None:
+        """Write a message of one account's tap.
+
+        Schemas are written once for all accounts, and states are merged into
+        the state of every account before they are written.
+
+        Args:
+            account_id: The account the message is for.
+            message: The message to write.
+        """
+        with self._account_lock:
+            if isinstance(message, SchemaMessage):
+                if message.stream in self._written_schemas:
+                    return
+                self._written_schemas.add(message.stream)
+            elif isinstance(message, StateMessage):
+                merge_account_state(self.state, account_id, message.value)
+                message = StateMessage(value=self.state)
+            self.write_message(message)
+
+    def get_account_tap(self, account: dict) -> TapToggl:
+        """Return a tap syncing one of the configured accounts.
+
+        Files kept between syncs are kept per account, next to the configured
+        paths, as account taps run concurrently.
+
+        Args:
+            account: An item of the ``accounts`` setting.
+
+        Returns:
+            A tap writing its messages through this one.
+        """
+        account_id = account["account_id"]
+        config = {**self.config, "api_token": account["api_token"]}
+        config.pop("metrics_summary_path", None)
+        for key in ("parent_cache_path", "deleted_ids_path", "response_cache_path"):
+            if config.get(key):
+                config[key] = account_path(config[key], account_id)
+        return TapToggl(
+            config=config,
+            catalog=self.input_catalog,
+            state=account_state(self.state, account_id),
+            account_id=account_id,
+            parent=self,
+        )
+
+    def sync_accounts(self) -> list[TapToggl]:
+        """Sync every configured account, up to max_concurrent_accounts at once.
+
+        Returns:
+            The tap of every account.
+
+        Raises:
+            Exception: The error of the first account that failed to sync, once
+                every other account is synced.
+        """
+        account_taps = [
+            self.get_account_tap(account) for account in self.config["accounts"]
+        ]
+        self.write_message(StateMessage(value=self.state))
+        max_accounts = int(
+            self.config.get("max_concurrent_accounts")
+            or DEFAULT_MAX_CONCURRENT_ACCOUNTS
+        )
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(max_accounts, len(account_taps))),
+            thread_name_prefix="tap-toggl-account",
+        ) as executor:
+            futures = [executor.submit(tap.sync_all) for tap in account_taps]
+
+        errors = []
+        for tap, future in zip(account_taps, futures):
+            error = future.exception()
+            if error is not None:
+                self.logger.error(
+                    "Sync of account '%s' failed: %s",
+                    tap.account_id,
+                    error,
+                )
+                errors.append(error)
+        if errors:
+            raise errors[0]
+        return account_taps
+
+    def get_metrics_summary(self) -> dict:
+        """Return the request and record pipeline statistics of every stream."""
+        return {
+            "streams": {
+                name: stream.instrumentation.summary()
+                for name, stream in self.streams.items()
+            },
+        }
+
+    def sync_all(self) -> None:
+        """Sync all streams, then write the pipeline statistics if configured."""
+        path = self.config.get("metrics_summary_path")
+        if self.config.get("accounts") and self.parent is None:
+            account_taps: list[TapToggl] = []
+            try:
+                account_taps = self.sync_accounts()
+            finally:
+                if self.message_buffer is not None:
+                    self.message_buffer.flush()
+                if self.async_engine is not None:
+                    self.async_engine.close()
+            if path:
+                summary = {
+                    "accounts": {
+                        tap.account_id: tap.get_metrics_summary()
+                        for tap in account_taps
+                    },
+                }
+                Path(path).write_text(json.dumps(summary, indent=2, default=str))
+            return
+
+        try:
+            super().sync_all()
+        finally:
+            if self.message_buffer is not None:
+                self.message_buffer.flush()
+            self.transport.close()
+            if self.parent is None and self.async_engine is not None:
+                self.async_engine.close()
+            if self.id_file is not None:
+                self.id_file.save()
+            if self.response_cache is not None:
+                self.logger.info(
+                    "Response cache: %d responses used, %d revalidated, %d saved.",
+                    self.response_cache.hits,
+                    self.response_cache.revalidated,
+                    self.response_cache.stored,
+                )
+                self.response_cache.close()
+        if path:
+            summary = self.get_metrics_summary()
+            Path(path).write_text(json.dumps(summary, indent=2, default=str))
+
 
 if __name__ == "__main__":
     TapToggl.cli()
@@ -0,0 +1,72 @@
+"""HTTP transport shared by every stream of a tap."""
+
+from __future__ import annotations
+
+from base64 import b64encode
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.auth import AuthBase
+from requests.utils import DEFAULT_ACCEPT_ENCODING
+
+#: Connections kept open to Toggl in addition to one per worker thread, for the
+#: main thread paging through a parent stream while workers fetch its children.
+EXTRA_CONNECTIONS = 1
+
+
+class TogglAuth(AuthBase):
+    """Basic authentication with an API token, encoded once."""
+
+    def __init__(self, api_token: str) -> None:
+        """Initialize the authenticator.
+
+        Args:
+            api_token: The Toggl API token.
+        """
+        credentials = f"{api_token}:api_token".encode()
+        self.header = f"Basic {b64encode(credentials).decode('ascii')}"
+
+    def __call__(self, request: requests.PreparedRequest) -> requests.PreparedRequest:
+        """Add the Authorization header to a request.
+
+        Args:
+            request: The request to authenticate.
+
+        Returns:
+            The authenticated request.
+        """
+        request.headers["Authorization"] = self.header
+        return request
+
+
+class TogglTransport:
+    """A keep-alive connection pool and request defaults for one tap run.
+
+    All streams send their requests through the same session, so connections,
+    and with them TLS handshakes, are reused across parent and child streams
+    and across worker threads. Responses are requested compressed; brotli is
+    negotiated when the ``compression`` extra is installed.
+    """
+
+    def __init__(self, api_token: str, pool_size: int) -> None:
+        """Initialize the transport.
+
+        Args:
+            api_token: The Toggl API token.
+            pool_size: The maximum number of concurrent requests.
+        """
+        self.auth = TogglAuth(api_token)
+        self.headers = {
+            "Accept-Encoding": DEFAULT_ACCEPT_ENCODING,
+            "content-type": "application/json",
+        }
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.auth = self.auth
+        adapter = HTTPAdapter(pool_maxsize=pool_size + EXTRA_CONNECTIONS)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def close(self) -> None:
+        """Close every pooled connection."""
+        self.session.close()
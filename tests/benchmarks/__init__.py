@@ -0,0 +1 @@
+"""Throughput benchmarks for tap-toggl."""
@@ -0,0 +1,111 @@
+"""Startup time benchmarks of the tap's command line.
+
+The timed benchmark only runs when ``TAP_TOGGL_BENCHMARK=1`` is set. Results
+are compared with ``startup_baseline.json``; set ``TAP_TOGGL_BENCHMARK_UPDATE=1``
+to write the current results as the new baseline instead.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from tests.benchmarks.test_throughput import TOLERANCE
+
+BASELINE_PATH = Path(__file__).with_name("startup_baseline.json")
+
+#: Runs of every command, of which the fastest is compared with the baseline.
+RUNS = 5
+
+#: Seconds allowed on top of the relative tolerance, as process start-up and
+#: the few milliseconds of the tap's own import vary from run to run.
+SLACK_SECONDS = 0.02
+
+#: Optional dependencies only imported once a setting needs them.
+OPTIONAL_MODULES = ["brotli", "faker", "httpx", "ijson", "orjson", "pyarrow"]
+
+#: Modules of the tap only imported once a setting needs them.
+LAZY_MODULES = ["tap_toggl.aio", "tap_toggl.http_cache"]
+
+#: Prints the seconds spent importing the SDK and then the tap.
+IMPORT_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+import singer_sdk
+sdk = time.perf_counter()
+import tap_toggl.tap
+tap = time.perf_counter()
+print(json.dumps({
+    "sdk_import_seconds": sdk - started,
+    "tap_import_seconds": tap - sdk,
+    "optional_modules": sorted(set(sys.argv[1:]) & set(sys.modules)),
+}))
+"""
+
+
+def run_import() -> dict:
+    """Import the tap in a new interpreter and return its measurements."""
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT, *OPTIONAL_MODULES, *LAZY_MODULES],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return json.loads(result.stdout)
+
+
+def run_discovery(config_path: Path) -> float:
+    """Run ``tap-toggl --discover`` in a new interpreter and return its duration."""
+    started = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-m", "tap_toggl", "--discover", "--config", config_path],
+        capture_output=True,
+        check=True,
+    )
+    return time.perf_counter() - started
+
+
+def test_import_skips_optional_dependencies():
+    """Importing the tap leaves optional dependencies to the settings using them."""
+    assert run_import()["optional_modules"] == []
+
+
+@pytest.mark.skipif(
+    os.environ.get("TAP_TOGGL_BENCHMARK") != "1",
+    reason="Set TAP_TOGGL_BENCHMARK=1 to run the benchmarks.",
+)
+def test_startup_time(tmp_path, capsys):
+    """Time importing the tap and discovery, and compare them with the baseline."""
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps({"api_token": "token"}))
+
+    imports = [run_import() for _ in range(RUNS)]
+    results = {
+        "sdk_import_seconds": min(r["sdk_import_seconds"] for r in imports),
+        "tap_import_seconds": min(r["tap_import_seconds"] for r in imports),
+        "discovery_seconds": min(run_discovery(config_path) for _ in range(RUNS)),
+    }
+    with capsys.disabled():
+        print()  # noqa: T201
+        for name, seconds in results.items():
+            print(f"{name:<20}{seconds * 1000:>8.1f} ms")  # noqa: T201
+
+    if os.environ.get("TAP_TOGGL_BENCHMARK_UPDATE") == "1":
+        BASELINE_PATH.write_text(json.dumps(results, indent=2) + "\n")
+        return
+
+    baseline = json.loads(BASELINE_PATH.read_text())
+    # The SDK's import time is reported, but not the tap's to control.
+    regressions = [
+        f"{name}: {results[name] * 1000:.1f} ms, "
+        f"baseline {baseline[name] * 1000:.1f} ms"
+        for name in ("tap_import_seconds", "discovery_seconds")
+        if results[name] > baseline[name] * (1 + TOLERANCE) + SLACK_SECONDS
+    ]
+    assert not regressions, "\n".join(regressions)
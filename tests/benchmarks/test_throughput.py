@@ -0,0 +1,236 @@
+"""End to end throughput benchmarks against the fake Toggl API.
+
+The benchmarks only run when ``TAP_TOGGL_BENCHMARK=1`` is set. Results are
+compared with ``baseline.json``; set ``TAP_TOGGL_BENCHMARK_UPDATE=1`` to write
+the current results as the new baseline instead.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+import tracemalloc
+import uuid
+from contextlib import redirect_stderr, redirect_stdout
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import pytest
+
+from tap_toggl.tap import TapToggl
+from tests.mock_toggl import MockTogglConfig, MockTogglServer
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+
+#: Timed syncs of every stream, of which the fastest is compared with the
+#: baseline, as streams of a few records take only a few milliseconds.
+RUNS = 3
+
+#: Allowed relative regression in throughput and peak memory before failing.
+TOLERANCE = float(os.environ.get("TAP_TOGGL_BENCHMARK_TOLERANCE", "0.5"))
+
+BENCHMARK_ACCOUNT = MockTogglConfig(
+    organizations=2,
+    workspaces_per_organization=3,
+    users_per_organization=120,
+    projects_per_workspace=120,
+    tags_per_workspace=40,
+    time_entries_per_workspace=3000,
+    days=60,
+)
+BENCHMARK_CONFIG = {
+    "start_date": "2024-01-01",
+    "end_date": "2024-03-01",
+    "max_requests_per_second": 10_000,
+}
+STREAMS = [
+    "clients",
+    "organizations",
+    "groups",
+    "users",
+    "workspaces",
+    "projects",
+    "tasks",
+    "tags",
+    "time_entries",
+]
+
+
+class CountingSink:
+    """A stdout replacement counting Singer messages instead of storing them."""
+
+    def __init__(self) -> None:
+        """Initialize the sink."""
+        self.records = 0
+        self.bytes = 0
+        self.peak_memory = 0
+
+    def write(self, data: str) -> int:
+        """Count the records and bytes written."""
+        self.bytes += len(data)
+        self.records += data.count('"type":"RECORD"') + data.count('"type": "RECORD"')
+        return len(data)
+
+    def flush(self) -> None:
+        """Do nothing, nothing is buffered."""
+
+
+@dataclass
+class StreamResult:
+    """Measurements of syncing a single stream."""
+
+    records: int
+    requests: int
+    response_bytes: int
+    seconds: float
+    peak_memory_bytes: int
+
+    @property
+    def records_per_second(self) -> float:
+        """Return the sync throughput."""
+        return self.records / self.seconds if self.seconds else float("inf")
+
+
+def select_only(tap: TapToggl, stream_name: str) -> dict:
+    """Return the tap's catalog with only one stream selected."""
+    catalog = tap.catalog_dict
+    for entry in catalog["streams"]:
+        for metadata in entry["metadata"]:
+            if metadata["breadcrumb"] == []:
+                metadata["metadata"]["selected"] = entry["tap_stream_id"] == stream_name
+    return catalog
+
+
+def sync(server: MockTogglServer, stream_name: str, *, trace: bool) -> CountingSink:
+    """Sync one stream from the fake API, counting the output.
+
+    With ``trace``, the peak of memory allocated during the sync is stored in
+    the returned sink's ``peak_memory`` attribute. Logs are discarded rather
+    than captured by pytest, whose growing buffer would otherwise count towards
+    the peak memory of the streams benchmarked last.
+    """
+    # A fresh token gives every run its own request scheduler.
+    config = {**BENCHMARK_CONFIG, "api_url": server.url, "api_token": uuid.uuid4().hex}
+    sink = CountingSink()
+    with Path(os.devnull).open("w") as devnull, redirect_stderr(devnull):
+        discovery = TapToggl(config=config, parse_env_config=False)
+        tap = TapToggl(
+            config=config,
+            catalog=select_only(discovery, stream_name),
+            parse_env_config=False,
+        )
+        if trace:
+            tracemalloc.start()
+        try:
+            with redirect_stdout(sink):
+                tap.sync_all()
+            if trace:
+                sink.peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            if trace:
+                tracemalloc.stop()
+    return sink
+
+
+def measure(server: MockTogglServer, stream_name: str) -> StreamResult:
+    """Sync one stream timed a few times, and once tracing memory allocations."""
+    timings = []
+    for _ in range(RUNS):
+        server.stats.reset()
+        started = time.perf_counter()
+        sink = sync(server, stream_name, trace=False)
+        timings.append(time.perf_counter() - started)
+    requests = sum(server.stats.requests.values())
+    response_bytes = sum(server.stats.bytes.values())
+
+    peak = sync(server, stream_name, trace=True).peak_memory
+
+    return StreamResult(
+        records=sink.records,
+        requests=requests,
+        response_bytes=response_bytes,
+        seconds=min(timings),
+        peak_memory_bytes=peak,
+    )
+
+
+def report(results: dict[str, StreamResult]) -> str:
+    """Format benchmark results as a table."""
+    lines = [
+        f"{'stream':<14}{'records':>9}{'rec/s':>11}{'requests':>10}"
+        f"{'resp KiB':>10}{'peak KiB':>10}",
+    ]
+    lines.extend(
+        f"{name:<14}{r.records:>9}{r.records_per_second:>11.0f}{r.requests:>10}"
+        f"{r.response_bytes / 1024:>10.0f}{r.peak_memory_bytes / 1024:>10.0f}"
+        for name, r in results.items()
+    )
+    return "\n".join(lines)
+
+
+@pytest.fixture(scope="module")
+def benchmark_server():
+    with MockTogglServer(BENCHMARK_ACCOUNT) as server:
+        yield server
+
+
+def test_mock_server_serves_every_stream():
+    """Syncing the whole tap against a small fake account emits every record."""
+    account = MockTogglConfig(time_entries_per_workspace=20, max_page_size=3)
+    with MockTogglServer(account) as server:
+        sink = sync(server, "time_entries", trace=False)
+        assert sink.records == 40
+        assert (
+            server.stats.requests["/reports/api/v3/workspace/{id}/search/time_entries"]
+            == 2 * 2
+        )
+
+        sink = sync(server, "users", trace=False)
+        assert sink.records == 10
+        assert server.stats.requests["/api/v9/organizations/{id}/users"] == 5
+
+
+@pytest.mark.skipif(
+    os.environ.get("TAP_TOGGL_BENCHMARK") != "1",
+    reason="Set TAP_TOGGL_BENCHMARK=1 to run the benchmarks.",
+)
+def test_throughput(benchmark_server, capsys):
+    """Benchmark every stream and compare the results with the baseline."""
+    results = {name: measure(benchmark_server, name) for name in STREAMS}
+    with capsys.disabled():
+        print(f"\n{report(results)}")  # noqa: T201
+
+    if os.environ.get("TAP_TOGGL_BENCHMARK_UPDATE") == "1":
+        BASELINE_PATH.write_text(
+            json.dumps(
+                {name: asdict(result) for name, result in results.items()},
+                indent=2,
+            )
+            + "\n"
+        )
+        return
+
+    baseline = json.loads(BASELINE_PATH.read_text())
+    regressions = []
+    for name, result in results.items():
+        expected = StreamResult(**baseline[name])
+        if result.records != expected.records:
+            regressions.append(
+                f"{name}: {result.records} records, expected {expected.records}"
+            )
+        if result.requests > expected.requests:
+            regressions.append(
+                f"{name}: {result.requests} requests, expected {expected.requests}"
+            )
+        if result.records_per_second < expected.records_per_second * (1 - TOLERANCE):
+            regressions.append(
+                f"{name}: {result.records_per_second:.0f} records/s, "
+                f"baseline {expected.records_per_second:.0f}"
+            )
+        if result.peak_memory_bytes > expected.peak_memory_bytes * (1 + TOLERANCE):
+            regressions.append(
+                f"{name}: peak memory {result.peak_memory_bytes} bytes, "
+                f"baseline {expected.peak_memory_bytes}"
+            )
+    assert not regressions, "\n".join(regressions)
@@ -0,0 +1,496 @@
+"""A self-contained fake of the Toggl API endpoints used by the tap."""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import re
+import threading
+import time
+import typing as t
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+AT = "2024-01-01T00:00:00+00:00"
+
+
+@dataclass
+class MockTogglConfig:
+    """Size and behaviour of the fake Toggl account."""
+
+    organizations: int = 1
+    workspaces_per_organization: int = 2
+    users_per_organization: int = 10
+    #: Users belonging to every organization, in addition to their own users.
+    shared_users: int = 0
+    projects_per_workspace: int = 5
+    tags_per_workspace: int = 5
+    time_entries_per_workspace: int = 200
+    time_entries_per_group: int = 4
+    start_date: date = date(2024, 1, 1)
+    days: int = 30
+    #: Largest page the API returns, for both page-number and row-number paging.
+    max_page_size: int = 50
+    #: Seconds to wait before answering every request.
+    latency: float = 0.0
+    #: Answer every Nth request with 429 Too Many Requests (0 to disable).
+    rate_limit_every: int = 0
+    #: Answer requests for pages larger than this with 504 Gateway Timeout, as
+    #: Toggl does for pages too slow to build (0 to disable).
+    timeout_page_size: int = 0
+    #: Compress responses for clients that accept gzip.
+    gzip: bool = True
+    #: Send an ETag with GET responses, and answer 304 Not Modified to requests
+    #: revalidating an unchanged body with it.
+    etags: bool = False
+
+
+@dataclass
+class MockTogglStats:
+    """Traffic served by the fake Toggl API."""
+
+    requests: Counter = field(default_factory=Counter)
+    bytes: Counter = field(default_factory=Counter)
+    rate_limited: int = 0
+    timed_out: int = 0
+    not_modified: int = 0
+    connections: int = 0
+
+    def reset(self) -> None:
+        """Forget all traffic served so far."""
+        self.requests.clear()
+        self.bytes.clear()
+        self.rate_limited = 0
+        self.timed_out = 0
+        self.not_modified = 0
+        self.connections = 0
+
+
+class MockTogglServer:
+    """Serve a fake Toggl account over HTTP on a background thread.
+
+    Use as a context manager, and point the tap's ``api_url`` at :attr:`url`.
+    """
+
+    def __init__(self, config: MockTogglConfig | None = None) -> None:
+        """Initialize the server and generate the account's data.
+
+        Args:
+            config: The size and behaviour of the fake account.
+        """
+        self.config = config or MockTogglConfig()
+        self.stats = MockTogglStats()
+        self._lock = threading.Lock()
+        self._request_number = 0
+        self._generate()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _handler_for(self))
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        """Return the root URL of the fake API."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> MockTogglServer:
+        """Start serving requests."""
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        """Stop serving requests."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _generate(self) -> None:
+        cfg = self.config
+        self.organizations = [
+            {"id": org_id, "name": f"Organization {org_id}", "at": AT}
+            for org_id in range(1, cfg.organizations + 1)
+        ]
+        self.workspaces: list[dict] = []
+        self.users: dict[int, list[dict]] = {}
+        for org in self.organizations:
+            first_ws = (org["id"] - 1) * cfg.workspaces_per_organization + 1
+            ws_ids = range(first_ws, first_ws + cfg.workspaces_per_organization)
+            self.workspaces.extend(
+                {
+                    "id": wid,
+                    "name": f"Workspace {wid}",
+                    "organization_id": org["id"],
+                    "at": AT,
+                }
+                for wid in ws_ids
+            )
+            self.users[org["id"]] = [
+                {
+                    "id": org["id"] * 1000 + n,
+                    "user_id": org["id"] * 1000 + n,
+                    "name": f"User {n}",
+                    "email": f"user{n}@example.com",
+                    "workspaces": [{"workspace_id": wid} for wid in ws_ids],
+                }
+                for n in range(cfg.users_per_organization)
+            ] + [
+                {
+                    "id": org["id"] * 1000 + 500 + n,
+                    "user_id": 1_000_000 + n,
+                    "name": f"Shared user {n}",
+                    "email": f"shared{n}@example.com",
+                    "workspaces": [],
+                }
+                for n in range(cfg.shared_users)
+            ]
+            org["user_count"] = len(self.users[org["id"]])
+        self.groups = {
+            org["id"]: [{"group_id": org["id"], "name": "Everyone", "at": AT}]
+            for org in self.organizations
+        }
+        self.clients = [
+            {"id": ws["id"], "name": f"Client {ws['id']}", "wid": ws["id"], "at": AT}
+            for ws in self.workspaces
+        ]
+        self.projects = {
+            ws["id"]: [
+                {
+                    "id": ws["id"] * 100 + n,
+                    "name": f"Project {n}",
+                    "wid": ws["id"],
+                    "workspace_id": ws["id"],
+                    "at": AT,
+                }
+                for n in range(cfg.projects_per_workspace)
+            ]
+            for ws in self.workspaces
+        }
+        self.tasks = {
+            ws["id"]: [
+                {
+                    "id": project["id"],
+                    "name": "Task",
+                    "project_id": project["id"],
+                    "workspace_id": ws["id"],
+                    "at": AT,
+                }
+                for project in self.projects[ws["id"]]
+            ]
+            for ws in self.workspaces
+        }
+        self.tags = {
+            ws["id"]: [
+                {
+                    "id": ws["id"] * 100 + n,
+                    "name": f"Tag {n}",
+                    "workspace_id": ws["id"],
+                    "at": AT,
+                }
+                for n in range(cfg.tags_per_workspace)
+            ]
+            for ws in self.workspaces
+        }
+        self.time_entries = {
+            ws["id"]: [
+                self._time_entry(ws, n) for n in range(cfg.time_entries_per_workspace)
+            ]
+            for ws in self.workspaces
+        }
+
+    def _time_entry(self, workspace: dict, n: int) -> dict:
+        cfg = self.config
+        users = self.users[workspace["organization_id"]]
+        projects = self.projects[workspace["id"]] or [{"id": None}]
+        start = datetime.combine(
+            cfg.start_date + timedelta(days=n % cfg.days),
+            datetime.min.time(),
+            tzinfo=timezone.utc,
+        ) + timedelta(minutes=n)
+        return {
+            "id": workspace["id"] * 10_000_000 + n,
+            "user_id": users[(n // cfg.time_entries_per_group) % len(users)]["user_id"],
+            "project_id": projects[(n // cfg.time_entries_per_group) % len(projects)][
+                "id"
+            ],
+            "description": f"Entry {n}",
+            "start": start.isoformat(),
+            "stop": (start + timedelta(minutes=30)).isoformat(),
+            "seconds": 1800,
+            "at": start.isoformat(),
+        }
+
+    # Request handling
+
+    def handle(
+        self,
+        method: str,
+        path: str,
+        query: dict[str, list[str]],
+        body: dict | None,
+    ) -> tuple[int, dict[str, str], t.Any]:
+        """Route a request to the fake endpoint it is for.
+
+        Returns:
+            The status code, extra headers and JSON body of the response.
+        """
+        with self._lock:
+            self._request_number += 1
+            number = self._request_number
+        if self.config.latency:
+            time.sleep(self.config.latency)
+        every = self.config.rate_limit_every
+        if every and number % every == 0:
+            with self._lock:
+                self.stats.rate_limited += 1
+            return 429, {"Retry-After": "0"}, {"error": "Too Many Requests"}
+
+        for pattern, route_method, handler in self._routes():
+            match = re.fullmatch(pattern, path)
+            if match and route_method == method:
+                return handler(query, body or {}, *map(int, match.groups()))
+        return 404, {}, {"error": f"No route for {method} {path}"}
+
+    def _routes(self) -> list[tuple[str, str, t.Callable]]:
+        return [
+            (r"/api/v9/me/clients", "GET", self._list(lambda: self.clients)),
+            (
+                r"/api/v9/me/organizations",
+                "GET",
+                self._list(lambda: self.organizations),
+            ),
+            (r"/api/v9/me/workspaces", "GET", self._list(lambda: self.workspaces)),
+            (r"/api/v9/me/projects", "GET", self._list(lambda: _flat(self.projects))),
+            (r"/api/v9/me/tasks", "GET", self._list(lambda: _flat(self.tasks))),
+            (r"/api/v9/me/tags", "GET", self._list(lambda: _flat(self.tags))),
+            (
+                r"/api/v9/organizations/(\d+)/groups",
+                "GET",
+                self._list(lambda oid: self.groups.get(oid, [])),
+            ),
+            (
+                r"/api/v9/organizations/(\d+)/users",
+                "GET",
+                self._pages(lambda oid: self.users.get(oid, [])),
+            ),
+            (
+                r"/api/v9/workspaces/(\d+)/projects",
+                "GET",
+                self._pages(lambda wid: self.projects.get(wid, [])),
+            ),
+            (
+                r"/api/v9/workspaces/(\d+)/tasks",
+                "GET",
+                self._pages(lambda wid: self.tasks.get(wid, []), key="data"),
+            ),
+            (
+                r"/api/v9/workspaces/(\d+)/tags",
+                "GET",
+                self._list(lambda wid: self.tags.get(wid, [])),
+            ),
+            (
+                r"/reports/api/v3/workspace/(\d+)/search/time_entries",
+                "POST",
+                self._search_time_entries,
+            ),
+            (
+                r"/reports/api/v3/workspace/(\d+)/summary/time_entries",
+                "POST",
+                self._summary_time_entries,
+            ),
+            (
+                r"/reports/api/v3/workspace/(\d+)/weekly/time_entries",
+                "POST",
+                self._weekly_time_entries,
+            ),
+        ]
+
+    @staticmethod
+    def _since(records: list[dict], query: dict[str, list[str]]) -> list[dict]:
+        if "since" not in query:
+            return records
+        since = datetime.fromtimestamp(int(query["since"][0]), tz=timezone.utc)
+        return [r for r in records if datetime.fromisoformat(r["at"]) >= since]
+
+    def _list(self, source: t.Callable) -> t.Callable:
+        def handler(query: dict, body: dict, *ids: int) -> tuple:  # noqa: ARG001
+            return 200, {}, self._since(source(*ids), query)
+
+        return handler
+
+    def _times_out(self, page_size: int) -> bool:
+        limit = self.config.timeout_page_size
+        if not limit or page_size <= limit:
+            return False
+        with self._lock:
+            self.stats.timed_out += 1
+        return True
+
+    def _pages(self, source: t.Callable, key: str | None = None) -> t.Callable:
+        def handler(query: dict, body: dict, *ids: int) -> tuple:  # noqa: ARG001
+            records = self._since(source(*ids), query)
+            requested = int(query.get("per_page", [self.config.max_page_size])[0])
+            if self._times_out(requested):
+                return 504, {}, {"error": "Gateway Timeout"}
+            size = min(requested, self.config.max_page_size)
+            page = int(query.get("page", ["1"])[0])
+            page_records = records[(page - 1) * size : page * size]
+            return 200, {}, {key: page_records} if key else page_records
+
+        return handler
+
+    def _report_entries(self, body: dict, wid: int) -> list[dict]:
+        start = body.get("start_date") or self.config.start_date.isoformat()
+        end = body.get("end_date") or "9999-12-31"
+        return [
+            e
+            for e in self.time_entries.get(wid, [])
+            if start <= e["start"][:10] <= end
+            and (not body.get("user_ids") or e["user_id"] in body["user_ids"])
+            and (not body.get("project_ids") or e["project_id"] in body["project_ids"])
+        ]
+
+    def _summary_time_entries(self, query: dict, body: dict, wid: int) -> tuple:  # noqa: ARG002
+        seconds: dict[t.Any, Counter] = {}
+        for entry in self._report_entries(body, wid):
+            by_user = seconds.setdefault(entry["project_id"], Counter())
+            by_user[entry["user_id"]] += entry["seconds"]
+        groups = [
+            {
+                "id": project_id,
+                "sub_groups": [
+                    {"id": user_id, "seconds": total, "rates": []}
+                    for user_id, total in by_user.items()
+                ],
+            }
+            for project_id, by_user in seconds.items()
+        ]
+        return 200, {}, {"groups": groups}
+
+    def _weekly_time_entries(self, query: dict, body: dict, wid: int) -> tuple:  # noqa: ARG002
+        start = date.fromisoformat(body["start_date"])
+        rows: dict[tuple, list[int]] = {}
+        for entry in self._report_entries(body, wid):
+            day = (date.fromisoformat(entry["start"][:10]) - start).days
+            row = rows.setdefault((entry["user_id"], entry["project_id"]), [0] * 7)
+            row[day] += entry["seconds"]
+        return (
+            200,
+            {},
+            [
+                {"user_id": user_id, "project_id": project_id, "seconds": row}
+                for (user_id, project_id), row in rows.items()
+            ],
+        )
+
+    def _search_time_entries(self, query: dict, body: dict, wid: int) -> tuple:  # noqa: ARG002
+        entries = self._report_entries(body, wid)
+
+        rows: list[dict] = []
+        for entry in entries:
+            row = rows[-1] if rows else None
+            if (
+                row is None
+                or row["user_id"] != entry["user_id"]
+                or row["project_id"] != entry["project_id"]
+                or len(row["time_entries"]) >= self.config.time_entries_per_group
+            ):
+                row = {
+                    "user_id": entry["user_id"],
+                    "username": f"User {entry['user_id']}",
+                    "project_id": entry["project_id"],
+                    "description": entry["description"],
+                    "billable": False,
+                    "tag_ids": [],
+                    "time_entries": [],
+                }
+                if not body.get("hide_amounts"):
+                    row["hourly_rate_in_cents"] = None
+                    row["currency"] = "USD"
+                rows.append(row)
+            row["time_entries"].append(
+                {k: entry[k] for k in ("id", "seconds", "start", "stop", "at")}
+            )
+        for number, row in enumerate(rows, start=1):
+            row["row_number"] = number
+
+        requested = int(body.get("page_size", 50))
+        if self._times_out(requested):
+            return 504, {}, {"error": "Gateway Timeout"}
+        size = min(requested, self.config.max_page_size)
+        first = int(body.get("first_row_number", 1))
+        page = rows[first - 1 : first - 1 + size]
+        headers = {}
+        if first - 1 + size < len(rows):
+            headers["X-Next-Row-Number"] = str(first + size)
+        return 200, headers, page
+
+
+def _flat(records_by_parent: dict[int, list[dict]]) -> list[dict]:
+    return [record for records in records_by_parent.values() for record in records]
+
+
+def _endpoint(path: str) -> str:
+    """Return a path with IDs replaced, to group traffic by endpoint."""
+    return re.sub(r"/\d+", "/{id}", path)
+
+
+def _handler_for(server: MockTogglServer) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body are written separately, don't delay the body.
+        disable_nagle_algorithm = True
+
+        def setup(self) -> None:
+            super().setup()
+            with server._lock:  # noqa: SLF001
+                server.stats.connections += 1
+
+        def _respond(self) -> None:
+            url = urlparse(self.path)
+            length = int(self.headers.get("Content-Length") or 0)
+            raw_body = self.rfile.read(length) if length else b""
+            body = json.loads(raw_body) if raw_body else None
+            status, headers, payload = server.handle(
+                self.command, url.path, parse_qs(url.query), body
+            )
+            data = json.dumps(payload).encode()
+            if server.config.etags and self.command == "GET" and status == 200:  # noqa: PLR2004
+                etag = f'"{hashlib.sha1(data).hexdigest()}"'  # noqa: S324
+                headers = {**headers, "ETag": etag}
+                if self.headers.get("If-None-Match") == etag:
+                    status, data = 304, b""
+                    with server._lock:  # noqa: SLF001
+                        server.stats.not_modified += 1
+            compress = (
+                bool(data)
+                and server.config.gzip
+                and "gzip" in self.headers.get("Accept-Encoding", "")
+            )
+            if compress:
+                data = gzip.compress(data)
+
+            with server._lock:  # noqa: SLF001
+                endpoint = _endpoint(url.path)
+                server.stats.requests[endpoint] += 1
+                server.stats.bytes[endpoint] += len(data)
+
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            if compress:
+                self.send_header("Content-Encoding", "gzip")
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        do_GET = _respond  # noqa: N815
+        do_POST = _respond  # noqa: N815
+
+        def log_message(self, *args: object) -> None:
+            """Keep test output quiet."""
+
+    return Handler
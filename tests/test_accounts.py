@@ -0,0 +1,95 @@
+"""Tests for extracting several accounts in one process."""
+
+from __future__ import annotations
+
+import json
+from collections import Counter
+from contextlib import redirect_stdout
+from io import StringIO
+
+from tap_toggl.accounts import account_state, merge_account_state
+from tap_toggl.tap import TapToggl
+from tests.mock_toggl import MockTogglConfig, MockTogglServer
+
+ACCOUNT_STATE = {
+    "bookmarks": {
+        "clients": {"replication_key": "at", "replication_key_value": "2024-01-02"},
+        "tags": {
+            "partitions": [
+                {
+                    "context": {"workspace_id": 1},
+                    "replication_key": "at",
+                    "replication_key_value": "2024-01-03",
+                },
+            ],
+        },
+    },
+}
+
+
+def test_account_state_round_trips_through_combined_state():
+    combined: dict = {}
+    merge_account_state(combined, "a", ACCOUNT_STATE)
+    merge_account_state(combined, "b", {"bookmarks": {"clients": {"x": 1}}})
+    merge_account_state(combined, "a", ACCOUNT_STATE)
+
+    assert combined["bookmarks"]["clients"]["partitions"] == [
+        {"context": {"account_id": "b"}, "x": 1},
+        {
+            "context": {"account_id": "a"},
+            "replication_key": "at",
+            "replication_key_value": "2024-01-02",
+        },
+    ]
+    assert account_state(combined, "a") == ACCOUNT_STATE
+    assert account_state(combined, "c") == {"bookmarks": {}}
+
+
+def test_accounts_are_synced_in_one_process():
+    account = MockTogglConfig(workspaces_per_organization=2)
+    with MockTogglServer(account) as server:
+        tap = TapToggl(
+            config={
+                "api_url": server.url,
+                "accounts": [
+                    {"account_id": "first", "api_token": "token-1"},
+                    {"account_id": "second", "api_token": "token-2"},
+                ],
+                "start_date": "2024-01-01",
+                "end_date": "2024-01-31",
+                "max_requests_per_second": 1000,
+            },
+            parse_env_config=False,
+        )
+        output = StringIO()
+        with redirect_stdout(output):
+            tap.sync_all()
+
+    messages = [json.loads(line) for line in output.getvalue().splitlines()]
+    schemas = Counter(m["stream"] for m in messages if m["type"] == "SCHEMA")
+    assert set(schemas.values()) == {1}
+    assert schemas["tags"] == 1
+    assert "account_id" in next(
+        m["key_properties"]
+        for m in messages
+        if m["type"] == "SCHEMA" and m["stream"] == "time_entries"
+    )
+
+    records = Counter(
+        (m["stream"], m["record"]["account_id"])
+        for m in messages
+        if m["type"] == "RECORD"
+    )
+    for stream in ("workspaces", "tags", "time_entries"):
+        assert records[stream, "first"] == records[stream, "second"] > 0
+
+    state = [m for m in messages if m["type"] == "STATE"][-1]["value"]
+    contexts = [
+        partition["context"] for partition in state["bookmarks"]["tags"]["partitions"]
+    ]
+    assert sorted(contexts, key=lambda c: (c["account_id"], c["workspace_id"])) == [
+        {"account_id": "first", "workspace_id": 1},
+        {"account_id": "first", "workspace_id": 2},
+        {"account_id": "second", "workspace_id": 1},
+        {"account_id": "second", "workspace_id": 2},
+    ]
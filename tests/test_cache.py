@@ -0,0 +1,81 @@
+"""Tests for the parent record cache."""
+
+from __future__ import annotations
+
+import json
+import uuid
+from contextlib import redirect_stdout
+from io import StringIO
+
+from tap_toggl.cache import ParentContextCache
+from tap_toggl.tap import TapToggl
+from tests.benchmarks.test_throughput import select_only
+from tests.mock_toggl import MockTogglConfig, MockTogglServer
+
+WORKSPACES = "/api/v9/me/workspaces"
+TAGS = "/api/v9/workspaces/{id}/tags"
+
+
+def sync_tags(server: MockTogglServer, api_token: str, **config: object) -> list:
+    tap = TapToggl(
+        config={
+            "api_token": api_token,
+            "api_url": server.url,
+            "start_date": "2024-01-01",
+            "max_requests_per_second": 1000,
+            **config,
+        },
+        parse_env_config=False,
+    )
+    tap = TapToggl(
+        config=dict(tap.config),
+        catalog=select_only(tap, "tags"),
+        parse_env_config=False,
+    )
+    output = StringIO()
+    with redirect_stdout(output):
+        tap.sync_all()
+    messages = [json.loads(line) for line in output.getvalue().splitlines()]
+    return [m["record"] for m in messages if m["type"] == "RECORD"]
+
+
+def test_cache_is_keyed_by_account(tmp_path):
+    cache = ParentContextCache(tmp_path / "cache.json")
+    cache.put("workspaces", "a", [{"id": 1}])
+
+    reloaded = ParentContextCache(tmp_path / "cache.json", ttl=0)
+    entry = reloaded.get("workspaces", "a")
+    assert entry["records"] == [{"id": 1}]
+    assert not reloaded.is_fresh(entry)
+    assert reloaded.get("workspaces", "b") is None
+
+
+def test_child_streams_start_from_cached_parents(tmp_path):
+    account = MockTogglConfig(workspaces_per_organization=3)
+    cache_path = str(tmp_path / "parents.json")
+    api_token = uuid.uuid4().hex
+    with MockTogglServer(account) as server:
+        expected = sync_tags(server, api_token, parent_cache_path=cache_path)
+        assert server.stats.requests[WORKSPACES] == 1
+
+        server.stats.reset()
+        cached = sync_tags(server, api_token, parent_cache_path=cache_path)
+        assert server.stats.requests[WORKSPACES] == 0
+        assert server.stats.requests[TAGS] == 3
+        assert cached == expected
+
+        # Another account does not share the cached workspaces.
+        server.stats.reset()
+        sync_tags(server, uuid.uuid4().hex, parent_cache_path=cache_path)
+        assert server.stats.requests[WORKSPACES] == 1
+
+        # Stale entries are revalidated with a request.
+        server.stats.reset()
+        revalidated = sync_tags(
+            server,
+            api_token,
+            parent_cache_path=cache_path,
+            parent_cache_ttl_seconds=0,
+        )
+        assert server.stats.requests[WORKSPACES] == 1
+        assert revalidated == expected
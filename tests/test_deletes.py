@@ -0,0 +1,118 @@
+"""Tests for deleted record detection."""
+
+from __future__ import annotations
+
+from tap_toggl.deletes import DeletedRecordDetector, IdFile, decode_ids, encode_ids
+from tests.mock_toggl import MockTogglConfig, MockTogglServer
+from tests.test_streams import make_selected_tap, sync_records
+
+
+def test_id_encoding_round_trips():
+    ids = {3, 10_000_000_000, 7, 1}
+    encoded = encode_ids(ids)
+    assert decode_ids(encoded) == ids
+    assert len(encode_ids(range(100_000))) < 2000
+
+
+def test_uncovered_buckets_are_kept(tmp_path):
+    detector = DeletedRecordDetector(
+        "s",
+        IdFile(tmp_path / "ids.json"),
+        lambda record: "",  # noqa: ARG005
+    )
+    for record_id in (1, 2, 3):
+        detector.observe(None, {"id": record_id})
+    detector.finish(None, lambda bucket: True)
+
+    # Only changed records were requested, one of them returned as deleted.
+    detector.observe(None, {"id": 1, "server_deleted_at": "2024-01-02"})
+    detector.observe(None, {"id": 4})
+    assert detector.finish(None, None) == []
+    assert detector.id_file.get("s", "{}") == {"": {2, 3, 4}}
+
+
+def test_deleted_records_are_marked(tmp_path):
+    account = MockTogglConfig(
+        projects_per_workspace=3,
+        time_entries_per_workspace=20,
+        days=10,
+    )
+    config = {
+        "start_date": "2024-01-01",
+        "end_date": "2024-01-10",
+        "time_entries_window_days": 5,
+        "deleted_ids_path": str(tmp_path / "ids.json"),
+    }
+
+    def markers(records: dict) -> dict[str, set[int]]:
+        return {
+            stream: {r["id"] for r in rows if r.get("_sdc_deleted_at")}
+            for stream, rows in records.items()
+        }
+
+    with MockTogglServer(account) as server:
+        first = sync_records(server, "time_entries", "projects", **config)
+        assert markers(first) == {"time_entries": set(), "projects": set()}
+
+        deleted_entry = server.time_entries[1].pop(3)
+        deleted_project = server.projects[1].pop(0)
+        second = sync_records(server, "time_entries", "projects", **config)
+        assert markers(second) == {
+            "time_entries": {deleted_entry["id"]},
+            "projects": {deleted_project["id"]},
+        }
+        marker = next(r for r in second["time_entries"] if r.get("_sdc_deleted_at"))
+        assert marker["workspace_id"] == 1
+
+        third = sync_records(server, "time_entries", "projects", **config)
+        assert markers(third) == {"time_entries": set(), "projects": set()}
+
+        # Windows outside the synced range keep their IDs.
+        sync_records(server, "time_entries", **{**config, "start_date": "2024-01-06"})
+        fourth = sync_records(server, "time_entries", **config)
+        assert markers(fourth) == {"time_entries": set()}
+
+
+def test_sharded_windows_do_not_mark_deletes(tmp_path):
+    account = MockTogglConfig(users_per_organization=3, time_entries_per_workspace=20)
+    config = {
+        "start_date": "2024-01-01",
+        "end_date": "2024-01-10",
+        "deleted_ids_path": str(tmp_path / "ids.json"),
+    }
+    with MockTogglServer(account) as server:
+        sync_records(server, "time_entries", **config)
+
+        # The entries of a user who left the organization are not requested
+        # by its shards, and must not be marked deleted.
+        server.users[1].pop()
+        sharded = sync_records(
+            server,
+            "time_entries",
+            time_entries_shard_by="user",
+            **config,
+        )["time_entries"]
+        assert sharded
+        assert not any(r.get("_sdc_deleted_at") for r in sharded)
+
+        # Their IDs are still known to the next unsharded sync.
+        deleted_entry = server.time_entries[1].pop(0)
+        unsharded = sync_records(server, "time_entries", **config)["time_entries"]
+        assert [r["id"] for r in unsharded if r.get("_sdc_deleted_at")] == [
+            deleted_entry["id"],
+        ]
+
+
+def test_requested_chunks_are_kept_for_delete_detection_only(tmp_path):
+    config = {
+        "start_date": "2024-01-01",
+        "end_date": "2024-01-10",
+        "time_entries_window_days": 5,
+    }
+    with MockTogglServer(MockTogglConfig()) as server:
+        path = str(tmp_path / "ids.json")
+        for extra, kept in (({}, 0), ({"deleted_ids_path": path}, 1)):
+            tap = make_selected_tap(server, ["time_entries"], None, **config, **extra)
+            stream = tap.streams["time_entries"]
+            list(stream.request_records({"workspace_id": 1}))
+            assert len(stream._requested_chunks) == kept  # noqa: SLF001
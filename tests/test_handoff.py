@@ -0,0 +1,79 @@
+"""Tests for the bounded hand-off of chunk records."""
+
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from tap_toggl import handoff
+from tap_toggl.handoff import RecordQueue
+from tests.mock_toggl import MockTogglConfig, MockTogglServer
+from tests.test_streams import sync_records
+
+
+def test_worker_waits_while_the_queue_is_full():
+    queue: RecordQueue[int] = RecordQueue(max_batches=2)
+    produced: list[int] = []
+
+    def records():
+        for n in range(100):
+            produced.append(n)
+            yield n
+
+    worker = threading.Thread(target=queue.fill, args=(records(), 10))
+    worker.start()
+    # Two batches are queued, and the worker holds a third it cannot add.
+    worker.join(timeout=0.2)
+    assert worker.is_alive()
+    assert len(produced) == 3 * 10
+
+    assert list(queue) == list(range(100))
+    worker.join()
+
+
+def test_errors_are_raised_after_the_records_before_them():
+    def records():
+        yield from range(5)
+        msg = "page failed"
+        raise RuntimeError(msg)
+
+    queue: RecordQueue[int] = RecordQueue()
+    queue.fill(records(), batch_size=2)
+    received = []
+    with pytest.raises(RuntimeError, match="page failed"):
+        received.extend(queue)
+    assert received == [0, 1, 2, 3]
+
+
+def test_cancelling_stops_the_waiting_worker():
+    queue: RecordQueue[int] = RecordQueue(max_batches=1)
+    worker = threading.Thread(target=queue.fill, args=(iter(range(100)), 1))
+    worker.start()
+    queue.cancel()
+    worker.join(timeout=1)
+    assert not worker.is_alive()
+    assert list(queue) == []
+
+
+@pytest.mark.parametrize("use_asyncio", [False, True])
+def test_skipped_prefetched_partitions_are_cancelled(monkeypatch, use_asyncio):
+    if use_asyncio:
+        pytest.importorskip("httpx")
+    monkeypatch.setattr(handoff, "BATCH_SIZE", 1)
+    monkeypatch.setattr(handoff, "MAX_BATCHES", 1)
+    account = MockTogglConfig(workspaces_per_organization=4, projects_per_workspace=30)
+    with MockTogglServer(account) as server:
+        records = sync_records(
+            server,
+            "workspaces",
+            "projects",
+            concurrent_child_streams=True,
+            use_asyncio=use_asyncio,
+            max_workers=2,
+            # The projects of filtered out workspaces are prefetched, not synced.
+            stream_maps={"workspaces": {"__filter__": "id % 2 == 0"}},
+        )
+
+    assert len(records["workspaces"]) == 2
+    assert len(records["projects"]) == 2 * 30
@@ -0,0 +1,102 @@
+"""Tests for the HTTP response cache."""
+
+from __future__ import annotations
+
+import uuid
+
+import pytest
+import requests
+
+from tap_toggl.http_cache import ResponseCache, ResponseNotRecordedError
+from tests.mock_toggl import MockTogglConfig, MockTogglServer
+from tests.test_cache import TAGS, WORKSPACES, sync_tags
+from tests.test_streams import sync_records
+
+
+def make_response(url: str, body: bytes) -> tuple:
+    request = requests.Request("GET", url).prepare()
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response._content = body  # noqa: SLF001
+    return request, response
+
+
+def test_least_recently_used_responses_are_evicted(tmp_path):
+    cache = ResponseCache(tmp_path / "responses.db", max_bytes=25)
+    first, second, third = (
+        make_response(f"https://toggl.test/{n}", b"x" * 10) for n in range(3)
+    )
+    cache.store(*first)
+    cache.store(*second)
+    assert cache.lookup(first[0]).content == b"x" * 10
+    cache.store(*third)
+
+    assert cache.lookup(first[0]) is not None
+    assert cache.lookup(second[0]) is None
+    assert cache.lookup(third[0]) is not None
+
+
+def test_fresh_responses_are_used_without_requests(tmp_path):
+    account = MockTogglConfig(workspaces_per_organization=3)
+    config = {"response_cache_path": str(tmp_path / "responses.db")}
+    api_token = uuid.uuid4().hex
+    with MockTogglServer(account) as server:
+        expected = sync_tags(server, api_token, **config)
+        assert server.stats.requests[TAGS] == 3
+
+        server.stats.reset()
+        assert sync_tags(server, api_token, **config) == expected
+        assert server.stats.requests[WORKSPACES] == 0
+        assert server.stats.requests[TAGS] == 0
+
+        # Another account does not share the cached responses.
+        server.stats.reset()
+        sync_tags(server, uuid.uuid4().hex, **config)
+        assert server.stats.requests[TAGS] == 3
+
+
+def test_stale_responses_are_revalidated(tmp_path):
+    account = MockTogglConfig(workspaces_per_organization=3, etags=True)
+    config = {
+        "response_cache_path": str(tmp_path / "responses.db"),
+        "response_cache_ttl_seconds": 0,
+    }
+    api_token = uuid.uuid4().hex
+    with MockTogglServer(account) as server:
+        expected = sync_tags(server, api_token, **config)
+        assert server.stats.not_modified == 0
+
+        server.stats.reset()
+        assert sync_tags(server, api_token, **config) == expected
+        assert server.stats.requests[TAGS] == 3
+        assert server.stats.not_modified == 1 + 3
+
+
+def test_recorded_syncs_replay_offline(tmp_path):
+    streams = ("workspaces", "projects", "users", "time_entries")
+    config = {
+        "start_date": "2024-01-01",
+        "end_date": "2024-02-01",
+        "response_cache_path": str(tmp_path / "responses.db"),
+    }
+    with MockTogglServer(MockTogglConfig()) as server:
+        recorded = sync_records(
+            server,
+            *streams,
+            response_cache_mode="record",
+            **config,
+        )
+
+    # The server is stopped, so every response comes from the recording.
+    replayed = sync_records(server, *streams, response_cache_mode="replay", **config)
+    assert replayed == recorded
+    assert len(replayed["time_entries"]) == 400
+
+    with pytest.raises(ResponseNotRecordedError):
+        sync_records(
+            server,
+            "time_entries",
+            response_cache_mode="replay",
+            **{**config, "end_date": "2024-03-01"},
+        )
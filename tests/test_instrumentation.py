@@ -0,0 +1,98 @@
+"""Tests for request and record pipeline instrumentation."""
+
+from __future__ import annotations
+
+import json
+import time
+import uuid
+from contextlib import redirect_stdout
+from io import StringIO
+
+from tap_toggl.client import TogglStream
+from tap_toggl.instrumentation import Stage, StreamInstrumentation
+from tap_toggl.tap import TapToggl
+from tests.mock_toggl import MockTogglConfig, MockTogglServer
+from tests.test_streams import make_selected_tap
+
+
+def test_timed_counts_only_time_producing_items():
+    instrumentation = StreamInstrumentation("test")
+    items = list(instrumentation.timed(range(3), {"workspace_id": 1}, Stage.PARSE))
+
+    assert items == [0, 1, 2]
+    partition = instrumentation.partition_summary({"workspace_id": 1})
+    assert partition["stage_seconds"]["parse"] > 0
+    assert instrumentation.totals.stage_seconds[Stage.PARSE] > 0
+
+
+def test_chunk_requests_are_accounted_to_their_partition():
+    instrumentation = StreamInstrumentation("test")
+    context = {"workspace_id": 1}
+    chunks = [{**context, "window_start": "2024-01-01"}]
+    instrumentation.register_chunks(context, chunks)
+    instrumentation.observe_retry(chunks[0])
+
+    summary = instrumentation.summary()
+    assert summary["retries"] == 1
+    assert summary["partitions"] == [
+        {"context": context, **instrumentation.partition_summary(context)},
+    ]
+    assert summary["partitions"][0]["retries"] == 1
+
+
+def test_summary_file_reports_every_stream_and_partition(tmp_path):
+    account = MockTogglConfig(
+        workspaces_per_organization=2,
+        time_entries_per_workspace=20,
+        max_page_size=3,
+        rate_limit_every=4,
+    )
+    summary_path = tmp_path / "metrics.json"
+    with MockTogglServer(account) as server:
+        tap = TapToggl(
+            config={
+                "api_token": uuid.uuid4().hex,
+                "api_url": server.url,
+                "start_date": "2024-01-01",
+                "end_date": "2024-02-01",
+                "max_requests_per_second": 1000,
+                "metrics_summary_path": str(summary_path),
+            },
+            parse_env_config=False,
+        )
+        with redirect_stdout(StringIO()):
+            tap.sync_all()
+        rate_limited = server.stats.rate_limited
+
+    streams = json.loads(summary_path.read_text())["streams"]
+    time_entries = streams["time_entries"]
+    assert time_entries["records"] == 40
+    assert [p["context"] for p in time_entries["partitions"]] == [
+        {"workspace_id": 1},
+        {"workspace_id": 2},
+    ]
+    assert sum(p["records"] for p in time_entries["partitions"]) == 40
+    assert time_entries["response_bytes"] > 0
+    assert sum(time_entries["latency_histogram"].values()) == time_entries["requests"]
+    assert set(time_entries["stage_seconds"]) == {stage.value for stage in Stage}
+    assert time_entries["stage_seconds"]["write"] > 0
+    assert sum(s["retries"] for s in streams.values()) == rate_limited > 0
+
+
+def test_partition_time_leaves_out_writing_records(monkeypatch):
+    write_record_message = TogglStream._write_record_message  # noqa: SLF001
+
+    def slow_write(stream: TogglStream, record: dict) -> None:
+        time.sleep(0.02)
+        write_record_message(stream, record)
+
+    monkeypatch.setattr(TogglStream, "_write_record_message", slow_write)
+    with MockTogglServer(MockTogglConfig(workspaces_per_organization=5)) as server:
+        tap = make_selected_tap(server, ["workspaces"])
+        with redirect_stdout(StringIO()):
+            tap.sync_all()
+
+    workspaces = tap.get_metrics_summary()["streams"]["workspaces"]
+    assert workspaces["records"] == 5
+    # Only the request, parsing and post-processing are timed.
+    assert workspaces["seconds"] < 5 * 0.02
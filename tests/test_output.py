@@ -0,0 +1,111 @@
+"""Tests for the fast output mode."""
+
+from __future__ import annotations
+
+import copy
+import json
+import logging
+import uuid
+from contextlib import redirect_stdout
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from singer_sdk._singerlib import RecordMessage
+from singer_sdk._singerlib.messages import format_message as singer_format_message
+from singer_sdk.helpers._typing import TypeConformanceLevel, conform_record_data_types
+from singer_sdk.helpers._util import utc_now
+
+from tap_toggl.output import compile_conformer, format_message
+from tap_toggl.tap import TapToggl
+from tests.mock_toggl import MockTogglConfig, MockTogglServer
+
+WORKSPACE = {
+    "id": 1,
+    "admin": 1,
+    "business_ws": 0,
+    "csv_upload": [{"at": "2024-01-01", "log_id": 3}],
+    "name": "Workspace",
+    "ical_enabled": None,
+    "te_constraints": {"description_present": 1, "extra": True},
+    "not_in_schema": "dropped",
+}
+
+
+@pytest.mark.parametrize("stream_name", ["workspaces", "organizations", "users"])
+def test_compiled_conformer_matches_sdk(stream_name: str):
+    tap = TapToggl(config={"api_token": "x"}, parse_env_config=False)
+    schema = tap.streams[stream_name].schema
+    record = {
+        **WORKSPACE,
+        "trial_info": {"trial": 0, "other": 1},
+        "groups": [{"group_id": 1, "name": "a", "unknown": 2}, "not an object"],
+        "workspaces": [{"workspace_id": 1, "admin": 0}],
+    }
+
+    expected = conform_record_data_types(
+        stream_name=stream_name,
+        record=copy.deepcopy(record),
+        schema=schema,
+        level=TypeConformanceLevel.RECURSIVE,
+        logger=logging.getLogger(__name__),
+    )
+    conformed, unmapped = compile_conformer(schema)(copy.deepcopy(record))
+
+    assert conformed == expected
+    assert "not_in_schema" in unmapped
+
+
+def test_compiled_conformer_drops_deselected_properties_silently():
+    tap = TapToggl(config={"api_token": "x"}, parse_env_config=False)
+    schema = tap.streams["workspaces"].schema
+    conformed, unmapped = compile_conformer(schema, frozenset({"name"}))(
+        {"id": 1, "name": "Workspace"},
+    )
+    assert conformed == {"id": 1}
+    assert unmapped == []
+
+
+@pytest.mark.parametrize("value", [1.5, Decimal("1.25")])
+def test_format_message_matches_sdk_encoding(value: object):
+    message = RecordMessage(
+        stream="time_entries",
+        record={"id": 1, "seconds": value, "tags": ["a"]},
+        time_extracted=utc_now(),
+    )
+    assert format_message(message) == (singer_format_message(message) + "\n").encode()
+
+
+def run_sync(server: MockTogglServer, **config: object) -> list[dict]:
+    tap = TapToggl(
+        config={
+            "api_token": uuid.uuid4().hex,
+            "api_url": server.url,
+            "start_date": "2024-01-01",
+            "end_date": "2024-02-01",
+            "max_requests_per_second": 1000,
+            **config,
+        },
+        parse_env_config=False,
+    )
+    output = StringIO()
+    with redirect_stdout(output):
+        tap.sync_all()
+    messages = [json.loads(line) for line in output.getvalue().splitlines()]
+    for message in messages:
+        message.pop("time_extracted", None)
+    return messages
+
+
+def test_fast_output_writes_the_same_messages():
+    with MockTogglServer(MockTogglConfig(time_entries_per_workspace=30)) as server:
+        standard = run_sync(server)
+        fast = run_sync(server, fast_output=True)
+
+    def without_state(messages: list[dict]) -> list[dict]:
+        return [m for m in messages if m["type"] != "STATE"]
+
+    # State messages hold signposts with the time of the sync.
+    assert without_state(fast) == without_state(standard)
+    assert len(fast) == len(standard)
+    assert any(m["type"] == "RECORD" for m in fast)
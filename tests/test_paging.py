@@ -0,0 +1,70 @@
+"""Tests for adaptive page sizes."""
+
+from __future__ import annotations
+
+from tap_toggl.paging import PageSizeController, aligned_page_size
+from tests.mock_toggl import MockTogglConfig, MockTogglServer
+from tests.test_streams import sync_records
+
+
+def test_page_size_grows_until_pages_are_slow():
+    controller = PageSizeController(50, maximum=800, target_seconds=1)
+    assert controller.observe(50, 50, 0.1, 1000) == 100
+    assert controller.observe(100, 100, 0.2, 2000) == 200
+    # A slow page shrinks proportionally, a partial one does not grow.
+    assert controller.observe(200, 200, 2.0, 4000) == 100
+    assert controller.observe(100, 40, 0.1, 800) == 100
+
+
+def test_failed_page_sizes_are_not_grown_back_to():
+    controller = PageSizeController(200, maximum=200)
+    assert controller.shrink(200) == 100
+    assert controller.shrink(100) == 50
+    assert controller.observe(50, 50, 0.1, 1000) == 75
+    assert controller.observe(75, 75, 0.1, 1000) == 87
+
+
+def test_page_number_sizes_stay_aligned():
+    assert aligned_page_size(0, 37, 10) == 37
+    assert aligned_page_size(100, 30, 10) == 25
+    assert aligned_page_size(7 * 13, 12, 10) is None
+
+
+def test_adaptive_pages_shrink_after_timeouts():
+    account = MockTogglConfig(
+        workspaces_per_organization=2,
+        projects_per_workspace=120,
+        time_entries_per_workspace=120,
+        max_page_size=200,
+        timeout_page_size=40,
+    )
+    config = {"start_date": "2024-01-01", "end_date": "2024-02-01"}
+    with MockTogglServer(account) as server:
+        adaptive = sync_records(
+            server,
+            "projects",
+            "time_entries",
+            adaptive_page_size=True,
+            page_sizes={"time_entries": 100},
+            **config,
+        )
+        # Pages of each stream are halved from 200 and 100 down to 25, and
+        # later partitions start from the smaller page size.
+        assert server.stats.timed_out == 3 + 2
+
+        server.stats.reset()
+        expected = sync_records(
+            server,
+            "projects",
+            "time_entries",
+            page_sizes={"projects": 40, "time_entries": 40},
+            **config,
+        )
+        assert server.stats.timed_out == 0
+
+    def ids(records: list[dict]) -> list[int]:
+        return sorted(record["id"] for record in records)
+
+    assert len(adaptive["projects"]) == 240
+    assert ids(adaptive["projects"]) == ids(expected["projects"])
+    assert ids(adaptive["time_entries"]) == ids(expected["time_entries"])
@@ -0,0 +1,85 @@
+"""Tests for the shared request scheduler."""
+
+from __future__ import annotations
+
+import pytest
+import requests
+import requests_mock
+from singer_sdk.exceptions import FatalAPIError
+
+from tap_toggl.scheduler import RequestScheduler, is_quota_exhausted
+from tests.test_streams import make_tap
+
+
+def make_response(status_code: int, **headers: str) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers)
+    return response
+
+
+def test_requests_are_spaced_after_burst():
+    scheduler = RequestScheduler(rate=2, burst=2)
+    waits = [scheduler.reserve("s") for _ in range(4)]
+    assert waits[:2] == [0, 0]
+    assert waits[2] == pytest.approx(0.5, abs=0.01)
+    assert waits[3] == pytest.approx(1.0, abs=0.01)
+    assert scheduler.throttled_seconds["s"] == pytest.approx(1.5, abs=0.02)
+
+
+def test_retry_after_holds_back_and_then_spaces_requests():
+    scheduler = RequestScheduler(rate=1)
+    scheduler.observe(make_response(429, **{"Retry-After": "5"}))
+    first, second = scheduler.reserve(), scheduler.reserve()
+    assert first == pytest.approx(5, abs=0.01)
+    assert second == pytest.approx(6, abs=0.01)
+    assert scheduler.throttle_responses == 1
+
+
+def test_quota_spreads_remaining_requests_until_reset():
+    scheduler = RequestScheduler(rate=10, burst=1)
+    scheduler.observe(
+        make_response(
+            200,
+            **{"X-Toggl-Quota-Remaining": "10", "X-Toggl-Quota-Resets-In": "100"},
+        )
+    )
+    scheduler.reserve()
+    assert scheduler.reserve() == pytest.approx(10, abs=0.01)
+
+
+def test_exhausted_quota_blocks_until_reset():
+    scheduler = RequestScheduler(rate=10)
+    scheduler.observe(make_response(402, **{"X-Toggl-Quota-Resets-In": "30"}))
+    assert scheduler.reserve() == pytest.approx(30, abs=0.01)
+
+
+def test_payment_required_without_quota_headers_is_not_throttled():
+    scheduler = RequestScheduler(rate=10)
+    response = make_response(402)
+    assert not is_quota_exhausted(response)
+    scheduler.observe(response)
+    assert scheduler.reserve() == 0
+    assert scheduler.throttle_responses == 0
+
+
+def test_payment_required_for_a_feature_fails_at_once():
+    stream = make_tap().streams["workspaces"]
+    with requests_mock.Mocker() as mock:
+        mock.get(
+            "https://api.track.toggl.com/api/v9/me/workspaces",
+            status_code=402,
+            text="Not available on your plan",
+        )
+        with pytest.raises(FatalAPIError):
+            list(stream.request_records(None))
+        assert mock.call_count == 1
+
+
+def test_scheduler_is_shared_per_token_and_pacing():
+    assert RequestScheduler.for_token("a") is RequestScheduler.for_token("a")
+    assert RequestScheduler.for_token("a") is not RequestScheduler.for_token("b")
+    slow = RequestScheduler.for_token("a", rate=2)
+    assert slow is not RequestScheduler.for_token("a")
+    assert slow.interval == 0.5
+    assert slow is not RequestScheduler.for_token("a", rate=2, burst=1)
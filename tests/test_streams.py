@@ -0,0 +1,606 @@
+"""Offline tests for stream behaviour, using mocked Toggl API responses."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import typing as t
+from collections import Counter
+from contextlib import redirect_stdout
+from datetime import date
+from io import StringIO
+from urllib.parse import urlparse
+
+import pytest
+import requests_mock
+
+from tap_toggl.client import date_windows
+from tap_toggl.tap import TapToggl
+from tests.mock_toggl import MockTogglConfig, MockTogglServer
+
+BASE_CONFIG = {
+    "api_token": "test-token",
+    "start_date": "2024-01-01",
+    "end_date": "2024-01-10",
+    "max_requests_per_second": 1000,
+}
+AT = "2024-01-02T00:00:00+00:00"
+REPORT_URL = (
+    "https://api.track.toggl.com/reports/api/v3/workspace/1/search/time_entries"
+)
+
+
+def make_tap(**config: object) -> TapToggl:
+    return TapToggl(config={**BASE_CONFIG, **config}, parse_env_config=False)
+
+
+def report_row(entry_id: int, start: str) -> dict:
+    return {
+        "user_id": 7,
+        "username": "Jane",
+        "time_entries": [{"id": entry_id, "start": start, "seconds": 60}],
+    }
+
+
+def test_date_windows_cover_range_inclusively():
+    windows = date_windows(date(2024, 1, 1), date(2024, 1, 10), 4)
+    assert windows == [
+        (date(2024, 1, 1), date(2024, 1, 4)),
+        (date(2024, 1, 5), date(2024, 1, 8)),
+        (date(2024, 1, 9), date(2024, 1, 10)),
+    ]
+
+
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_time_entries_windows_are_emitted_in_order(max_workers: int):
+    tap = make_tap(time_entries_window_days=4, max_workers=max_workers)
+    stream = tap.streams["time_entries"]
+
+    def respond(request, context):
+        body = json.loads(request.body)
+        return [report_row(int(body["start_date"][-2:]), body["start_date"])]
+
+    with requests_mock.Mocker() as mock:
+        mock.post(REPORT_URL, json=respond)
+        records = list(stream.get_records({"workspace_id": 1}))
+
+    assert [r["id"] for r in records] == [1, 5, 9]
+    assert all(r["workspace_id"] == 1 for r in records)
+    assert "window_progress" not in stream.get_context_state({"workspace_id": 1})
+
+
+def test_time_entries_resume_after_completed_window():
+    tap = make_tap(time_entries_window_days=4, max_workers=1)
+    stream = tap.streams["time_entries"]
+    stream.get_context_state({"workspace_id": 1})["window_progress"] = {
+        "range": ["2024-01-01", "2024-01-10"],
+        "completed_through": "2024-01-04",
+    }
+
+    with requests_mock.Mocker() as mock:
+        mock.post(REPORT_URL, json=[])
+        list(stream.get_records({"workspace_id": 1}))
+
+    requested = [json.loads(r.body)["start_date"] for r in mock.request_history]
+    assert requested == ["2024-01-05", "2024-01-09"]
+
+
+@pytest.mark.parametrize("stream_report_parsing", [False, True])
+def test_time_entries_flatten_every_entry_in_group(stream_report_parsing: bool):
+    tap = make_tap(stream_report_parsing=stream_report_parsing)
+    stream = tap.streams["time_entries"]
+    group = {
+        "user_id": 7,
+        "username": "Jane",
+        "time_entries": [
+            {"id": 1, "seconds": 60},
+            {"id": 2, "seconds": 120},
+            {"id": 3, "seconds": 30.5},
+        ],
+    }
+
+    with requests_mock.Mocker() as mock:
+        mock.post(REPORT_URL, json=[group, {**group, "user_id": 8}])
+        records = list(stream.get_records({"workspace_id": 1}))
+
+    assert [(r["user_id"], r["id"]) for r in records] == [
+        (7, 1),
+        (7, 2),
+        (7, 3),
+        (8, 1),
+        (8, 2),
+        (8, 3),
+    ]
+    assert all("time_entries" not in r for r in records)
+    assert records[2]["seconds"] == 30.5
+
+
+def test_throttled_requests_are_retried():
+    stream = make_tap().streams["time_entries"]
+
+    with requests_mock.Mocker() as mock:
+        mock.post(
+            REPORT_URL,
+            [
+                {"status_code": 429, "headers": {"Retry-After": "0"}},
+                {"json": [report_row(1, "2024-01-01")]},
+            ],
+        )
+        records = list(stream.get_records({"workspace_id": 1}))
+
+    assert [r["id"] for r in records] == [1]
+    assert mock.call_count == 2
+
+
+def mock_account(mock: requests_mock.Mocker, workspace_ids: list[int]) -> None:
+    api = "https://api.track.toggl.com/api/v9"
+    mock.get(f"{api}/me/clients", json=[])
+    mock.get(f"{api}/me/organizations", json=[])
+    mock.get(
+        f"{api}/me/workspaces",
+        json=[{"id": wid, "name": f"ws{wid}", "at": AT} for wid in workspace_ids],
+    )
+    for wid in workspace_ids:
+        mock.get(
+            f"{api}/workspaces/{wid}/tags",
+            json=[{"id": wid * 10 + i, "name": "tag", "at": AT} for i in range(2)],
+        )
+        mock.get(f"{api}/workspaces/{wid}/projects", json=[])
+        mock.get(f"{api}/workspaces/{wid}/tasks", json={"data": []})
+        mock.post(
+            "https://api.track.toggl.com/reports/api/v3/workspace/"
+            f"{wid}/search/time_entries",
+            json=[report_row(wid * 100, "2024-01-01")],
+        )
+        reports = f"https://api.track.toggl.com/reports/api/v3/workspace/{wid}"
+        mock.post(f"{reports}/summary/time_entries", json={"groups": []})
+        mock.post(f"{reports}/weekly/time_entries", json=[])
+
+
+def sync_messages(tap: TapToggl, capsys: pytest.CaptureFixture) -> list[dict]:
+    tap.sync_all()
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+
+def test_concurrent_child_streams_keep_record_order(capsys):
+    tap = make_tap(concurrent_child_streams=True, max_workers=3)
+    with requests_mock.Mocker() as mock:
+        mock_account(mock, [1, 2, 3, 4, 5])
+        messages = sync_messages(tap, capsys)
+
+    def ids(stream: str) -> list[int]:
+        return [
+            m["record"]["id"]
+            for m in messages
+            if m["type"] == "RECORD" and m["stream"] == stream
+        ]
+
+    assert ids("tags") == [10, 11, 20, 21, 30, 31, 40, 41, 50, 51]
+    assert ids("time_entries") == [100, 200, 300, 400, 500]
+    partitions = messages[-1]["value"]["bookmarks"]["tags"]["partitions"]
+    assert [p["context"]["workspace_id"] for p in partitions] == [1, 2, 3, 4, 5]
+
+
+def test_account_endpoints_replace_per_workspace_requests(capsys):
+    tap = make_tap(use_account_endpoints=True)
+    api = "https://api.track.toggl.com/api/v9"
+    with requests_mock.Mocker() as mock:
+        mock_account(mock, [1, 2])
+        mock.get(
+            f"{api}/me/tags",
+            json=[{"id": 3, "workspace_id": 2, "at": AT}],
+        )
+        mock.get(f"{api}/me/projects", json=[{"id": 4, "wid": 1, "at": AT}])
+        mock.get(f"{api}/me/tasks", json=[])
+        messages = sync_messages(tap, capsys)
+
+    records = {m["stream"]: m["record"] for m in messages if m["type"] == "RECORD"}
+    assert records["tags"]["workspace_id"] == 2
+    assert records["projects"]["workspace_id"] == 1
+    assert not any("/workspaces/" in r.path for r in mock.request_history)
+
+
+def test_incremental_time_entries_use_workspace_bookmark():
+    tap = TapToggl(
+        config={
+            **BASE_CONFIG,
+            "time_entries_incremental": True,
+            "time_entries_lookback_days": 2,
+        },
+        state={
+            "bookmarks": {
+                "time_entries": {
+                    "partitions": [
+                        {
+                            "context": {"workspace_id": 1},
+                            "replication_key": "at",
+                            "replication_key_value": "2024-01-08T12:00:00+00:00",
+                        }
+                    ]
+                }
+            }
+        },
+        parse_env_config=False,
+    )
+    stream = tap.streams["time_entries"]
+    group = {
+        "user_id": 7,
+        "time_entries": [
+            {"id": 1, "at": "2024-01-08T11:58:00Z"},
+            {"id": 2, "at": "2024-01-08T10:00:00Z"},
+            {"id": 3, "at": "2024-01-09T08:00:00Z"},
+        ],
+    }
+
+    with requests_mock.Mocker() as mock:
+        mock.post(REPORT_URL, json=[group])
+        records = list(stream.get_records({"workspace_id": 1}))
+
+    assert stream.replication_key == "at"
+    assert json.loads(mock.last_request.body)["start_date"] == "2024-01-06"
+    assert [r["id"] for r in records] == [1, 3]
+
+
+def test_since_filter_sends_bookmark_and_skips_unchanged_rows():
+    tap = TapToggl(
+        config=BASE_CONFIG,
+        state={
+            "bookmarks": {
+                "clients": {
+                    "replication_key": "at",
+                    "replication_key_value": "2024-01-05T00:00:00+00:00",
+                }
+            }
+        },
+        parse_env_config=False,
+    )
+    stream = tap.streams["clients"]
+
+    with requests_mock.Mocker() as mock:
+        mock.get(
+            "https://api.track.toggl.com/api/v9/me/clients",
+            json=[
+                {"id": 1, "at": "2024-01-01T00:00:00Z"},
+                {"id": 2, "at": "2024-01-06T00:00:00Z"},
+            ],
+        )
+        records = list(stream.get_records(None))
+
+    assert mock.last_request.qs["since"] == ["1704412800"]
+    assert [r["id"] for r in records] == [2]
+
+
+def test_since_filter_is_not_used_for_parents_of_selected_streams():
+    stream = make_tap().streams["workspaces"]
+    assert stream.has_selected_descendents
+    with requests_mock.Mocker() as mock:
+        mock.get("https://api.track.toggl.com/api/v9/me/workspaces", json=[])
+        list(stream.get_records(None))
+    assert "since" not in mock.last_request.qs
+
+
+def test_pagination_checkpoint_is_saved_and_resumed():
+    tap = make_tap(checkpoint_interval_pages=1)
+    stream = tap.streams["time_entries"]
+    context = {"workspace_id": 1}
+    pages = [
+        {"json": [report_row(1, "2024-01-01")], "headers": {"X-Next-Row-Number": "2"}},
+        {"json": [report_row(2, "2024-01-02")], "headers": {"X-Next-Row-Number": "3"}},
+        {"json": [report_row(3, "2024-01-03")]},
+    ]
+
+    with requests_mock.Mocker() as mock:
+        mock.post(REPORT_URL, pages)
+        records = iter(stream.get_records(context))
+        assert [next(records)["id"], next(records)["id"]] == [1, 2]
+
+    checkpoint = stream.get_context_state(context)["pagination_checkpoint"]
+    assert checkpoint == {"chunk": context, "next_page_token": "2", "page_size": 10000}
+
+    with requests_mock.Mocker() as mock:
+        mock.post(REPORT_URL, pages[1:])
+        assert [r["id"] for r in stream.get_records(context)] == [2, 3]
+
+    assert json.loads(mock.request_history[0].body)["first_row_number"] == 2
+    assert "pagination_checkpoint" not in stream.get_context_state(context)
+
+
+def test_pagination_checkpoint_keeps_its_page_size():
+    config = {**BASE_CONFIG, "checkpoint_interval_pages": 1}
+    tap = make_tap(**config, page_sizes={"projects": 2})
+    stream = tap.streams["projects"]
+    context = {"workspace_id": 1}
+    url = "https://api.track.toggl.com/api/v9/workspaces/1/projects"
+    projects = [{"id": n, "workspace_id": 1, "at": AT} for n in range(1, 5)]
+
+    with requests_mock.Mocker() as mock:
+        mock.get(url, [{"json": projects[:2]}, {"json": projects[2:]}])
+        records = iter(stream.get_records(context))
+        assert [next(records)["id"] for _ in range(3)] == [1, 2, 3]
+
+    # Page 2 only starts at the third project with pages of 2.
+    resumed = TapToggl(
+        config={**config, "page_sizes": {"projects": 3}},
+        state=tap.state,
+        parse_env_config=False,
+    ).streams["projects"]
+    with requests_mock.Mocker() as mock:
+        mock.get(url, [{"json": projects[2:]}, {"json": []}])
+        assert [r["id"] for r in resumed.get_records(context)] == [3, 4]
+    assert mock.request_history[0].qs["page"] == ["2"]
+    assert mock.request_history[0].qs["per_page"] == ["2"]
+
+
+def test_batch_streams_write_record_files(tmp_path, capsys):
+    tap = make_tap(
+        time_entries_window_days=3,
+        checkpoint_interval_pages=1,
+        batch_config={
+            "encoding": {"format": "jsonl", "compression": "gzip"},
+            "storage": {"root": tmp_path.as_uri()},
+            "batch_size": 2,
+        },
+    )
+
+    def respond(request, context):
+        body = json.loads(request.body)
+        return [report_row(int(body["start_date"][-2:]), body["start_date"])]
+
+    with requests_mock.Mocker() as mock:
+        mock_account(mock, [1])
+        mock.post(REPORT_URL, json=respond)
+        messages = sync_messages(tap, capsys)
+
+    def of(stream: str, type_: str) -> list[dict]:
+        return [m for m in messages if m.get("stream") == stream and m["type"] == type_]
+
+    assert not of("time_entries", "RECORD")
+    assert of("tags", "RECORD")
+    manifests = [m["manifest"] for m in of("time_entries", "BATCH")]
+    assert len(manifests) == 2
+    ids = []
+    for manifest in manifests:
+        with gzip.open(urlparse(manifest[0]).path) as f:
+            ids.extend(json.loads(line)["id"] for line in f)
+    assert ids == [1, 4, 7, 10]
+
+    # Window progress is only written out along with the batch covering it.
+    progress_written_after = [
+        before["type"]
+        for before, message in zip(messages, messages[1:])
+        if any(
+            "window_progress" in partition
+            for partition in message.get("value", {})
+            .get("bookmarks", {})
+            .get("time_entries", {})
+            .get("partitions", [])
+        )
+    ]
+    assert progress_written_after
+    assert set(progress_written_after) == {"BATCH"}
+
+
+def make_selected_tap(
+    server: MockTogglServer,
+    streams: t.Iterable[str],
+    properties: dict[str, list[str]] | None = None,
+    **config: object,
+) -> TapToggl:
+    """Return a tap syncing some streams, and only some properties of them."""
+    properties = properties or {}
+    tap = make_tap(api_url=server.url, **config)
+    catalog = tap.catalog_dict
+    for entry in catalog["streams"]:
+        stream = entry["tap_stream_id"]
+        for metadata in entry["metadata"]:
+            breadcrumb = metadata["breadcrumb"]
+            if breadcrumb == []:
+                metadata["metadata"]["selected"] = stream in streams
+            elif stream in properties:
+                metadata["metadata"]["selected"] = breadcrumb[-1] in properties[stream]
+    return TapToggl(config=dict(tap.config), catalog=catalog, parse_env_config=False)
+
+
+def sync_records(
+    server: MockTogglServer,
+    *streams: str,
+    properties: dict[str, list[str]] | None = None,
+    **config: object,
+) -> dict:
+    """Sync some streams from the fake API, returning their records by stream."""
+    tap = make_selected_tap(server, streams, properties, **config)
+    output = StringIO()
+    with redirect_stdout(output):
+        tap.sync_all()
+    records: dict[str, list[dict]] = {name: [] for name in streams}
+    for line in output.getvalue().splitlines():
+        message = json.loads(line)
+        if message["type"] == "RECORD":
+            records[message["stream"]].append(message["record"])
+    return records
+
+
+@pytest.mark.parametrize("shard_by", ["user", "project"])
+def test_sharded_time_entries_match_unsharded(shard_by: str):
+    account = MockTogglConfig(
+        workspaces_per_organization=2,
+        users_per_organization=3,
+        projects_per_workspace=2,
+        time_entries_per_workspace=40,
+        time_entries_per_group=2,
+    )
+    config = {
+        "start_date": "2024-01-01",
+        "end_date": "2024-01-31",
+        "time_entries_window_days": 15,
+        "max_workers": 4,
+    }
+    with MockTogglServer(account) as server:
+        expected = sync_records(server, "time_entries", **config)["time_entries"]
+        server.stats.reset()
+        sharded = sync_records(
+            server,
+            "time_entries",
+            time_entries_shard_by=shard_by,
+            **config,
+        )["time_entries"]
+        requests = server.stats.requests
+
+    def by_id(records: list[dict]) -> dict[int, dict]:
+        # Row numbers are counted within each report query.
+        return {r["id"]: {**r, "row_number": None} for r in records}
+
+    assert len(sharded) == len(expected) == 80
+    assert by_id(sharded) == by_id(expected)
+    # Three windows for each of two workspaces, times three users, or two
+    # projects and one shard for time entries without a project.
+    report = "/reports/api/v3/workspace/{id}/search/time_entries"
+    assert requests[report] == 2 * 3 * 3
+
+
+def test_report_streams_aggregate_time_entries():
+    account = MockTogglConfig(
+        users_per_organization=2,
+        projects_per_workspace=2,
+        time_entries_per_workspace=60,
+        days=20,
+    )
+    with MockTogglServer(account) as server:
+        records = sync_records(
+            server,
+            "time_entries",
+            "summary_report",
+            "weekly_report",
+            start_date="2024-01-01",
+            end_date="2024-01-31",
+            time_entries_window_days=10,
+        )
+        requests = server.stats.requests
+
+    per_project_user: Counter = Counter()
+    per_day: Counter = Counter()
+    for entry in records["time_entries"]:
+        key = (entry["workspace_id"], entry["project_id"], entry["user_id"])
+        per_project_user[key] += entry["seconds"]
+        per_day[(*key, entry["start"][:10])] += entry["seconds"]
+
+    summary: Counter = Counter()
+    for row in records["summary_report"]:
+        key = (row["workspace_id"], row["project_id"], row["user_id"])
+        summary[key] += row["seconds"]
+    assert summary == per_project_user
+    # Time entries only start in the first two windows.
+    assert {r["start_date"] for r in records["summary_report"]} == {
+        "2024-01-01",
+        "2024-01-11",
+    }
+
+    weekly = Counter(
+        {
+            (r["workspace_id"], r["project_id"], r["user_id"], r["date"]): r["seconds"]
+            for r in records["weekly_report"]
+        }
+    )
+    assert weekly == per_day
+    # Weekly reports are requested one week at a time, for each workspace.
+    workspaces = len({key[0] for key in per_day})
+    weekly_path = "/reports/api/v3/workspace/{id}/weekly/time_entries"
+    assert requests[weekly_path] == 5 * workspaces
+
+
+def test_report_rows_without_a_project_have_a_key():
+    account = MockTogglConfig(projects_per_workspace=0, time_entries_per_workspace=20)
+    with MockTogglServer(account) as server:
+        records = sync_records(
+            server,
+            "summary_report",
+            "weekly_report",
+            start_date="2024-01-01",
+            end_date="2024-01-31",
+        )
+
+    assert records["summary_report"]
+    assert records["weekly_report"]
+    for row in records["summary_report"] + records["weekly_report"]:
+        assert row["project_id"] == 0
+
+
+def test_narrow_selection_is_projected_before_processing():
+    account = MockTogglConfig(time_entries_per_workspace=40)
+    config = {"start_date": "2024-01-01", "end_date": "2024-02-01"}
+    selected = {
+        "workspaces": ["id", "name"],
+        "time_entries": ["id", "seconds", "description"],
+    }
+    with MockTogglServer(account) as server:
+        full = sync_records(server, "workspaces", "time_entries", **config)
+        narrow = sync_records(
+            server,
+            "workspaces",
+            "time_entries",
+            properties=selected,
+            **config,
+        )
+        tap = make_selected_tap(server, ["time_entries"], selected, **config)
+
+    # The replication key is selected automatically.
+    assert {*narrow["workspaces"][0]} == {"id", "name", "at"}
+    assert {*narrow["time_entries"][0]} == {"id", "seconds", "description"}
+    for stream, records in narrow.items():
+        assert records == [
+            {k: v for k, v in record.items() if k in records[0]}
+            for record in full[stream]
+        ]
+
+    # Amounts are not requested when none of them are selected.
+    stream = tap.streams["time_entries"]
+    assert stream.projection == {"id", "seconds", "description", "start"}
+    payload = stream.prepare_request_payload({"workspace_id": 1}, None)
+    assert payload["hide_amounts"] is True
+
+
+def test_organization_members_are_deduplicated():
+    account = MockTogglConfig(organizations=3, users_per_organization=4, shared_users=5)
+    with MockTogglServer(account) as server:
+        expected = sync_records(server, "users", "groups")
+        assert len(expected["users"]) == 3 * (4 + 5)
+        sent = server.stats.requests["/api/v9/organizations/{id}/groups"]
+
+        # The same group is returned for every organization.
+        group = server.groups[server.organizations[0]["id"]][0]
+        for org in server.organizations:
+            server.groups[org["id"]] = [dict(group)]
+        server.stats.reset()
+        records = sync_records(
+            server,
+            "users",
+            "groups",
+            dedupe_organization_members=True,
+        )
+        assert [g["group_id"] for g in records["groups"]] == [group["group_id"]]
+        # Every organization is still requested.
+        assert server.stats.requests["/api/v9/organizations/{id}/groups"] == sent
+
+        # A group that changed in between is emitted again.
+        last = server.organizations[-1]["id"]
+        server.groups[last][0]["at"] = "2024-06-01T00:00:00Z"
+        records = sync_records(server, "groups", dedupe_organization_members=True)
+        assert [g["organization_id"] for g in records["groups"]] == [
+            server.organizations[0]["id"],
+            last,
+        ]
+
+
+def test_organization_memberships_are_kept():
+    account = MockTogglConfig(organizations=2, users_per_organization=0, shared_users=1)
+    with MockTogglServer(account) as server:
+        first, second = (server.users[org["id"]][0] for org in server.organizations)
+        # The same user has a different membership in each organization.
+        assert first["id"] != second["id"]
+        assert first["user_id"] == second["user_id"]
+
+        users = sync_records(server, "users", dedupe_organization_members=True)["users"]
+    assert [(u["id"], u["organization_id"]) for u in users] == [
+        (first["id"], server.organizations[0]["id"]),
+        (second["id"], server.organizations[1]["id"]),
+    ]
@@ -0,0 +1,50 @@
+"""Tests for the HTTP transport shared by all streams."""
+
+from __future__ import annotations
+
+import uuid
+from base64 import b64encode
+from contextlib import redirect_stdout
+from io import StringIO
+
+import requests_mock
+
+from tap_toggl.tap import TapToggl
+from tests.mock_toggl import MockTogglConfig, MockTogglServer
+
+
+def test_streams_share_one_session_and_auth_header():
+    tap = TapToggl(config={"api_token": "secret"}, parse_env_config=False)
+    sessions = {id(stream.requests_session) for stream in tap.streams.values()}
+    assert len(sessions) == 1
+
+    stream = tap.streams["clients"]
+    with requests_mock.Mocker() as mock:
+        mock.get("https://api.track.toggl.com/api/v9/me/clients", json=[])
+        list(stream.get_records(None))
+
+    expected = b64encode(b"secret:api_token").decode()
+    assert mock.last_request.headers["Authorization"] == f"Basic {expected}"
+    assert "gzip" in mock.last_request.headers["Accept-Encoding"]
+
+
+def test_connections_are_reused_across_streams():
+    account = MockTogglConfig(workspaces_per_organization=4, max_page_size=2)
+    with MockTogglServer(account) as server:
+        tap = TapToggl(
+            config={
+                "api_token": uuid.uuid4().hex,
+                "api_url": server.url,
+                "start_date": "2024-01-01",
+                "end_date": "2024-02-01",
+                "max_requests_per_second": 1000,
+                "max_workers": 2,
+                "concurrent_child_streams": True,
+            },
+            parse_env_config=False,
+        )
+        with redirect_stdout(StringIO()):
+            tap.sync_all()
+
+    assert sum(server.stats.requests.values()) > 50
+    assert server.stats.connections <= 3